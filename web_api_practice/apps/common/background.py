@@ -0,0 +1,39 @@
+"""Fire-and-forget tasks that outlive the request that scheduled them."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Coroutine
+
+from .http import clients
+
+logger = logging.getLogger(__name__)
+
+_tasks: set[asyncio.Task] = set()
+
+
+def spawn(coro: Coroutine) -> asyncio.Task:
+    """Schedule ``coro`` on the running loop and keep a strong reference to it.
+
+    Under ASGI the task keeps running after the response is sent. Under WSGI
+    the per-request loop created by ``async_to_sync`` cancels it on exit. The
+    task holds its own HTTP client ``session``, so a per-request loop's pool
+    stays open until the task is done, not just until the response is.
+    """
+
+    task = asyncio.get_running_loop().create_task(_in_session(coro))
+    _tasks.add(task)
+    task.add_done_callback(_finished)
+    return task
+
+
+async def _in_session(coro: Coroutine) -> Any:
+    async with clients.session():
+        return await coro
+
+
+def _finished(task: asyncio.Task) -> None:
+    _tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background task failed", exc_info=task.exception())
@@ -1,9 +1,425 @@
+"""Two-tier (in-process L1 + Django/Redis L2) caching and service cache policy."""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from django.conf import settings
 from django.core.cache import cache
 
+from . import metrics
+from .background import spawn
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODE_TTL = "ttl"
+CACHE_MODE_SWR = "swr"
+
+_MISSING = object()
+
+
+class LocalCache:
+    """Thread-safe LRU with per-entry TTL, bounded by entry count and bytes.
+
+    Values are held by reference, so callers must treat what they get back as
+    read-only. Sizes are estimated from the shape of the value when it is stored.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, tuple[Any, float, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_entries(self) -> int:
+        return int(getattr(settings, "CACHE_L1_MAX_ENTRIES", 1024))
+
+    @property
+    def max_bytes(self) -> int:
+        return int(getattr(settings, "CACHE_L1_MAX_BYTES", 32 * 1024 * 1024))
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at, _size = entry
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, timeout: float) -> None:
+        if timeout <= 0:
+            self.delete(key)
+            return
+
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            self.delete(key)
+            return
+
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (value, time.monotonic() + timeout, size)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+
+# Rough in-memory costs used by ``_estimate_size``: one cached value, and each
+# period, movie or element it holds (a slotted period with its strings).
+_ENTRY_SIZE = 256
+_ITEM_SIZE = 256
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate bytes held by ``value``, cheap enough for every L1 write.
+
+    Strings and bytes (including rendered response bodies) count their
+    length; forecasts, search results and containers a fixed cost per
+    period, movie or element. It only has to be good enough to keep L1
+    within ``CACHE_L1_MAX_BYTES``.
+    """
+
+    if isinstance(value, CacheEntry):
+        value = value.value
+    body = getattr(value, "body", value)
+    if isinstance(body, (bytes, str)):
+        return _ENTRY_SIZE + len(body)
+    for name in ("periods", "items"):
+        nested = getattr(value, name, None)
+        if isinstance(nested, list):
+            return _ENTRY_SIZE + _ITEM_SIZE * len(nested)
+    if isinstance(value, (list, tuple, dict, set, frozenset)):
+        return _ENTRY_SIZE + _ITEM_SIZE * len(value)
+    return _ENTRY_SIZE
+
+
+class TwoTierCache:
+    """Per-process ``LocalCache`` (L1) in front of the default Django cache (L2).
+
+    Reads are served from L1 when possible and otherwise promoted from L2 for
+    at most ``CACHE_L1_TIMEOUT`` seconds. Writes and deletes go to both tiers
+    and are broadcast on the ``CACHE_L1_CHANNEL`` Redis pub/sub channel so
+    every other process drops its L1 copy. The short L1 TTL bounds staleness
+    if Redis pub/sub is unavailable.
+    """
+
+    def __init__(self) -> None:
+        self.local = LocalCache()
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._subscriber = None
+        self._subscriber_lock = threading.Lock()
+        self._next_subscribe_attempt = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(settings, "CACHE_L1_ENABLED", True))
+
+    @property
+    def l1_timeout(self) -> float:
+        return float(getattr(settings, "CACHE_L1_TIMEOUT", 30))
+
+    @property
+    def channel(self) -> str:
+        return getattr(settings, "CACHE_L1_CHANNEL", "cache-l1-invalidate")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if not self.enabled:
+            return cache.get(key, default)
+
+        value = self.local.get(key)
+        if value is not _MISSING:
+            metrics.incr("cache.l1.hit")
+            return value
+
+        metrics.incr("cache.l1.miss")
+        self._ensure_subscriber()
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+        self.local.set(key, value, self.l1_timeout)
+        return value
+
+    def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Return the cached values for ``keys``; L1 misses share one ``MGET``."""
+
+        if not self.enabled:
+            return cache.get_many(keys)
+
+        found: dict[str, Any] = {}
+        missing: list[str] = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                found[key] = value
+        metrics.incr("cache.l1.hit", len(found))
+
+        if missing:
+            metrics.incr("cache.l1.miss", len(missing))
+            self._ensure_subscriber()
+            for key, value in cache.get_many(missing).items():
+                self.local.set(key, value, self.l1_timeout)
+                found[key] = value
+        return found
+
+    def set(self, key: str, value: Any, timeout: int) -> None:
+        cache.set(key, value, timeout=timeout)
+        if not self.enabled:
+            return
+        self.local.set(key, value, min(float(timeout), self.l1_timeout))
+        self._publish(key)
+
+    def delete(self, key: str) -> None:
+        cache.delete(key)
+        if not self.enabled:
+            return
+        self.local.delete(key)
+        self._publish(key)
+
+    def _publish(self, key: str) -> None:
+        connection = redis_connection()
+        if connection is None:
+            return
+        message = json.dumps({"origin": self.origin, "key": key})
+        try:
+            connection.publish(self.channel, message)
+        except Exception:  # noqa: BLE001 - L1 TTL still bounds staleness
+            logger.debug("Could not publish L1 invalidation for %s", key, exc_info=True)
+
+    def _ensure_subscriber(self) -> None:
+        if self._subscriber is not None or time.monotonic() < self._next_subscribe_attempt:
+            return
+        with self._subscriber_lock:
+            if self._subscriber is not None:
+                return
+            connection = redis_connection()
+            if connection is None:
+                self._subscriber = False
+                return
+            try:
+                pubsub = connection.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.channel: self._on_message})
+                self._subscriber = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            except Exception:  # noqa: BLE001 - retried on a later miss
+                self._next_subscribe_attempt = time.monotonic() + 60
+                logger.debug("Could not subscribe to L1 invalidations", exc_info=True)
+
+    def _on_message(self, message: dict) -> None:
+        try:
+            payload = json.loads(message["data"])
+        except (KeyError, TypeError, ValueError):
+            return
+        if payload.get("origin") != self.origin and payload.get("key"):
+            self.local.delete(payload["key"])
+
+
+def redis_connection():
+    """Return the raw Redis client behind the default cache, if it has one."""
+
+    try:
+        from django_redis import get_redis_connection
+    except ImportError:
+        return None
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+tiered_cache = TwoTierCache()
+
 
 def get_cache(key: str):
-    return cache.get(key)
+    return tiered_cache.get(key)
 
 
 def set_cache(key: str, value, timeout: int = 300):
-    cache.set(key, value, timeout=timeout)
+    tiered_cache.set(key, value, timeout=timeout)
+
+
+def stale_key(key: str) -> str:
+    """Key of the long-lived "last known good" copy kept next to ``key``."""
+
+    return f"{key}:stale"
+
+
+@dataclass
+class CacheEntry:
+    """A cached value and the moment it stops being fresh (its soft TTL)."""
+
+    value: Any
+    fresh_until: float = math.inf
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return (time.time() if now is None else now) < self.fresh_until
+
+
+class ServiceCache:
+    """Cache policy shared by the domain services.
+
+    ``ttl`` mode stores a ``CacheEntry`` for ``timeout`` seconds, fresh for
+    all of them, plus a bare stale copy for ``stale_timeout`` seconds. ``swr`` (stale-while-revalidate) mode
+    stores a ``CacheEntry`` that lives for ``stale_timeout`` seconds (the hard
+    TTL) but is only fresh for ``timeout`` seconds (the soft TTL); stale
+    entries are served immediately while one worker refreshes them.
+
+    Entries are read and written through the two-tier ``tiered_cache``;
+    stale copies and refresh locks go straight to the shared Django cache.
+    Hits, stale serves, misses and refreshes are counted under
+    ``<namespace>.cache.*`` in ``apps.common.metrics``.
+    """
+
+    REFRESH_LOCK_PREFIX = "swr-refresh:"
+
+    def __init__(
+        self,
+        *,
+        namespace: str,
+        value_type: type,
+        timeout: int,
+        stale_timeout: int,
+        mode: str = CACHE_MODE_TTL,
+        refresh_lock_timeout: int = 30,
+    ) -> None:
+        if mode not in (CACHE_MODE_TTL, CACHE_MODE_SWR):
+            raise ValueError(f"Unsupported cache mode '{mode}'")
+        self.namespace = namespace
+        self.value_type = value_type
+        self.timeout = timeout
+        self.stale_timeout = max(stale_timeout, timeout)
+        self.mode = mode
+        self.refresh_lock_timeout = refresh_lock_timeout
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """Return the cached entry for ``key`` (fresh or stale) or ``None``."""
+
+        entry = self._read(key)
+        if entry is None:
+            self._count("miss")
+        elif entry.is_fresh():
+            self._count("hit")
+        else:
+            self._count("stale")
+        return entry
+
+    def lookup_many(self, keys: list[str]) -> dict[str, CacheEntry]:
+        """Return the cached entries (fresh or stale) for ``keys`` with a single L2 round trip."""
+
+        entries: dict[str, CacheEntry] = {}
+        for key, cached in tiered_cache.get_many(keys).items():
+            entry = self._coerce(cached)
+            if entry is not None:
+                entries[key] = entry
+        stale = sum(not entry.is_fresh() for entry in entries.values())
+        self._count("hit", len(entries) - stale)
+        self._count("stale", stale)
+        return entries
+
+    def count_hit(self) -> None:
+        """Count a hit answered by a cache in front of this one (the response cache)."""
+
+        self._count("hit")
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """Seconds until ``key`` stops being fresh; ``None`` if unknown or absent.
+
+        Read through the tiered cache, so usually from the L1 copy the lookup
+        just made; only bare values written by older releases cost a ``ttl``.
+        """
+
+        cached = tiered_cache.get(key)
+        if isinstance(cached, CacheEntry) and cached.fresh_until != math.inf:
+            return cached.fresh_until - time.time()
+        if cached is None:
+            return None
+        ttl = getattr(cache, "ttl", None)
+        remaining = ttl(key) if ttl else None
+        return float(remaining) if isinstance(remaining, (int, float)) else None
+
+    def get(self, key: str) -> Any:
+        """Return the value for ``key`` only while it is fresh."""
+
+        entry = self._read(key)
+        return entry.value if entry is not None and entry.is_fresh() else None
+
+    def get_stale(self, key: str) -> Any:
+        """Return the value for ``key`` regardless of age, if any is kept."""
+
+        if self.mode == CACHE_MODE_SWR:
+            entry = self._read(key)
+            return entry.value if entry is not None else None
+        value = cache.get(stale_key(key))
+        return value if isinstance(value, self.value_type) else None
+
+    def set(self, key: str, value: Any) -> None:
+        entry = CacheEntry(value=value, fresh_until=time.time() + self.timeout)
+        if self.mode == CACHE_MODE_SWR:
+            tiered_cache.set(key, entry, timeout=self.stale_timeout)
+            return
+        tiered_cache.set(key, entry, timeout=self.timeout)
+        cache.set(stale_key(key), value, timeout=self.stale_timeout)
+
+    def revalidate(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> bool:
+        """Refresh ``key`` in the background unless another worker already is."""
+
+        lock_key = f"{self.REFRESH_LOCK_PREFIX}{key}"
+        if cache.add(lock_key, 1, timeout=self.refresh_lock_timeout) is False:
+            return False
+
+        self._count("refresh")
+        spawn(self._refresh(lock_key, refresh))
+        return True
+
+    async def _refresh(self, lock_key: str, refresh: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await refresh()
+        except Exception:  # noqa: BLE001 - keep serving the stale entry
+            self._count("refresh_failed")
+        finally:
+            cache.delete(lock_key)
+
+    def _read(self, key: str) -> Optional[CacheEntry]:
+        return self._coerce(tiered_cache.get(key))
+
+    def _coerce(self, cached: Any) -> Optional[CacheEntry]:
+        if isinstance(cached, CacheEntry):
+            return cached if isinstance(cached.value, self.value_type) else None
+        if isinstance(cached, self.value_type):
+            return CacheEntry(value=cached)
+        return None
+
+    def _count(self, event: str, amount: int = 1) -> None:
+        metrics.incr(f"{self.namespace}.cache.{event}", amount)
@@ -0,0 +1,188 @@
+"""Per-provider circuit breakers for fast failover between upstreams."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from . import metrics
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for a single upstream provider.
+
+    ``CIRCUIT_FAILURE_THRESHOLD`` consecutive failures open the circuit, and
+    callers are then refused without touching the network. After
+    ``CIRCUIT_RECOVERY_TIMEOUT`` seconds the circuit is half-open: one probe
+    call is let through, and its outcome closes or re-opens the circuit.
+
+    State lives in process memory by default. With ``CIRCUIT_BACKEND =
+    "redis"`` it is kept in the Django cache instead, so one worker tripping
+    the breaker spares every other worker the same timeouts. If that cache is
+    unreachable the breaker reads as closed rather than blocking traffic.
+    """
+
+    KEY_PREFIX = "circuit:"
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_started: Optional[float] = None
+
+    @property
+    def failure_threshold(self) -> int:
+        return int(getattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 5))
+
+    @property
+    def recovery_timeout(self) -> float:
+        return float(getattr(settings, "CIRCUIT_RECOVERY_TIMEOUT", 30.0))
+
+    @property
+    def shared(self) -> bool:
+        return getattr(settings, "CIRCUIT_BACKEND", "local") == "redis"
+
+    @property
+    def state(self) -> str:
+        if self.shared:
+            if cache.get(self._key("open")):
+                return STATE_OPEN
+            if cache.get(self._key("tripped")):
+                return STATE_HALF_OPEN
+            return STATE_CLOSED
+
+        with self._lock:
+            return self._local_state(time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now; claims the probe when half-open."""
+
+        if self.shared:
+            state = self.state
+            if state == STATE_HALF_OPEN:
+                # ``None`` means the cache is down: let the call through.
+                claimed = cache.add(self._key("probe"), 1, timeout=self.recovery_timeout)
+                return claimed is not False
+            return state == STATE_CLOSED
+
+        now = time.monotonic()
+        with self._lock:
+            state = self._local_state(now)
+            if state == STATE_HALF_OPEN:
+                stuck = (
+                    self._probe_started is not None
+                    and now - self._probe_started >= self.recovery_timeout
+                )
+                if self._probe_started is None or stuck:
+                    self._probe_started = now
+                    return True
+                return False
+            return state == STATE_CLOSED
+
+    def release_probe(self) -> None:
+        """Give back a probe claimed by ``allow`` when the call ended without an
+        outcome (e.g. it was cancelled), so the next caller can probe at once."""
+
+        if self.shared:
+            cache.delete(self._key("probe"))
+            return
+
+        with self._lock:
+            self._probe_started = None
+
+    def record_success(self) -> None:
+        if self.shared:
+            cache.delete_many(
+                [self._key(suffix) for suffix in ("failures", "open", "tripped", "probe")]
+            )
+            return
+
+        with self._lock:
+            if self._opened_at is not None:
+                metrics.incr(f"circuit.{self.name}.closed")
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+
+    def record_failure(self) -> None:
+        if self.shared:
+            if cache.get(self._key("tripped")):
+                self._trip_shared()
+                return
+            failures_key = self._key("failures")
+            # Consecutive failures, forgotten if the provider goes quiet for a while.
+            cache.add(failures_key, 0, timeout=self._memory_timeout())
+            try:
+                failures = cache.incr(failures_key)
+            except ValueError:
+                return
+            if failures and failures >= self.failure_threshold:
+                self._trip_shared()
+            return
+
+        with self._lock:
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._probe_started = None
+                metrics.incr(f"circuit.{self.name}.opened")
+
+    def reset(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_started = None
+        if self.shared:
+            self.record_success()
+
+    def _local_state(self, now: float) -> str:
+        if self._opened_at is None:
+            return STATE_CLOSED
+        if now - self._opened_at < self.recovery_timeout:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    def _trip_shared(self) -> None:
+        cache.set(self._key("open"), 1, timeout=self.recovery_timeout)
+        cache.set(self._key("tripped"), 1, timeout=self._memory_timeout())
+        cache.delete_many([self._key("failures"), self._key("probe")])
+        metrics.incr(f"circuit.{self.name}.opened")
+
+    def _memory_timeout(self) -> float:
+        return self.recovery_timeout * 10
+
+    def _key(self, suffix: str) -> str:
+        return f"{self.KEY_PREFIX}{self.name}:{suffix}"
+
+
+class CircuitBreakers:
+    """Registry handing out one breaker per provider name."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name)
+            return breaker
+
+    def reset(self) -> None:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        for breaker in breakers:
+            breaker.reset()
+
+
+breakers = CircuitBreakers()
@@ -0,0 +1,273 @@
+"""Compact, schema-aware cache serialization for forecasts and search results."""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import operator
+import pickle
+from dataclasses import fields
+from functools import lru_cache
+from typing import Any, Optional
+
+from django.conf import settings
+
+try:  # Preferred: binary, compact and fast.
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - depends on the environment
+    lz4_frame = None
+
+try:
+    from django_redis.serializers.base import BaseSerializer
+except ImportError:  # pragma: no cover - only needed with django-redis
+    BaseSerializer = object
+
+FORMAT_VERSION = 1
+
+CODEC_MSGPACK = b"m"
+CODEC_ORJSON = b"o"
+CODEC_JSON = b"j"
+CODEC_PICKLE = b"p"
+
+COMPRESSION_NONE = b"-"
+COMPRESSION_ZSTD = b"z"
+COMPRESSION_LZ4 = b"l"
+
+_PICKLE_PREFIX = b"\x80"
+
+logger = logging.getLogger(__name__)
+
+
+# Schemas became slotted after legacy pickles were written: their old
+# dict-based state either fails to load or is restored into the wrong fields.
+_SLOTTED_SCHEMA_MODULES = frozenset({"apps.weather.schemas", "apps.movies.schemas"})
+
+
+class CodecError(ValueError):
+    """A payload this process cannot decode; the cache treats it as a miss."""
+
+
+class _LegacyUnpickler(pickle.Unpickler):
+    """Unpickler for pre-serializer values that refuses the (now slotted) schemas."""
+
+    def find_class(self, module: str, name: str) -> Any:
+        if module in _SLOTTED_SCHEMA_MODULES:
+            raise CodecError(f"legacy pickle of {module}.{name}")
+        return super().find_class(module, name)
+
+
+class SchemaSerializer(BaseSerializer):
+    """django-redis serializer that stores domain schemas as compact rows.
+
+    ``Forecast``/``SearchResult`` graphs (optionally wrapped in a
+    ``CacheEntry``) become nested positional lists encoded with msgpack, or
+    orjson/json when msgpack is missing; anything else falls back to pickle.
+    Bodies above ``CACHE_COMPRESSION_THRESHOLD`` bytes are compressed with
+    ``CACHE_COMPRESSION`` (``zstd`` or ``lz4``) when that library is installed.
+
+    Every payload starts with a 3-byte header: format version, codec, and
+    compression. Legacy pickle values written before this serializer was
+    enabled still load, except pickled schemas, whose pre-slots state no
+    longer fits the classes. Those, payloads with an unknown version and
+    payloads written by a process with a library this one lacks load as
+    ``None`` (a cache miss), so the format can be rolled forward or back safely.
+    """
+
+    def __init__(self, options: dict[str, Any] | None = None) -> None:
+        options = options or {}
+        self.compression = options.get(
+            "COMPRESSION", getattr(settings, "CACHE_COMPRESSION", "none")
+        )
+        self.threshold = int(
+            options.get(
+                "COMPRESSION_THRESHOLD",
+                getattr(settings, "CACHE_COMPRESSION_THRESHOLD", 1024),
+            )
+        )
+
+    def dumps(self, value: Any) -> bytes:
+        row = encode_value(value)
+        if row is None:
+            codec, body = CODEC_PICKLE, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        else:
+            codec, body = _pack(row)
+
+        compression = COMPRESSION_NONE
+        if len(body) > self.threshold:
+            compression, body = _compress(self.compression, body)
+
+        return bytes((FORMAT_VERSION,)) + codec + compression + body
+
+    def loads(self, value: bytes) -> Any:
+        try:
+            return self._loads(value)
+        except CodecError as exc:
+            logger.warning("Treating cached value as a miss: %s", exc)
+            return None
+
+    def _loads(self, value: bytes) -> Any:
+        if value[:1] == _PICKLE_PREFIX:
+            return _load_legacy(value)
+        if value[0] != FORMAT_VERSION:
+            return None
+
+        codec, compression, body = value[1:2], value[2:3], value[3:]
+        body = _decompress(compression, body)
+        if codec == CODEC_PICKLE:
+            return pickle.loads(body)
+        return decode_value(_unpack(codec, body))
+
+
+def encode_value(value: Any) -> Optional[list]:
+    """Return ``value`` as nested rows, or ``None`` if it is not a known schema."""
+
+    schemas = _schemas()
+    if isinstance(value, schemas["CacheEntry"]):
+        inner = encode_value(value.value)
+        if inner is None:
+            return None
+        fresh_until = value.fresh_until if value.fresh_until != float("inf") else None
+        return ["E", fresh_until, inner]
+    if isinstance(value, schemas["Forecast"]):
+        return [
+            "F",
+            value.location_name,
+            value.country,
+            value.units,
+            value.source,
+            [_encode_record(period) for period in value.periods],
+            list(value.parts),
+        ]
+    if isinstance(value, schemas["SearchResult"]):
+        return [
+            "S",
+            value.page,
+            value.total_pages,
+            value.total_results,
+            value.source,
+            [_encode_record(movie) for movie in value.items],
+        ]
+    return None
+
+
+def decode_value(row: list) -> Any:
+    schemas = _schemas()
+    tag = row[0]
+    if tag == "E":
+        fresh_until = row[1] if row[1] is not None else float("inf")
+        return schemas["CacheEntry"](value=decode_value(row[2]), fresh_until=fresh_until)
+    if tag == "F":
+        return schemas["Forecast"](
+            location_name=row[1],
+            country=row[2],
+            units=row[3],
+            source=row[4],
+            periods=[_decode_record(item) for item in row[5]],
+            # Rows written before ``parts`` existed have no seventh element.
+            parts=tuple(row[6]) if len(row) > 6 else (),
+        )
+    if tag == "S":
+        return schemas["SearchResult"](
+            items=[_decode_record(item) for item in row[5]],
+            page=row[1],
+            total_pages=row[2],
+            total_results=row[3],
+            source=row[4],
+        )
+    raise ValueError(f"Unknown cache row tag '{tag}'")
+
+
+def _encode_record(obj: Any) -> list:
+    tag, getter = _record_layout(type(obj))
+    return [tag, *getter(obj)]
+
+
+def _decode_record(row: list) -> Any:
+    return _record_types()[row[0]](*row[1:])
+
+
+@lru_cache(maxsize=None)
+def _record_layout(cls: type) -> tuple[str, Any]:
+    tags = {record: tag for tag, record in _record_types().items()}
+    return tags[cls], operator.attrgetter(*(field.name for field in fields(cls)))
+
+
+@lru_cache(maxsize=None)
+def _record_types() -> dict[str, type]:
+    from apps.movies.schemas import Movie
+    from apps.weather.schemas import CWAPeriod, MergedPeriod, OWMPeriod
+
+    return {"O": OWMPeriod, "C": CWAPeriod, "G": MergedPeriod, "M": Movie}
+
+
+@lru_cache(maxsize=None)
+def _schemas() -> dict[str, type]:
+    # Imported lazily: the domain apps depend on apps.common, not vice versa.
+    from apps.common.cache import CacheEntry
+    from apps.movies.schemas import SearchResult
+    from apps.weather.schemas import Forecast
+
+    return {"CacheEntry": CacheEntry, "Forecast": Forecast, "SearchResult": SearchResult}
+
+
+def _load_legacy(value: bytes) -> Any:
+    try:
+        return _LegacyUnpickler(io.BytesIO(value)).load()
+    except CodecError:
+        raise
+    except Exception as exc:  # noqa: BLE001 - any stale class layout is a miss
+        raise CodecError(f"unreadable legacy pickle: {exc!r}") from exc
+
+
+def _pack(row: list) -> tuple[bytes, bytes]:
+    if msgpack is not None:
+        return CODEC_MSGPACK, msgpack.packb(row, use_bin_type=True)
+    if orjson is not None:
+        return CODEC_ORJSON, orjson.dumps(row)
+    return CODEC_JSON, json.dumps(row, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _unpack(codec: bytes, body: bytes) -> list:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise CodecError("msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+    if codec == CODEC_ORJSON and orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _compress(algorithm: str, body: bytes) -> tuple[bytes, bytes]:
+    if algorithm == "zstd" and zstandard is not None:
+        return COMPRESSION_ZSTD, zstandard.ZstdCompressor().compress(body)
+    if algorithm == "lz4" and lz4_frame is not None:
+        return COMPRESSION_LZ4, lz4_frame.compress(body)
+    return COMPRESSION_NONE, body
+
+
+def _decompress(compression: bytes, body: bytes) -> bytes:
+    if compression == COMPRESSION_ZSTD:
+        if zstandard is None:
+            raise CodecError("zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(body)
+    if compression == COMPRESSION_LZ4:
+        if lz4_frame is None:
+            raise CodecError("lz4 is not installed")
+        return lz4_frame.decompress(body)
+    return body
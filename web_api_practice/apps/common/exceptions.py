@@ -2,3 +2,39 @@ class UpstreamError(Exception):
     def __init__(self, code: str, message: str):
         super().__init__(message)
         self.code = code
+
+
+class SingleFlightTimeout(UpstreamError):
+    def __init__(self, key: str):
+        super().__init__(
+            "singleflight_timeout",
+            f"Timed out waiting for the in-flight lookup of '{key}'",
+        )
+        self.key = key
+
+
+class CircuitOpenError(UpstreamError):
+    def __init__(self, provider: str):
+        super().__init__(
+            "circuit_open",
+            f"Provider '{provider}' is failing; its circuit breaker is open",
+        )
+        self.provider = provider
+
+
+class DeadlineExceeded(UpstreamError):
+    def __init__(self, url: str):
+        super().__init__(
+            "deadline_exceeded",
+            f"No time left in the request deadline to call '{url}'",
+        )
+        self.url = url
+
+
+class RateLimited(UpstreamError):
+    def __init__(self, provider: str):
+        super().__init__(
+            "rate_limited",
+            f"Provider '{provider}' is over its client-side rate limit",
+        )
+        self.provider = provider
@@ -0,0 +1,64 @@
+"""Geohash encoding, used to snap coordinates onto a shared cache grid."""
+
+from __future__ import annotations
+
+from typing import Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode(lat: float, lon: float, precision: int = 5) -> str:
+    """Geohash of ``lat``/``lon`` with ``precision`` characters.
+
+    Precision 5 is a cell of roughly 4.9 x 4.9 km, 6 roughly 1.2 x 0.6 km.
+    """
+
+    if not -90 <= lat <= 90 or not -180 <= lon <= 180:
+        raise ValueError(f"Coordinates out of range: {lat}, {lon}")
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # Bits alternate longitude, latitude, starting with longitude.
+    while len(chars) < precision:
+        bounds, coordinate = (lon_range, lon) if even else (lat_range, lat)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """``(min_lat, min_lon, max_lat, max_lon)`` of the ``geohash`` cell."""
+
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            target = lon_range if even else lat_range
+            middle = (target[0] + target[1]) / 2
+            if value >> shift & 1:
+                target[0] = middle
+            else:
+                target[1] = middle
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def snap(lat: float, lon: float, precision: int = 5) -> Tuple[float, float]:
+    """Center of the ``precision`` geohash cell containing ``lat``/``lon``."""
+
+    min_lat, min_lon, max_lat, max_lon = bounds(encode(lat, lon, precision))
+    return round((min_lat + max_lat) / 2, 6), round((min_lon + max_lon) / 2, 6)
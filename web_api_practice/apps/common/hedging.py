@@ -0,0 +1,48 @@
+"""Hedged requests: race a backup call against a slow primary."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, TypeVar
+
+from . import metrics
+
+T = TypeVar("T")
+
+
+async def hedged(
+    primary: Callable[[], Awaitable[T]],
+    backup: Callable[[], Awaitable[T]],
+    delay: float,
+) -> T:
+    """Return the first successful result of ``primary`` or a delayed ``backup``.
+
+    ``backup`` only starts if ``primary`` has not finished within ``delay``
+    seconds; a ``primary`` that fails sooner raises straight away so the
+    caller's normal fallback applies. Once both are running, the first
+    success wins and the other call is cancelled. If both fail, the primary's
+    error is raised.
+    """
+
+    first = asyncio.ensure_future(primary())
+    second: asyncio.Future | None = None
+    try:
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done:
+            return first.result()
+
+        metrics.incr("hedge.started")
+        second = asyncio.ensure_future(backup())
+        pending = {first, second}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        metrics.incr("hedge.backup_won")
+                    return task.result()
+        return first.result()
+    finally:
+        for task in (first, second):
+            if task is not None and not task.done():
+                task.cancel()
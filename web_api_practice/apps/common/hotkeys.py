@@ -0,0 +1,132 @@
+"""Hot-key statistics gathered from the services' cache lookups."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from django.conf import settings
+
+from .cache import redis_connection
+
+logger = logging.getLogger(__name__)
+
+HotKey = Tuple[str, Dict[str, Any]]
+
+
+class HotKeyTracker:
+    """Count lookups per ``(provider, params)`` in rolling time windows.
+
+    Counting is a local ``Counter`` increment so it stays off the request's
+    critical path. With ``HOTKEYS_BACKEND = "redis"`` the increments are
+    flushed at most every ``HOTKEYS_FLUSH_INTERVAL`` seconds into a sorted set
+    per window, so the pre-warm command can see what every worker observed.
+    ``top`` merges the current and previous ``HOTKEYS_WINDOW``.
+    """
+
+    KEY_PREFIX = "hotkeys:"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._windows: dict[tuple[str, int], Counter[str]] = {}
+        self._unflushed: dict[tuple[str, int], Counter[str]] = {}
+        self._last_flush = time.monotonic()
+
+    @property
+    def window(self) -> int:
+        return int(getattr(settings, "HOTKEYS_WINDOW", 3600))
+
+    @property
+    def use_redis(self) -> bool:
+        return getattr(settings, "HOTKEYS_BACKEND", "local") == "redis"
+
+    def record(self, namespace: str, provider: str, params: Dict[str, Any]) -> None:
+        member = json.dumps([provider, params], sort_keys=True, ensure_ascii=False, default=str)
+        bucket = (namespace, self._window_index())
+
+        use_redis = self.use_redis
+
+        with self._lock:
+            self._windows.setdefault(bucket, Counter())[member] += 1
+            if use_redis:
+                self._unflushed.setdefault(bucket, Counter())[member] += 1
+            self._prune(bucket[1])
+
+        interval = float(getattr(settings, "HOTKEYS_FLUSH_INTERVAL", 10))
+        if use_redis and time.monotonic() - self._last_flush >= interval:
+            self.flush()
+
+    def top(self, namespace: str, limit: int) -> List[HotKey]:
+        """Return the ``limit`` most looked-up ``(provider, params)`` pairs."""
+
+        current = self._window_index()
+        totals: Counter[str] = Counter()
+
+        if self.use_redis:
+            self.flush()
+            connection = redis_connection()
+            if connection is not None:
+                for index in (current - 1, current):
+                    try:
+                        rows = connection.zrevrange(
+                            self._redis_key(namespace, index), 0, -1, withscores=True
+                        )
+                    except Exception:  # noqa: BLE001 - fall back to local counts
+                        logger.debug("Could not read hot keys from Redis", exc_info=True)
+                        break
+                    for member, score in rows:
+                        if isinstance(member, bytes):
+                            member = member.decode()
+                        totals[member] += int(score)
+
+        if not totals:
+            with self._lock:
+                for index in (current - 1, current):
+                    totals.update(self._windows.get((namespace, index), Counter()))
+
+        hot: List[HotKey] = []
+        for member, _count in totals.most_common(limit):
+            provider, params = json.loads(member)
+            hot.append((provider, params))
+        return hot
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._unflushed = self._unflushed, {}
+            self._last_flush = time.monotonic()
+
+        connection = redis_connection()
+        if connection is None or not pending:
+            return
+        try:
+            pipe = connection.pipeline(transaction=False)
+            for (namespace, index), counts in pending.items():
+                key = self._redis_key(namespace, index)
+                for member, amount in counts.items():
+                    pipe.zincrby(key, amount, member)
+                pipe.expire(key, self.window * 2)
+            pipe.execute()
+        except Exception:  # noqa: BLE001 - statistics are best effort
+            logger.debug("Could not flush hot keys to Redis", exc_info=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._windows.clear()
+            self._unflushed.clear()
+
+    def _window_index(self) -> int:
+        return int(time.time() // self.window)
+
+    def _prune(self, current: int) -> None:
+        for bucket in [bucket for bucket in self._windows if bucket[1] < current - 1]:
+            del self._windows[bucket]
+
+    def _redis_key(self, namespace: str, index: int) -> str:
+        return f"{self.KEY_PREFIX}{namespace}:{index}"
+
+
+hot_keys = HotKeyTracker()
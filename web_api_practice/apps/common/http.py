@@ -1,22 +1,188 @@
+"""Shared HTTP plumbing: pooled async clients and a retrying GET helper."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+from urllib.parse import urlsplit
+
 import httpx
-import backoff
 from django.conf import settings
 
-RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+from .exceptions import DeadlineExceeded
+from .retry import RETRYABLE_ERRORS, RETRYABLE_STATUS, policy, time_left
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class ClientRegistry:
+    """Hand out one long-lived ``httpx.AsyncClient`` per upstream origin.
+
+    Clients are bound to the event loop that created them, so the registry keeps
+    a separate pool per running loop. Under ASGI the lifespan startup hook marks
+    the server's loop with ``keep_open`` and its pool lives until shutdown.
+    Other loops (one per request under WSGI/runserver via ``async_to_sync``)
+    only hold a pool for the duration of a ``session``: pooled connections
+    reference their loop, so a pool left behind would keep the loop and its
+    sockets alive forever.
+    """
+
+    def __init__(self) -> None:
+        self._pools: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]
+        ] = weakref.WeakKeyDictionary()
+        self._long_lived: weakref.WeakSet[asyncio.AbstractEventLoop] = weakref.WeakSet()
+        self._sessions: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, int
+        ] = weakref.WeakKeyDictionary()
+
+    def keep_open(self) -> None:
+        """Keep the running loop's pool across sessions, until ``aclose``."""
+
+        self._long_lived.add(asyncio.get_running_loop())
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[None]:
+        """Use the running loop's pool in the block, closing it after the last
+        concurrent session unless the loop was marked with ``keep_open``."""
+
+        loop = asyncio.get_running_loop()
+        self._sessions[loop] = self._sessions.get(loop, 0) + 1
+        try:
+            yield
+        finally:
+            self._sessions[loop] -= 1
+            if not self._sessions[loop] and loop not in self._long_lived:
+                del self._sessions[loop]
+                await self.aclose()
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled client for ``url``'s origin on the running loop."""
+
+        loop = asyncio.get_running_loop()
+        pool = self._pools.setdefault(loop, {})
+        origin = _origin(url)
+
+        client = pool.get(origin)
+        if client is None or client.is_closed:
+            client = self._build_client()
+            pool[origin] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close every client owned by the running loop."""
+
+        loop = asyncio.get_running_loop()
+        self._long_lived.discard(loop)
+        pool = self._pools.pop(loop, {})
+        await asyncio.gather(
+            *(client.aclose() for client in pool.values()),
+            return_exceptions=True,
+        )
+
+    @staticmethod
+    def _build_client() -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=int(getattr(settings, "HTTP_POOL_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(
+                getattr(settings, "HTTP_POOL_MAX_KEEPALIVE", 20)
+            ),
+            keepalive_expiry=float(getattr(settings, "HTTP_POOL_KEEPALIVE_EXPIRY", 30.0)),
+        )
+        http2 = HTTP2_AVAILABLE and bool(getattr(settings, "HTTP_ENABLE_HTTP2", True))
+        return httpx.AsyncClient(
+            timeout=getattr(settings, "HTTP_DEFAULT_TIMEOUT", 8.0),
+            limits=limits,
+            http2=http2,
+        )
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+clients = ClientRegistry()
+
+
+def get_client(url: str) -> httpx.AsyncClient:
+    """Borrow the shared client for ``url`` from the process-wide registry."""
+
+    return clients.get(url)
+
+
+async def open_clients() -> None:
+    """Pool clients for the server's whole lifetime; wired to ASGI lifespan startup."""
+
+    clients.keep_open()
+
+
+async def close_clients() -> None:
+    """Release pooled connections; wired to ASGI lifespan shutdown."""
+
+    await clients.aclose()
 
 
-@backoff.on_exception(
-    backoff.expo,
-    (
-        httpx.ReadTimeout,
-        httpx.ConnectTimeout,
-        httpx.RemoteProtocolError,
-        httpx.HTTPStatusError,
-    ),
-    max_tries=1 + int(getattr(settings, "HTTP_MAX_RETRIES", 2)),
-)
 async def get(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
-    response = await client.get(url, **kwargs)
-    if response.status_code in RETRYABLE_STATUS:
-        response.raise_for_status()
-    return response
+    """GET ``url``, retrying transient failures within the request deadline.
+
+    Each attempt's timeout is capped by the time left before the deadline
+    set with ``apps.common.retry.deadline``; see ``RetryPolicy`` for when a
+    timeout, connection error or 429/5xx response is retried.
+    """
+
+    return await _send(client, url, stream=False, **kwargs)
+
+
+@asynccontextmanager
+async def stream(client: httpx.AsyncClient, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+    """Like ``get``, but yield the response before its body has been read.
+
+    Retries only cover getting the status line and headers; the body is
+    consumed by the caller (e.g. with ``apps.common.jsonstream``) and the
+    connection is released when the block exits.
+    """
+
+    response = await _send(client, url, stream=True, **kwargs)
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+
+async def _send(
+    client: httpx.AsyncClient,
+    url: str,
+    *,
+    stream: bool,
+    **kwargs,
+) -> httpx.Response:
+    default_timeout = float(kwargs.pop("timeout", getattr(settings, "HTTP_DEFAULT_TIMEOUT", 8.0)))
+    attempt = 0
+    while True:
+        remaining = time_left()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(url)
+        timeout = default_timeout if remaining is None else min(default_timeout, remaining)
+
+        try:
+            request = client.build_request("GET", url, timeout=timeout, **kwargs)
+            response = await client.send(request, stream=stream)
+        except RETRYABLE_ERRORS:
+            delay = policy.next_delay(attempt)
+            if delay is None:
+                raise
+        else:
+            if response.status_code not in RETRYABLE_STATUS:
+                return response
+            delay = policy.next_delay(attempt, response)
+            if stream:
+                await response.aclose()
+            if delay is None:
+                response.raise_for_status()
+
+        attempt += 1
+        await asyncio.sleep(delay)
@@ -0,0 +1,108 @@
+"""Incremental JSON parsing of streamed upstream responses."""
+
+from __future__ import annotations
+
+import json
+import logging
+from functools import lru_cache
+from typing import Any, AsyncIterator, Iterable, Iterator
+
+import httpx
+
+try:  # Optional: parse straight from the byte stream.
+    import ijson
+except ImportError:  # pragma: no cover - depends on the environment
+    ijson = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+STREAMING_AVAILABLE = ijson is not None
+
+logger = logging.getLogger(__name__)
+
+
+class _ResponseReader:
+    """Async file-like view of a streamed response for ``ijson``."""
+
+    def __init__(self, response: httpx.Response) -> None:
+        self._chunks = response.aiter_bytes()
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:  # ijson probes the stream type with read(0)
+            return b""
+        try:
+            return await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+
+async def iter_items(
+    response: httpx.Response,
+    prefixes: Iterable[str],
+) -> AsyncIterator[tuple[str, Any]]:
+    """Yield ``(prefix, value)`` for every value found at one of ``prefixes``.
+
+    Prefixes use ``ijson`` notation: ``"list.item"`` is each element of the
+    top-level ``list`` array, ``"city"`` the top-level ``city`` value. With
+    ``ijson`` installed each value is built from the byte stream as soon as
+    it is complete, so only one matched value is held at a time; without it
+    the body is read and parsed whole, and values are yielded prefix by
+    prefix rather than in document order.
+    """
+
+    wanted = tuple(prefixes)
+    if ijson is None:
+        _warn_without_ijson()
+        document = _loads(await response.aread())
+        for prefix in wanted:
+            for value in _select(document, prefix.split(".")):
+                yield prefix, value
+        return
+
+    builder = None
+    current = None
+    async for prefix, event, value in ijson.parse_async(_ResponseReader(response), use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == current and event in ("end_map", "end_array"):
+                yield current, builder.value
+                builder = None
+            continue
+        if prefix not in wanted:
+            continue
+        if event in ("start_map", "start_array"):
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+            current = prefix
+        elif event not in ("map_key", "end_map", "end_array"):
+            yield prefix, value
+
+
+@lru_cache(maxsize=None)
+def _warn_without_ijson() -> None:
+    logger.warning(
+        "WEATHER_STREAMING_JSON is on but ijson is not installed; "
+        "responses are read whole before parsing"
+    )
+
+
+def _loads(body: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def _select(value: Any, path: list[str]) -> Iterator[Any]:
+    if not path:
+        yield value
+        return
+    head, rest = path[0], path[1:]
+    if head == "item":
+        if isinstance(value, list):
+            for item in value:
+                yield from _select(item, rest)
+    elif isinstance(value, dict) and head in value:
+        yield from _select(value[head], rest)
@@ -0,0 +1,61 @@
+"""Per-provider upstream latency tracking used to tune request hedging."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+
+from django.conf import settings
+
+
+class LatencyTracker:
+    """Keep the last ``LATENCY_WINDOW`` call durations per provider.
+
+    Failed and cancelled calls are recorded too, with the time they took
+    before giving up, which is a lower bound on the provider's latency.
+
+    ``hedge_delay`` is the ``HEDGE_PERCENTILE`` (p95 by default) of that
+    window, so a backup request is only started for calls slower than almost
+    every recent one. Until ``HEDGE_MIN_SAMPLES`` durations are known the
+    delay is ``HEDGE_DEFAULT_DELAY``; it never drops below ``HEDGE_MIN_DELAY``.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = {}
+
+    def observe(self, provider: str, seconds: float) -> None:
+        window = int(getattr(settings, "LATENCY_WINDOW", 200))
+        with self._lock:
+            samples = self._samples.get(provider)
+            if samples is None or samples.maxlen != window:
+                samples = self._samples[provider] = deque(samples or (), maxlen=window)
+            samples.append(seconds)
+
+    def percentile(self, provider: str, percent: float) -> float | None:
+        """Return the ``percent``-th percentile (nearest rank), or ``None`` without data."""
+
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if not samples:
+            return None
+        rank = max(1, min(len(samples), round(percent / 100 * len(samples))))
+        return samples[rank - 1]
+
+    def count(self, provider: str) -> int:
+        with self._lock:
+            return len(self._samples.get(provider, ()))
+
+    def hedge_delay(self, provider: str) -> float:
+        minimum = float(getattr(settings, "HEDGE_MIN_DELAY", 0.05))
+        delay = float(getattr(settings, "HEDGE_DEFAULT_DELAY", 1.0))
+        if self.count(provider) >= int(getattr(settings, "HEDGE_MIN_SAMPLES", 20)):
+            delay = self.percentile(provider, float(getattr(settings, "HEDGE_PERCENTILE", 95)))
+        return max(minimum, delay)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+latencies = LatencyTracker()
@@ -0,0 +1,50 @@
+"""ASGI lifespan support for process-wide resources."""
+
+from __future__ import annotations
+
+from typing import Awaitable, Callable, Iterable
+
+Hook = Callable[[], Awaitable[None]]
+
+
+class LifespanMiddleware:
+    """Answer ASGI ``lifespan`` events and pass everything else to Django.
+
+    Django's ASGI handler rejects lifespan scopes, so startup/shutdown hooks
+    (pooled HTTP clients, background tasks) are run here instead.
+    """
+
+    def __init__(
+        self,
+        app,
+        *,
+        on_startup: Iterable[Hook] = (),
+        on_shutdown: Iterable[Hook] = (),
+    ) -> None:
+        self.app = app
+        self.on_startup = list(on_startup)
+        self.on_shutdown = list(on_shutdown)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            return await self.app(scope, receive, send)
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    for hook in self.on_startup:
+                        await hook()
+                except Exception as exc:  # noqa: BLE001 - report to the server
+                    await send({"type": "lifespan.startup.failed", "message": str(exc)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                try:
+                    for hook in self.on_shutdown:
+                        await hook()
+                except Exception as exc:  # noqa: BLE001 - report to the server
+                    await send({"type": "lifespan.shutdown.failed", "message": str(exc)})
+                    return
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,57 @@
+"""Refresh hot weather and movie cache entries ahead of expiry."""
+
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from apps.common.http import close_clients
+from apps.common.prewarm import Prewarmer
+
+
+class Command(BaseCommand):
+    help = (
+        "Refresh configured (PREWARM_*_QUERIES) and observed hot cache keys "
+        "before they expire, respecting per-provider rate budgets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running, one pass every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Seconds between passes with --loop (default: PREWARM_INTERVAL).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the targets that are due without refreshing them.",
+        )
+
+    def handle(self, *args, **options):
+        asyncio.run(self._run(options))
+
+    async def _run(self, options):
+        prewarmer = Prewarmer()
+        try:
+            if options["dry_run"]:
+                for target in prewarmer.due(prewarmer.targets()):
+                    self.stdout.write(f"{target.namespace} {target.provider} {target.params}")
+                return
+
+            if options["loop"]:
+                await prewarmer.run_forever(options["interval"])
+                return
+
+            stats = await prewarmer.run_once()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    "Refreshed {refreshed}, skipped {skipped}, failed {failed}".format(**stats)
+                )
+            )
+        finally:
+            await close_clients()
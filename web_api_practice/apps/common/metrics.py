@@ -0,0 +1,39 @@
+"""Process-local counters for cache and upstream behaviour."""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+
+_counters: Counter[str] = Counter()
+_lock = threading.Lock()
+
+
+def incr(name: str, amount: int = 1) -> None:
+    with _lock:
+        _counters[name] += amount
+
+
+def get(name: str) -> int:
+    return _counters[name]
+
+
+def snapshot(prefix: str = "") -> dict[str, int]:
+    """Return a copy of the counters whose name starts with ``prefix``."""
+
+    with _lock:
+        return {name: value for name, value in _counters.items() if name.startswith(prefix)}
+
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+
+
+def hit_rate(namespace: str) -> float | None:
+    """Share of ``<namespace>.cache`` lookups served from the cache (stale included)."""
+
+    with _lock:
+        served = _counters[f"{namespace}.cache.hit"] + _counters[f"{namespace}.cache.stale"]
+        total = served + _counters[f"{namespace}.cache.miss"]
+    return served / total if total else None
@@ -0,0 +1,41 @@
+"""Canonical forms of free-text query values, so equivalent inputs share cache keys."""
+
+from __future__ import annotations
+
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict
+from . import metrics
+
+
+@lru_cache(maxsize=4096)
+def clean_text(value: str) -> str:
+    """NFKC-normalized ``value`` with runs of whitespace collapsed; case is kept."""
+
+    return " ".join(unicodedata.normalize("NFKC", value).split())
+
+
+@lru_cache(maxsize=4096)
+def normalize_text(value: str) -> str:
+    """``clean_text`` plus case folding: the form compared and used in cache keys."""
+
+    return clean_text(value).casefold()
+
+
+@lru_cache(maxsize=256)
+def normalize_code(value: str) -> str:
+    """Upper-case code (country, ISO-ish) with all whitespace removed."""
+
+    return "".join(unicodedata.normalize("NFKC", value).split()).upper()
+
+
+def record_rewrite(namespace: str, raw_params: Dict[str, Any], params: Dict[str, Any]) -> None:
+    """Count a lookup under ``<namespace>.normalize.*`` by whether its params changed.
+
+    ``rewritten`` lookups had their spacing, width, aliases or code case
+    changed on the way to the cache key; spellings differing only in letter
+    case are merged by the case-folded key without being counted here.
+    ``metrics.hit_rate`` shows the overall effect.
+    """
+
+    metrics.incr(f"{namespace}.normalize.{'unchanged' if raw_params == params else 'rewritten'}")
@@ -0,0 +1,217 @@
+"""Ahead-of-expiry cache pre-warming for hot weather and movie lookups."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .background import spawn
+from .hotkeys import hot_keys
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PrewarmTarget:
+    namespace: str  # "weather" | "movies"
+    provider: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def identity(self) -> str:
+        return json.dumps(
+            [self.namespace, self.provider, self.params],
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+
+
+class Prewarmer:
+    """Refresh configured and observed hot keys before they expire.
+
+    Targets come from ``PREWARM_WEATHER_QUERIES`` / ``PREWARM_MOVIES_QUERIES``
+    (query dicts shaped like the endpoints' query parameters) plus the top
+    ``PREWARM_HOT_KEYS`` lookups recorded by ``apps.common.hotkeys``. A target
+    is refreshed only when its entry is missing or turns stale within
+    ``PREWARM_LEAD_TIME`` seconds. Each provider is drained sequentially at
+    its ``PREWARM_RATE_LIMITS`` budget (requests per second) with up to
+    ``PREWARM_JITTER`` seconds of random delay; CWA targets are grouped into a
+    single multi-location request.
+
+    ``run_forever`` takes a cache lock per interval, so with a shared cache
+    only one process (ASGI worker or ``prewarm_cache --loop``) runs each pass
+    and ``PREWARM_RATE_LIMITS`` is a global budget rather than a per-worker one.
+    """
+
+    DEFAULT_RATE = 1.0
+    TICK_KEY = "prewarm:tick"
+
+    def __init__(self, *, weather_service=None, movies_service=None) -> None:
+        if weather_service is None:
+            from apps.weather.services import WeatherService
+
+            weather_service = WeatherService()
+        if movies_service is None:
+            from apps.movies.services import MoviesService
+
+            movies_service = MoviesService()
+
+        self.services = {"weather": weather_service, "movies": movies_service}
+        self.rates: Dict[str, float] = dict(getattr(settings, "PREWARM_RATE_LIMITS", {}))
+        self.jitter = float(getattr(settings, "PREWARM_JITTER", 1.0))
+        self.lead_time = float(getattr(settings, "PREWARM_LEAD_TIME", 60))
+        self.hot_limit = int(getattr(settings, "PREWARM_HOT_KEYS", 20))
+
+    def targets(self) -> List[PrewarmTarget]:
+        """Return the de-duplicated configured and observed targets."""
+
+        targets: List[PrewarmTarget] = []
+        configured = {
+            "weather": getattr(settings, "PREWARM_WEATHER_QUERIES", ()),
+            "movies": getattr(settings, "PREWARM_MOVIES_QUERIES", ()),
+        }
+        for namespace, queries in configured.items():
+            service = self.services[namespace]
+            for query in queries:
+                resolved = service.resolve(query)
+                if resolved is None:
+                    logger.warning("Skipping unresolvable pre-warm query %r", query)
+                    continue
+                targets.append(PrewarmTarget(namespace, *resolved))
+
+        for namespace in self.services:
+            for provider, params in hot_keys.top(namespace, self.hot_limit):
+                targets.append(PrewarmTarget(namespace, provider, params))
+
+        unique: Dict[str, PrewarmTarget] = {}
+        for target in targets:
+            unique.setdefault(target.identity, target)
+        return list(unique.values())
+
+    def due(self, targets: List[PrewarmTarget]) -> List[PrewarmTarget]:
+        return [
+            target
+            for target in targets
+            if self.services[target.namespace].needs_refresh(
+                target.provider, target.params, self.lead_time
+            )
+        ]
+
+    async def run_once(self) -> Dict[str, int]:
+        """Refresh every due target once; return refreshed/skipped/failed counts."""
+
+        targets = self.targets()
+        due = self.due(targets)
+        stats: Counter[str] = Counter(skipped=len(targets) - len(due))
+
+        groups: dict[tuple[str, str], List[PrewarmTarget]] = defaultdict(list)
+        for target in due:
+            groups[(target.namespace, target.provider)].append(target)
+
+        await asyncio.gather(
+            *(
+                self._drain(namespace, provider, group, stats)
+                for (namespace, provider), group in groups.items()
+            )
+        )
+        return {key: stats[key] for key in ("refreshed", "skipped", "failed")}
+
+    async def run_forever(self, interval: Optional[float] = None) -> None:
+        interval = float(interval or getattr(settings, "PREWARM_INTERVAL", 120))
+        while True:
+            try:
+                if self.claim_tick(interval):
+                    stats = await self.run_once()
+                    logger.info("Cache pre-warm pass: %s", stats)
+                else:
+                    logger.debug("Cache pre-warm pass already claimed by another process")
+            except Exception:  # noqa: BLE001 - keep the scheduler alive
+                logger.exception("Cache pre-warm pass failed")
+            await asyncio.sleep(interval + random.uniform(0, self.jitter))
+
+    def claim_tick(self, interval: float) -> bool:
+        """Claim the pass for the next ``interval`` seconds; ``False`` if already taken."""
+
+        return cache.add(self.TICK_KEY, 1, timeout=interval) is not False
+
+    async def _drain(
+        self,
+        namespace: str,
+        provider: str,
+        targets: List[PrewarmTarget],
+        stats: Counter[str],
+    ) -> None:
+        pause = 1.0 / float(self.rates.get(provider, self.DEFAULT_RATE))
+        service = self.services[namespace]
+
+        if namespace == "weather" and provider == "cwa":
+            calls = self._cwa_batches(service, targets)
+        else:
+            calls = [
+                (1, lambda target=target: service.refresh(target.provider, target.params))
+                for target in targets
+            ]
+
+        for index, (count, call) in enumerate(calls):
+            await asyncio.sleep(random.uniform(0, self.jitter))
+            try:
+                await call()
+                stats["refreshed"] += count
+            except Exception:  # noqa: BLE001 - one failure must not stop the pass
+                logger.warning("Pre-warm refresh failed for %s", provider, exc_info=True)
+                stats["failed"] += count
+            if index < len(calls) - 1:
+                await asyncio.sleep(pause)
+
+    @staticmethod
+    def _cwa_batches(service, targets: List[PrewarmTarget]):
+        """One ``warm_cwa`` call per country/units pair instead of one per county."""
+
+        names: dict[tuple[str, str], List[str]] = defaultdict(list)
+        for target in targets:
+            params = target.params
+            names[(params.get("country", "TW"), params.get("units", "metric"))].append(
+                params["location_name"]
+            )
+        return [
+            (
+                len(group),
+                lambda group=group, country=country, units=units: service.warm_cwa(
+                    group, country=country, units=units
+                ),
+            )
+            for (country, units), group in names.items()
+        ]
+
+
+_scheduler: Optional[asyncio.Task] = None
+
+
+async def start_scheduler() -> None:
+    """Start the in-process pre-warm loop when ``PREWARM_SCHEDULER_ENABLED``."""
+
+    global _scheduler
+    if not getattr(settings, "PREWARM_SCHEDULER_ENABLED", False) or _scheduler is not None:
+        return
+    _scheduler = spawn(Prewarmer().run_forever())
+
+
+async def stop_scheduler() -> None:
+    global _scheduler
+    if _scheduler is None:
+        return
+    _scheduler.cancel()
+    try:
+        await _scheduler
+    except asyncio.CancelledError:
+        pass
+    _scheduler = None
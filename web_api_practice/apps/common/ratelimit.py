@@ -0,0 +1,135 @@
+"""Client-side token-bucket rate limiting per upstream provider."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from typing import Optional
+
+from django.conf import settings
+
+from . import metrics
+from .cache import redis_connection
+from .retry import TokenBucket, time_left
+
+logger = logging.getLogger(__name__)
+
+# Refill the bucket from Redis' own clock so every worker agrees on "now".
+# Returns 0 when the tokens were taken, otherwise the seconds to wait.
+_ACQUIRE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RateLimiter:
+    """Keep each provider under its ``UPSTREAM_RATE_LIMITS`` quota.
+
+    Limits are ``{"rate": requests per second, "burst": bucket size}`` per
+    provider; providers without an entry are not limited. A caller over
+    budget waits for a token for at most ``UPSTREAM_RATE_LIMIT_WAIT`` seconds
+    (and never past the request deadline), otherwise ``acquire`` returns
+    ``False`` so the service can move on to a fallback provider instead of
+    collecting 429s. With ``UPSTREAM_RATE_LIMIT_BACKEND = "redis"`` the
+    buckets live in Redis and are shared by every worker; if Redis is
+    unreachable the process-local bucket is used.
+    """
+
+    KEY_PREFIX = "ratelimit:"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._script = None
+
+    @property
+    def shared(self) -> bool:
+        return getattr(settings, "UPSTREAM_RATE_LIMIT_BACKEND", "local") == "redis"
+
+    def limit(self, provider: str) -> Optional[tuple[float, float]]:
+        config = getattr(settings, "UPSTREAM_RATE_LIMITS", {}).get(provider)
+        if not config:
+            return None
+        return float(config["rate"]), float(config.get("burst", config["rate"]))
+
+    async def acquire(self, provider: str, max_wait: Optional[float] = None) -> bool:
+        """Take one token for ``provider``, waiting up to ``max_wait`` seconds for it."""
+
+        limit = self.limit(provider)
+        if limit is None:
+            return True
+
+        if max_wait is None:
+            max_wait = float(getattr(settings, "UPSTREAM_RATE_LIMIT_WAIT", 0.5))
+        remaining = time_left()
+        if remaining is not None:
+            max_wait = min(max_wait, remaining)
+
+        loop = asyncio.get_running_loop()
+        give_up_at = loop.time() + max_wait
+        while True:
+            wait = self._take(provider, *limit)
+            if wait <= 0:
+                return True
+            if loop.time() + wait > give_up_at:
+                metrics.incr(f"ratelimit.{provider}.rejected")
+                return False
+            metrics.incr(f"ratelimit.{provider}.delayed")
+            await asyncio.sleep(wait)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def _take(self, provider: str, rate: float, burst: float) -> float:
+        """Try to take a token now; return 0 on success or the seconds to wait."""
+
+        if self.shared:
+            wait = self._take_shared(provider, rate, burst)
+            if wait is not None:
+                return wait
+
+        bucket = self._bucket(provider, rate, burst)
+        if bucket.try_acquire():
+            return 0.0
+        return bucket.wait_time()
+
+    def _take_shared(self, provider: str, rate: float, burst: float) -> Optional[float]:
+        connection = redis_connection()
+        if connection is None:
+            return None
+        try:
+            if self._script is None:
+                self._script = connection.register_script(_ACQUIRE_SCRIPT)
+            return float(
+                self._script(keys=[f"{self.KEY_PREFIX}{provider}"], args=[rate, burst])
+            )
+        except Exception:  # noqa: BLE001 - fall back to the local bucket
+            logger.debug("Shared rate limit unavailable for %s", provider, exc_info=True)
+            return None
+
+    def _bucket(self, provider: str, rate: float, burst: float) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(provider)
+            if bucket is None or (bucket.rate, bucket.capacity) != (rate, burst):
+                bucket = self._buckets[provider] = TokenBucket(rate, burst)
+            return bucket
+
+
+limiter = RateLimiter()
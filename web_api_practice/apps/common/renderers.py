@@ -0,0 +1,51 @@
+"""JSON renderers that encode domain dataclasses directly."""
+
+from __future__ import annotations
+
+from dataclasses import fields, is_dataclass
+from typing import Any
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+class DataclassJSONEncoder(JSONEncoder):
+    """DRF's encoder, plus dataclass instances (field by field, not deep-copied)."""
+
+    def default(self, obj: Any) -> Any:
+        if is_dataclass(obj) and not isinstance(obj, type):
+            return {field.name: getattr(obj, field.name) for field in fields(obj)}
+        return super().default(obj)
+
+
+_fallback_encoder = DataclassJSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Render response data with orjson, writing dataclasses straight to bytes.
+
+    Views can put ``Forecast`` periods or ``Movie`` items into the response
+    as-is; orjson serializes dataclasses natively, so no per-item dict is
+    built. Anything orjson does not know (lazy translation strings, ``Decimal``
+    ...) goes through DRF's encoder. Without orjson installed this behaves
+    like DRF's ``JSONRenderer`` with dataclass support.
+    """
+
+    encoder_class = DataclassJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None) -> bytes:
+        if data is None:
+            return b""
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        option = orjson.OPT_NON_STR_KEYS
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_fallback_encoder.default, option=option)
+
@@ -0,0 +1,107 @@
+"""Response-level cache of rendered JSON bodies with ETag revalidation."""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.response import Response
+
+from .cache import tiered_cache
+from .renderers import ORJSONRenderer
+
+
+@dataclass
+class RenderedResponse:
+    body: bytes
+    etag: str
+    expires_at: float
+
+    def max_age(self) -> int:
+        return max(0, int(self.expires_at - time.time()))
+
+
+class ResponseCache:
+    """Keep the final JSON body of a GET endpoint, keyed by path and query string.
+
+    A hit skips the service lookup and rendering; views only report it to the
+    service (``record_response_hit``) so hot keys and hit counters stay whole. Every
+    response carries a content-hash ``ETag``, and a matching ``If-None-Match``
+    is answered with 304. ``Cache-Control: max-age`` is the time left before
+    the underlying service cache entry goes stale, so clients and proxies
+    never hold a body longer than the server would; a ``ttl`` of 0 (freshness
+    unknown) is neither cached nor marked cacheable. Only requests negotiated
+    to the JSON renderer are handled here, other renderers (the browsable API)
+    get a plain DRF ``Response``. ``RESPONSE_CACHE_ENABLED`` turns the cache
+    off (ETags and 304s still apply).
+    """
+
+    KEY_PREFIX = "response:"
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(settings, "RESPONSE_CACHE_ENABLED", True))
+
+    def lookup(self, request) -> Optional[HttpResponse]:
+        """Return the cached response for ``request`` (or a 304), if any."""
+
+        if not self._cacheable(request):
+            return None
+        entry = tiered_cache.get(self._key(request))
+        if not isinstance(entry, RenderedResponse) or entry.max_age() <= 0:
+            return None
+        return self._respond(request, entry)
+
+    def store(self, request, data: Any, ttl: Optional[float]) -> HttpResponse:
+        """Render ``data`` once, cache it for ``ttl`` seconds and respond with it."""
+
+        if not self._renders_json(request):
+            return Response(data)
+        body = ORJSONRenderer().render(data)
+        entry = RenderedResponse(
+            body=body,
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            expires_at=time.time() + max(0.0, ttl or 0.0),
+        )
+        if entry.max_age() > 0 and self._cacheable(request):
+            tiered_cache.set(self._key(request), entry, timeout=math.ceil(ttl))
+        return self._respond(request, entry)
+
+    def _cacheable(self, request) -> bool:
+        return self.enabled and request.method == "GET" and self._renders_json(request)
+
+    @staticmethod
+    def _renders_json(request) -> bool:
+        renderer = getattr(request, "accepted_renderer", None)
+        return renderer is None or isinstance(renderer, ORJSONRenderer)
+
+    def _key(self, request) -> str:
+        query = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values
+        )
+        digest = hashlib.blake2b(repr(query).encode(), digest_size=16).hexdigest()
+        return f"{self.KEY_PREFIX}{request.path}:{digest}"
+
+    @staticmethod
+    def _respond(request, entry: RenderedResponse) -> HttpResponse:
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        tags = {tag.removeprefix("W/") for tag in parse_etags(if_none_match or "")}
+        if "*" in tags or entry.etag in tags:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(entry.body, content_type="application/json")
+        response["ETag"] = entry.etag
+        max_age = entry.max_age()
+        response["Cache-Control"] = f"public, max-age={max_age}" if max_age else "no-cache"
+        return response
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,169 @@
+"""Deadline-aware retry policy for upstream HTTP calls."""
+
+from __future__ import annotations
+
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Iterator, Optional
+
+import httpx
+from django.conf import settings
+
+from . import metrics
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRY_AFTER_STATUS = {429, 503}
+RETRYABLE_ERRORS = (httpx.TimeoutException, httpx.ConnectError, httpx.RemoteProtocolError)
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "upstream_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Bound every upstream call made inside the block to ``seconds`` in total.
+
+    Nested blocks can only shorten the deadline, never extend it. Tasks
+    created inside the block (single-flight leaders, hedges) inherit it.
+    """
+
+    if seconds is None:
+        yield
+        return
+    current = _deadline.get()
+    expires_at = time.monotonic() + seconds
+    token = _deadline.set(expires_at if current is None else min(current, expires_at))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def time_left() -> Optional[float]:
+    """Seconds until the current deadline, or ``None`` when there is none."""
+
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until ``tokens`` would be available (0 if they are now)."""
+
+        with self._lock:
+            self._refill()
+            missing = tokens - self._tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float("inf")
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class RetryPolicy:
+    """Decide whether, and after how long, a failed upstream attempt is retried.
+
+    Retries use full-jitter exponential backoff (``HTTP_RETRY_BACKOFF_BASE``
+    doubling up to ``HTTP_RETRY_BACKOFF_MAX``), or the upstream's
+    ``Retry-After`` on 429/503 as long as it is at most
+    ``HTTP_RETRY_AFTER_MAX`` seconds. A retry is skipped when its delay would
+    run past the request deadline, and every retry spends a token from a
+    process-wide budget (``HTTP_RETRY_BUDGET_RATE`` tokens per second, up to
+    ``HTTP_RETRY_BUDGET_BURST``), so an upstream outage cannot multiply the
+    load on it or tie up workers in retry loops.
+    """
+
+    def __init__(self) -> None:
+        self._budget: Optional[TokenBucket] = None
+
+    @property
+    def max_retries(self) -> int:
+        return int(getattr(settings, "HTTP_MAX_RETRIES", 2))
+
+    @property
+    def budget(self) -> TokenBucket:
+        rate = float(getattr(settings, "HTTP_RETRY_BUDGET_RATE", 5.0))
+        burst = float(getattr(settings, "HTTP_RETRY_BUDGET_BURST", 20))
+        if self._budget is None or (self._budget.rate, self._budget.capacity) != (rate, burst):
+            self._budget = TokenBucket(rate, burst)
+        return self._budget
+
+    def backoff(self, attempt: int) -> float:
+        base = float(getattr(settings, "HTTP_RETRY_BACKOFF_BASE", 0.2))
+        cap = float(getattr(settings, "HTTP_RETRY_BACKOFF_MAX", 2.0))
+        return random.uniform(0, min(cap, base * 2 ** attempt))
+
+    def next_delay(
+        self,
+        attempt: int,
+        response: Optional[httpx.Response] = None,
+    ) -> Optional[float]:
+        """Return the pause before retry ``attempt`` (0-based), or ``None`` to give up."""
+
+        if attempt >= self.max_retries:
+            return None
+
+        delay = self.backoff(attempt)
+        if response is not None and response.status_code in RETRY_AFTER_STATUS:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                if retry_after > float(getattr(settings, "HTTP_RETRY_AFTER_MAX", 5.0)):
+                    return None
+                delay = retry_after
+
+        remaining = time_left()
+        if remaining is not None and delay >= remaining:
+            metrics.incr("http.retry.deadline")
+            return None
+
+        if not self.budget.try_acquire():
+            metrics.incr("http.retry.budget_exhausted")
+            return None
+
+        metrics.incr("http.retry")
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a ``Retry-After`` header given as seconds or as an HTTP date."""
+
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, moment.timestamp() - time.time())
+
+
+policy = RetryPolicy()
@@ -0,0 +1,140 @@
+"""Request coalescing (single-flight) for identical upstream lookups."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+import weakref
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .exceptions import SingleFlightTimeout
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Share one in-flight call between concurrent callers of the same key.
+
+    Within a process the first caller (the leader) runs ``fn``; every other
+    caller awaits the same task for at most ``SINGLEFLIGHT_WAIT_TIMEOUT``
+    seconds. With ``SINGLEFLIGHT_BACKEND = "redis"`` the leader additionally
+    takes a cache lock, so leaders in other workers poll ``peek`` for the
+    freshly cached value instead of calling upstream themselves. Callers that
+    run out of patience are served ``stale()`` when it has a value, otherwise
+    they get ``SingleFlightTimeout``. When every caller of a key has gone
+    (e.g. the losing side of a hedged request was cancelled), the shared call
+    is cancelled too.
+    """
+
+    LOCK_PREFIX = "singleflight:"
+
+    def __init__(self) -> None:
+        self._calls: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, asyncio.Future]
+        ] = weakref.WeakKeyDictionary()
+        self._waiters: weakref.WeakKeyDictionary[asyncio.Future, int] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def wait_timeout(self) -> float:
+        return float(getattr(settings, "SINGLEFLIGHT_WAIT_TIMEOUT", 10.0))
+
+    @property
+    def lock_timeout(self) -> int:
+        return int(getattr(settings, "SINGLEFLIGHT_LOCK_TIMEOUT", 30))
+
+    @property
+    def poll_interval(self) -> float:
+        return float(getattr(settings, "SINGLEFLIGHT_POLL_INTERVAL", 0.05))
+
+    @property
+    def use_redis_lock(self) -> bool:
+        return getattr(settings, "SINGLEFLIGHT_BACKEND", "local") == "redis"
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        peek: Optional[Callable[[], Optional[T]]] = None,
+        stale: Optional[Callable[[], Optional[T]]] = None,
+    ) -> T:
+        """Run ``fn`` once per ``key`` across concurrent callers."""
+
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+
+        task = calls.get(key)
+        leader = task is None
+        if leader:
+            task = loop.create_task(self._run(key, fn, peek))
+            calls[key] = task
+            task.add_done_callback(lambda done: _forget(calls, key, done))
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            if leader:
+                # Shielded so a cancelled leader does not cancel its followers.
+                return await asyncio.shield(task)
+            return await asyncio.wait_for(asyncio.shield(task), self.wait_timeout)
+        except (asyncio.TimeoutError, SingleFlightTimeout):
+            value = stale() if stale else None
+            if value is not None:
+                return value
+            raise SingleFlightTimeout(key) from None
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task] and not task.done():
+                task.cancel()
+
+    async def _run(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        peek: Optional[Callable[[], Optional[T]]],
+    ) -> T:
+        if not self.use_redis_lock:
+            return await fn()
+
+        loop = asyncio.get_running_loop()
+        lock_key = f"{self.LOCK_PREFIX}{key}"
+        token = uuid.uuid4().hex
+        deadline = loop.time() + self.wait_timeout
+
+        while True:
+            acquired = cache.add(lock_key, token, timeout=self.lock_timeout)
+            if acquired is None:
+                # Cache backend unavailable (IGNORE_EXCEPTIONS): no lock to share.
+                return await fn()
+
+            if acquired:
+                try:
+                    value = peek() if peek else None
+                    if value is not None:
+                        return value
+                    return await fn()
+                finally:
+                    if cache.get(lock_key) == token:
+                        cache.delete(lock_key)
+
+            value = peek() if peek else None
+            if value is not None:
+                return value
+            if loop.time() >= deadline:
+                raise SingleFlightTimeout(key)
+            await asyncio.sleep(self.poll_interval)
+
+
+def _forget(calls: dict[str, asyncio.Future], key: str, done: asyncio.Future) -> None:
+    if calls.get(key) is done:
+        del calls[key]
+    if not done.cancelled():
+        # Mark the exception retrieved; every waiter re-raises it on its own.
+        done.exception()
+
+
+flights = SingleFlight()
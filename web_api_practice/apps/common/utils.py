@@ -1,12 +1,38 @@
-from datetime import datetime, timezone
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
+from typing import Optional, Tuple
 
+# Upstream timestamps sit on a handful of 3/6/12-hour boundaries that repeat
+# across every city and request, so a small memo absorbs nearly all parsing.
+TIMESTAMP_CACHE_SIZE = 2048
 
-def to_iso_utc(dt_str: str) -> str:
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def _parse_utc(dt_str: str, naive_tz: tzinfo) -> Optional[Tuple[str, int]]:
+    # Returns the ISO form too: formatting costs about as much as parsing.
     try:
-        return (
-            datetime.fromisoformat(dt_str.replace("Z", ""))
-            .replace(tzinfo=timezone.utc)
-            .isoformat()
-        )
-    except Exception:
-        return dt_str
+        parsed = datetime.fromisoformat(dt_str.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=naive_tz).astimezone(timezone.utc)
+    else:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.isoformat(), int(parsed.timestamp())
+
+
+def to_iso_utc(dt_str: str, naive_tz: tzinfo = timezone.utc) -> str:
+    """ISO 8601 UTC form of ``dt_str``; naive times are taken to be in ``naive_tz``.
+
+    Strings that are not ISO timestamps, and non-strings, are returned unchanged.
+    """
+
+    parsed = _parse_utc(dt_str, naive_tz) if isinstance(dt_str, str) else None
+    return dt_str if parsed is None else parsed[0]
+
+
+def to_epoch_utc(dt_str: str, naive_tz: tzinfo = timezone.utc) -> Optional[int]:
+    """Whole epoch seconds of ``dt_str`` (naive times are in ``naive_tz``), or ``None``."""
+
+    parsed = _parse_utc(dt_str, naive_tz) if isinstance(dt_str, str) else None
+    return None if parsed is None else parsed[1]
@@ -0,0 +1,54 @@
+"""Async-capable DRF base view."""
+
+from __future__ import annotations
+
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework.views import APIView
+
+from .http import clients
+from .retry import deadline
+
+
+class AsyncAPIView(APIView):
+    """``APIView`` whose handlers are coroutines awaited on the ASGI event loop.
+
+    DRF's ``dispatch`` is synchronous, so a plain ``APIView`` can only reach
+    async services through ``async_to_sync``. This dispatcher keeps the regular
+    DRF pipeline (content negotiation, authentication, permissions, throttling,
+    exception handling) but awaits the handler directly. The blocking parts of
+    ``initial`` (session lookups, throttle cache reads) run via
+    ``sync_to_async`` so they never stall the loop. Upstream calls made by
+    the handler share one ``HTTP_REQUEST_DEADLINE`` and one client session,
+    so per-request loops (WSGI) close their connections when the view returns.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(
+                    self, request.method.lower(), self.http_method_not_allowed
+                )
+            else:
+                handler = self.http_method_not_allowed
+
+            async with clients.session():
+                with deadline(getattr(settings, "HTTP_REQUEST_DEADLINE", None)):
+                    response = handler(request, *args, **kwargs)
+                    if inspect.isawaitable(response):
+                        response = await response
+        except Exception as exc:  # noqa: BLE001 - delegated to DRF's handler
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -10,6 +10,9 @@ from ..schemas import SearchResult
 class BaseMoviesAdapter(ABC):
     """Define the interface every movie provider must implement."""
 
+    # Results per upstream page; used to re-page results to other sizes.
+    PAGE_SIZE: int = 20
+
     @abstractmethod
     async def search(self, **kwargs) -> SearchResult:
         """Return a normalized ``SearchResult`` built from provider data."""
@@ -5,10 +5,10 @@ from __future__ import annotations
 import math
 from typing import Any
 
-import httpx
 from django.conf import settings
 
 from ...common.http import get as http_get
+from ...common.http import get_client
 from ..schemas import Movie, SearchResult
 from .base import BaseMoviesAdapter
 
@@ -32,9 +32,8 @@ class OmdbAdapter(BaseMoviesAdapter):
             "page": page,
         }
 
-        timeout = getattr(settings, "HTTP_DEFAULT_TIMEOUT", 8.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await http_get(client, self.BASE_URL, params=params)
+        client = get_client(self.BASE_URL)
+        response = await http_get(client, self.BASE_URL, params=params)
         payload = response.json()
 
         items: list[Movie] = []
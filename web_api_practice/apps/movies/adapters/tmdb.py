@@ -4,10 +4,10 @@ from __future__ import annotations
 
 from typing import Any
 
-import httpx
 from django.conf import settings
 
 from ...common.http import get as http_get
+from ...common.http import get_client
 from ..schemas import Movie, SearchResult
 from .base import BaseMoviesAdapter
 
@@ -16,6 +16,7 @@ class TmdbAdapter(BaseMoviesAdapter):
     """Fetch movie search results from TMDb and normalize them."""
 
     BASE_URL = "https://api.themoviedb.org/3/search/movie"
+    PAGE_SIZE = 20
 
     async def search(self, *, query: str, page: int = 1, lang: str = "zh-TW") -> SearchResult:
         api_key = getattr(settings, "TMDB_API_KEY", None)
@@ -30,9 +31,8 @@ class TmdbAdapter(BaseMoviesAdapter):
             "language": lang,
         }
 
-        timeout = getattr(settings, "HTTP_DEFAULT_TIMEOUT", 8.0)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await http_get(client, self.BASE_URL, params=params)
+        client = get_client(self.BASE_URL)
+        response = await http_get(client, self.BASE_URL, params=params)
         payload = response.json()
 
         image_base = getattr(settings, "TMDB_IMAGE_BASE", "https://image.tmdb.org/t/p/w500")
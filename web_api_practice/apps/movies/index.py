@@ -0,0 +1,190 @@
+"""In-process title index answering autocomplete lookups locally."""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import combinations
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from ..common.normalize import normalize_text
+from .schemas import Movie
+
+# Titles and coverage are kept per ``(provider, lang)``: TMDb returns localized
+# titles, so a zh-TW result must not answer an en-US query.
+Scope = Tuple[str, str]
+_Key = Tuple[Scope, str]
+
+_MAX_CHAR = "\U0010ffff"
+
+# ``covers`` checks every token subset of a query; longer queries are not covered.
+_MAX_COVERED_TOKENS = 6
+
+
+@dataclass(slots=True)
+class _Entry:
+    movie: Movie
+    title: str
+    words: Tuple[str, ...]
+    seen_at: float
+
+
+class TitleIndex:
+    """Prefix index over every movie title the upstream searches returned.
+
+    Each title word goes into a sorted list, so a query matches titles with a
+    word starting with each query token ("star w" finds "Star Wars"). Entries
+    are fresh for ``MOVIES_INDEX_TTL`` seconds and the oldest are evicted
+    past ``MOVIES_INDEX_MAX_ENTRIES``. Titles and queries are compared in
+    their ``normalize_text`` form.
+
+    A query whose whole, non-empty result set arrived in one upstream page
+    is recorded as *covered*. Upstream search matches whole words, so only
+    queries adding whole words to a covered one ("star" -> "star wars") are
+    covered too; "alien" says nothing about "aliens". Coverage is a hint for
+    autocomplete only, never a substitute for an upstream search. The index
+    is per process; each worker builds its own.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[_Key, _Entry] = OrderedDict()
+        self._words: List[Tuple[str, Scope, str]] = []
+        self._covered: dict[Tuple[Scope, FrozenSet[str]], float] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(settings, "MOVIES_INDEX_ENABLED", True))
+
+    @property
+    def ttl(self) -> float:
+        return float(getattr(settings, "MOVIES_INDEX_TTL", 3600))
+
+    @property
+    def max_entries(self) -> int:
+        return int(getattr(settings, "MOVIES_INDEX_MAX_ENTRIES", 20000))
+
+    def add(
+        self,
+        scope: Scope,
+        movies: Iterable[Movie],
+        *,
+        query: Optional[str] = None,
+        complete: bool = False,
+    ) -> None:
+        """Index ``movies``; ``complete`` marks them as all results for ``query``.
+
+        An empty result set never counts as complete: providers answer
+        queries that are too broad ("st") with no items at all.
+        """
+
+        if not self.enabled:
+            return
+        movies = list(movies)
+        now = time.time()
+        with self._lock:
+            for movie in movies:
+                key = (scope, movie.id)
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self._drop_words(key, previous)
+                title = normalize_text(movie.title)
+                words = tuple(set(title.split()))
+                self._entries[key] = _Entry(movie, title, words, now)
+                for word in words:
+                    insort(self._words, (word, scope, movie.id))
+            cutoff = now - self.ttl
+            while self._entries:
+                evicting = len(self._entries) > self.max_entries
+                if not evicting and next(iter(self._entries.values())).seen_at >= cutoff:
+                    break
+                key, entry = self._entries.popitem(last=False)
+                self._drop_words(key, entry)
+                if evicting:
+                    # A still-fresh covered query may have matched this entry.
+                    self._forget_coverage(key[0])
+            tokens = frozenset(normalize_text(query or "").split())
+            if complete and movies and tokens:
+                self._covered[(scope, tokens)] = now
+            self._prune_coverage(now)
+
+    def covers(self, scope: Scope, query: str) -> bool:
+        """Whether ``query`` holds every word of a fresh, complete indexed query."""
+
+        tokens = sorted(set(normalize_text(query).split()))
+        if not self.enabled or not tokens or len(tokens) > _MAX_COVERED_TOKENS:
+            return False
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            return any(
+                self._covered.get((scope, frozenset(subset)), 0.0) >= cutoff
+                for size in range(1, len(tokens) + 1)
+                for subset in combinations(tokens, size)
+            )
+
+    def lookup(self, scope: Scope, query: str, limit: Optional[int] = None) -> List[Movie]:
+        """Fresh movies in ``scope`` with a title word starting with every query token.
+
+        Titles that start with the whole query come first, then shorter titles.
+        """
+
+        wanted = normalize_text(query)
+        tokens = wanted.split()
+        if not self.enabled or not tokens:
+            return []
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            matches: Optional[set[str]] = None
+            for token in tokens:
+                start = bisect_left(self._words, (token,))
+                stop = bisect_left(self._words, (token + _MAX_CHAR,))
+                ids = {
+                    movie_id
+                    for _, word_scope, movie_id in self._words[start:stop]
+                    if word_scope == scope
+                }
+                matches = ids if matches is None else matches & ids
+                if not matches:
+                    return []
+            entries = [
+                entry
+                for entry in (self._entries[(scope, movie_id)] for movie_id in matches)
+                if entry.seen_at >= cutoff
+            ]
+        entries.sort(
+            key=lambda entry: (not entry.title.startswith(wanted), len(entry.title), entry.title)
+        )
+        return [entry.movie for entry in entries[:limit]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._words.clear()
+            self._covered.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop_words(self, key: _Key, entry: _Entry) -> None:
+        scope, movie_id = key
+        for word in entry.words:
+            position = bisect_left(self._words, (word, scope, movie_id))
+            if position < len(self._words) and self._words[position] == (word, scope, movie_id):
+                del self._words[position]
+
+    def _forget_coverage(self, scope: Scope) -> None:
+        for key in [key for key in self._covered if key[0] == scope]:
+            del self._covered[key]
+
+    def _prune_coverage(self, now: float) -> None:
+        cutoff = now - self.ttl
+        for key in [key for key, seen_at in self._covered.items() if seen_at < cutoff]:
+            del self._covered[key]
+
+
+title_index = TitleIndex()
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Movie:
     id: str
     title: str
@@ -14,7 +14,7 @@ class Movie:
     source: str = "tmdb"
 
 
-@dataclass
+@dataclass(slots=True)
 class SearchResult:
     items: List[Movie]
     page: int
@@ -1,8 +1,28 @@
+from django.conf import settings
 from rest_framework import serializers
 
 
 class MoviesSearchQuery(serializers.Serializer):
     query = serializers.CharField(required=True)
     page = serializers.IntegerField(required=False, min_value=1, default=1)
+    # Re-page results to this many items, assembled from upstream pages.
+    page_size = serializers.IntegerField(required=False, min_value=1, max_value=100)
     provider = serializers.ChoiceField(choices=["tmdb", "omdb"], required=False)
     lang = serializers.CharField(required=False, default="zh-TW")
+
+    def validate(self, attrs):
+        # A deep re-paged page spans many upstream pages; bound how far it may reach.
+        max_depth = int(getattr(settings, "MOVIES_MAX_RESULT_DEPTH", 1000))
+        page_size = attrs.get("page_size")
+        if page_size and attrs["page"] * page_size > max_depth:
+            raise serializers.ValidationError(
+                f"page * page_size must not exceed {max_depth}"
+            )
+        return attrs
+
+
+class MoviesAutocompleteQuery(serializers.Serializer):
+    query = serializers.CharField(required=True)
+    provider = serializers.ChoiceField(choices=["tmdb", "omdb"], required=False)
+    lang = serializers.CharField(required=False, default="zh-TW")
+    limit = serializers.IntegerField(required=False, min_value=1, max_value=50, default=10)
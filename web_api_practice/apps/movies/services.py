@@ -2,19 +2,35 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable
+import asyncio
+import math
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Sequence
 
 from django.conf import settings
-from django.core.cache import cache
 
+from ..common import metrics
+from ..common.background import spawn
+from ..common.cache import CACHE_MODE_TTL, ServiceCache
+from ..common.circuit import breakers
+from ..common.exceptions import CircuitOpenError, RateLimited
+from ..common.hedging import hedged
+from ..common.hotkeys import hot_keys
+from ..common.latency import latencies
+from ..common.normalize import clean_text, normalize_text, record_rewrite
+from ..common.ratelimit import limiter
+from ..common.singleflight import flights
 from .adapters import BaseMoviesAdapter, OmdbAdapter, TmdbAdapter
-from .schemas import SearchResult
+from .index import Scope, title_index
+from .schemas import Movie, SearchResult
 
 
 class MoviesService:
     """Coordinate movie search providers with caching and graceful fallback."""
 
     DEFAULT_CACHE_TIMEOUT = 300
+    DEFAULT_STALE_CACHE_TIMEOUT = 3600
     DEFAULT_PRIMARY_PROVIDER = "tmdb"
     DEFAULT_PROVIDER_ORDER: tuple[str, ...] = ("tmdb", "omdb")
     DEFAULT_FALLBACKS: dict[str, tuple[str, ...]] = {
@@ -26,12 +42,32 @@ class MoviesService:
         self,
         *,
         cache_timeout: int | None = None,
+        stale_cache_timeout: int | None = None,
+        cache_mode: str | None = None,
         provider_order: Iterable[str] | None = None,
         fallbacks: Dict[str, Iterable[str]] | None = None,
+        hedge: bool | None = None,
+        prefetch_pages: int | None = None,
     ) -> None:
+        self._hedge = getattr(settings, "MOVIES_HEDGE_ENABLED", False) if hedge is None else hedge
+        self._prefetch_pages = (
+            getattr(settings, "MOVIES_PREFETCH_PAGES", 0)
+            if prefetch_pages is None
+            else prefetch_pages
+        )
         self._cache_timeout = cache_timeout or getattr(
             settings, "MOVIES_CACHE_TIMEOUT", self.DEFAULT_CACHE_TIMEOUT
         )
+        self._stale_cache_timeout = stale_cache_timeout or getattr(
+            settings, "MOVIES_STALE_CACHE_TIMEOUT", self.DEFAULT_STALE_CACHE_TIMEOUT
+        )
+        self._cache = ServiceCache(
+            namespace="movies",
+            value_type=SearchResult,
+            timeout=self._cache_timeout,
+            stale_timeout=self._stale_cache_timeout,
+            mode=cache_mode or getattr(settings, "MOVIES_CACHE_MODE", CACHE_MODE_TTL),
+        )
 
         configured_order = provider_order or getattr(
             settings, "MOVIES_PROVIDER_ORDER", self.DEFAULT_PROVIDER_ORDER
@@ -55,16 +91,28 @@ class MoviesService:
         self,
         *,
         provider: str | None = None,
+        page_size: int | None = None,
         **kwargs: Any,
     ) -> SearchResult:
-        """Search movies using the requested provider and fallbacks when needed."""
+        """Search movies using the requested provider and fallbacks when needed.
+
+        With hedging enabled, the first upstream call races the next provider
+        in the chain once it has run longer than the provider's hedge delay.
+        ``page_size`` re-pages the results, stitching each page together from
+        the upstream pages it spans. With prefetching enabled, the upstream
+        pages behind the next ``MOVIES_PREFETCH_PAGES`` pages are fetched into
+        the cache in the background.
+        """
+
+        if page_size:
+            return await self._search_assembled(provider, page_size, kwargs)
 
         provider_chain = self._build_provider_chain(provider)
         last_error: Exception | None = None
+        tried: set[str] = set()
 
-        for provider_name in provider_chain:
-            adapter = self._adapters.get(provider_name)
-            if adapter is None:
+        for position, provider_name in enumerate(provider_chain):
+            if provider_name not in self._adapters or provider_name in tried:
                 continue
 
             try:
@@ -74,23 +122,368 @@ class MoviesService:
                 continue
 
             cache_key = self._cache_key(provider_name, adapter_kwargs)
-            cached = cache.get(cache_key)
-            if isinstance(cached, SearchResult):
-                return cached
+            self._record_lookup(provider_name, kwargs, adapter_kwargs)
+            search = partial(self._search_coalesced, provider_name, adapter_kwargs, cache_key)
+            cached = self._cache.lookup(cache_key)
+            if cached is not None:
+                if not cached.is_fresh():
+                    self._cache.revalidate(cache_key, search)
+                self._prefetch(provider_name, adapter_kwargs, cached.value)
+                return cached.value
 
+            if self._hedge and not tried:
+                search = self._hedged(
+                    search, provider_name, provider_chain[position + 1:], kwargs, tried
+                )
+            tried.add(provider_name)
             try:
-                result = await adapter.search(**adapter_kwargs)
+                result = await search()
             except Exception as exc:  # noqa: BLE001 - fall back to next provider
                 last_error = exc
                 continue
 
-            cache.set(cache_key, result, timeout=self._cache_timeout)
+            self._prefetch(result.source, self._normalize_kwargs(result.source, kwargs), result)
             return result
 
         if last_error:
             raise last_error
         raise RuntimeError("No movie provider available for the given parameters")
 
+    async def autocomplete(
+        self,
+        *,
+        query: str,
+        provider: str | None = None,
+        limit: int = 10,
+        **kwargs: Any,
+    ) -> List[Movie]:
+        """Up to ``limit`` movies whose title words start with the tokens of ``query``.
+
+        Answered from the title index when it has ``limit`` matches or
+        covers ``query`` (see ``TitleIndex.covers``); otherwise one upstream
+        search (which feeds the index) fills it in. Plain searches always go
+        through the cache and upstream, never the index.
+        """
+
+        resolved = self.resolve({**kwargs, "query": query, "provider": provider})
+        if resolved is None:
+            return []
+        scope = self._index_scope(*resolved)
+        movies = title_index.lookup(scope, query, limit)
+        if len(movies) >= limit or title_index.covers(scope, query):
+            metrics.incr("movies.autocomplete.local")
+            return movies
+
+        metrics.incr("movies.autocomplete.upstream")
+        try:
+            result = await self.search(provider=provider, query=query, **kwargs)
+        except Exception:
+            if movies:
+                return movies
+            raise
+        params = self._normalize_kwargs(result.source, {**kwargs, "query": query})
+        return (
+            title_index.lookup(self._index_scope(result.source, params), query, limit)
+            or result.items[:limit]
+        )
+
+    def record_response_hit(self, query: Dict[str, Any]) -> None:
+        """Account for ``query`` served by the response cache in front of this service.
+
+        Records the hot key, the normalization outcome and a cache hit for the
+        provider that would have served it (for ``page_size`` queries, its
+        first upstream page); nothing is read or fetched.
+        """
+
+        kwargs = dict(query)
+        page_size = kwargs.pop("page_size", None)
+        resolved = self.resolve(kwargs)
+        if resolved is None:
+            return
+        provider_name, params = resolved
+        kwargs.pop("provider", None)
+        if page_size:
+            params["page"] = self._upstream_pages(provider_name, params["page"], page_size).start
+            hot_keys.record("movies", provider_name, params)
+        else:
+            self._record_lookup(provider_name, kwargs, params)
+        self._cache.count_hit()
+
+    def resolve(self, query: Dict[str, Any]) -> tuple[str, Dict[str, Any]] | None:
+        """Return the ``(provider, params)`` that would serve ``query`` first."""
+
+        kwargs = dict(query)
+        for provider_name in self._build_provider_chain(kwargs.pop("provider", None)):
+            if provider_name not in self._adapters:
+                continue
+            try:
+                return provider_name, self._normalize_kwargs(provider_name, kwargs)
+            except ValueError:
+                continue
+        return None
+
+    def expires_in(self, provider: str, query: Dict[str, Any]) -> float:
+        """Seconds the cached ``provider`` search result for ``query`` stays fresh.
+
+        0 when that is unknown (no fresh entry, e.g. a stale fallback was
+        served), so the response isn't cached. A ``page_size`` page lasts as
+        long as the shortest-lived upstream page it was assembled from.
+        """
+
+        try:
+            params = self._normalize_kwargs(provider, query)
+        except ValueError:
+            return 0.0
+        keys = [self._cache_key(provider, params)]
+        if query.get("page_size"):
+            pages = self._upstream_pages(provider, params["page"], query["page_size"])
+            first = self._cache.get(self._cache_key(provider, {**params, "page": pages.start}))
+            if first is None:
+                return 0.0
+            keys = [
+                self._cache_key(provider, {**params, "page": number})
+                for number in pages
+                if number <= max(pages.start, first.total_pages)
+            ]
+        remaining = [self._cache.expires_in(key) for key in keys]
+        if None in remaining:
+            return 0.0
+        return max(0.0, min(remaining))
+
+    def needs_refresh(self, provider: str, params: Dict[str, Any], lead_time: float) -> bool:
+        """Whether the cached entry is missing or goes stale within ``lead_time`` seconds."""
+
+        remaining = self._cache.expires_in(self._cache_key(provider, params))
+        return remaining is None or remaining <= lead_time
+
+    async def refresh(self, provider: str, params: Dict[str, Any]) -> SearchResult:
+        """Search ``provider``/``params`` upstream and overwrite its cache entry."""
+
+        if provider not in self._adapters:
+            raise ValueError(f"Unsupported movie provider '{provider}'")
+        cache_key = self._cache_key(provider, params)
+        return await flights.do(
+            cache_key, partial(self._search_and_store, provider, params, cache_key)
+        )
+
+    async def _search_assembled(
+        self,
+        provider: str | None,
+        page_size: int,
+        kwargs: Dict[str, Any],
+    ) -> SearchResult:
+        """Serve one ``page_size`` page assembled from upstream pages.
+
+        The first upstream page is fetched on its own; it tells how many pages
+        exist, so only the remaining pages up to ``total_pages`` are then
+        fetched concurrently. Every upstream page comes from the same provider
+        and is cached on its own, so other page sizes and plain paging reuse it.
+        """
+
+        last_error: Exception | None = None
+
+        for provider_name in self._build_provider_chain(provider):
+            if provider_name not in self._adapters:
+                continue
+            try:
+                params = self._normalize_kwargs(provider_name, kwargs)
+            except ValueError as exc:
+                last_error = exc
+                continue
+
+            page = params["page"]
+            upstream = self._upstream_pages(provider_name, page, page_size)
+            hot_keys.record("movies", provider_name, {**params, "page": upstream.start})
+            try:
+                first = await self._search_page(provider_name, {**params, "page": upstream.start})
+            except Exception as exc:
+                last_error = exc
+                continue
+            rest = await asyncio.gather(
+                *(
+                    self._search_page(provider_name, {**params, "page": number})
+                    for number in upstream[1:]
+                    if number <= first.total_pages
+                ),
+                return_exceptions=True,
+            )
+            failed = next((result for result in rest if isinstance(result, BaseException)), None)
+            if failed is not None:
+                last_error = failed
+                continue
+            items = [movie for result in (first, *rest) for movie in result.items]
+            offset = (page - 1) * page_size - (upstream.start - 1) * self._page_size(provider_name)
+            total_results = first.total_results
+            self._prefetch(
+                provider_name,
+                params,
+                first,
+                after=upstream.stop - 1,
+                through=self._upstream_pages(provider_name, page + self._prefetch_pages, page_size).stop - 1,
+            )
+            return SearchResult(
+                items=items[offset:offset + page_size],
+                page=page,
+                total_pages=math.ceil(total_results / page_size) if total_results else int(bool(items)),
+                total_results=total_results,
+                source=first.source,
+            )
+
+        if last_error:
+            raise last_error
+        raise RuntimeError("No movie provider available for the given parameters")
+
+    async def _search_page(self, provider: str, params: Dict[str, Any]) -> SearchResult:
+        """One upstream page of ``provider``, from the cache when possible."""
+
+        cache_key = self._cache_key(provider, params)
+        search = partial(self._search_coalesced, provider, params, cache_key)
+        cached = self._cache.lookup(cache_key)
+        if cached is not None:
+            if not cached.is_fresh():
+                self._cache.revalidate(cache_key, search)
+            return cached.value
+        return await search()
+
+    def _prefetch(
+        self,
+        provider: str,
+        params: Dict[str, Any],
+        served: SearchResult,
+        *,
+        after: int | None = None,
+        through: int | None = None,
+    ) -> None:
+        """Fetch uncached upstream pages ``after + 1 .. through`` in the background.
+
+        Defaults to the ``MOVIES_PREFETCH_PAGES`` pages following ``served``;
+        pages past ``served.total_pages`` are never requested.
+        """
+
+        if self._prefetch_pages <= 0:
+            return
+        after = params["page"] if after is None else after
+        through = after + self._prefetch_pages if through is None else through
+        pages = [
+            {**params, "page": number}
+            for number in range(after + 1, min(through, served.total_pages) + 1)
+            if self._cache.get(self._cache_key(provider, {**params, "page": number})) is None
+        ]
+        if pages:
+            spawn(self._run_prefetch(provider, pages))
+
+    async def _run_prefetch(self, provider: str, pages: Sequence[Dict[str, Any]]) -> None:
+        for params in pages:
+            try:
+                await self._search_coalesced(provider, params, self._cache_key(provider, params))
+            except Exception:  # noqa: BLE001 - prefetching is best effort
+                metrics.incr("movies.prefetch.failed")
+                return
+            metrics.incr("movies.prefetch.pages")
+
+    def _record_lookup(
+        self, provider: str, kwargs: Dict[str, Any], params: Dict[str, Any]
+    ) -> None:
+        record_rewrite("movies", self._normalize_kwargs(provider, kwargs, canonical=False), params)
+        hot_keys.record("movies", provider, params)
+
+    def _upstream_pages(self, provider: str, page: int, page_size: int) -> range:
+        """Upstream page numbers covering ``page`` when paging by ``page_size``."""
+
+        upstream_size = self._page_size(provider)
+        start = (page - 1) * page_size
+        return range(start // upstream_size + 1, (start + page_size - 1) // upstream_size + 2)
+
+    def _page_size(self, provider: str) -> int:
+        return self._adapters[provider].PAGE_SIZE
+
+    @staticmethod
+    def _index_scope(provider: str, params: Dict[str, Any]) -> Scope:
+        return provider, params.get("lang", "")
+
+    def _hedged(
+        self,
+        search: Callable[[], Awaitable[SearchResult]],
+        provider: str,
+        backups: Sequence[str],
+        query: Dict[str, Any],
+        tried: set[str],
+    ) -> Callable[[], Awaitable[SearchResult]]:
+        """Wrap ``search`` so the first backup able to serve ``query`` races it."""
+
+        for backup_name in backups:
+            if backup_name == provider or backup_name not in self._adapters:
+                continue
+            try:
+                params = self._normalize_kwargs(backup_name, query)
+            except ValueError:
+                continue
+            break
+        else:
+            return search
+
+        cache_key = self._cache_key(backup_name, params)
+
+        async def backup() -> SearchResult:
+            tried.add(backup_name)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+            return await self._search_coalesced(backup_name, params, cache_key)
+
+        return partial(hedged, search, backup, latencies.hedge_delay(provider))
+
+    async def _search_coalesced(
+        self,
+        provider: str,
+        params: Dict[str, Any],
+        cache_key: str,
+    ) -> SearchResult:
+        """Search and cache ``cache_key``, sharing the call with concurrent lookups."""
+
+        return await flights.do(
+            cache_key,
+            partial(self._search_and_store, provider, params, cache_key),
+            peek=partial(self._cache.get, cache_key),
+            stale=partial(self._cache.get_stale, cache_key),
+        )
+
+    async def _search_and_store(
+        self,
+        provider: str,
+        params: Dict[str, Any],
+        cache_key: str,
+    ) -> SearchResult:
+        # Rate limit first: a rejected call must not hold the half-open probe.
+        if not await limiter.acquire(provider):
+            raise RateLimited(provider)
+        breaker = breakers.get(provider)
+        if not breaker.allow():
+            raise CircuitOpenError(provider)
+        started = time.perf_counter()
+        try:
+            result = await self._adapters[provider].search(**params)
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled (a hedge loser): no outcome to record.
+            breaker.release_probe()
+            raise
+        finally:
+            # Failed and cancelled calls count too, as lower bounds: leaving
+            # them out would hide a slow provider from the hedge delay.
+            latencies.observe(provider, time.perf_counter() - started)
+        breaker.record_success()
+        self._cache.set(cache_key, result)
+        title_index.add(
+            self._index_scope(provider, params),
+            result.items,
+            query=params["query"],
+            complete=result.page == 1 and result.total_pages <= 1,
+        )
+        return result
+
     def _build_provider_chain(self, provider: str | None) -> tuple[str, ...]:
         if provider:
             primary = provider.lower()
@@ -100,12 +493,24 @@ class MoviesService:
         return self._provider_order
 
     @staticmethod
-    def _normalize_kwargs(provider: str, original: Dict[str, Any]) -> Dict[str, Any]:
+    def _normalize_kwargs(
+        provider: str, original: Dict[str, Any], *, canonical: bool = True
+    ) -> Dict[str, Any]:
+        """Adapter params for ``provider``; ``canonical`` cleans up the query.
+
+        With the case-folded ``_cache_key``, "Star Wars" and " star  wars"
+        share one cache key and upstream call.
+        """
+
         provider_key = provider.lower()
 
         query = original.get("query")
         if not query:
             raise ValueError("Movie search requires a 'query' parameter")
+        if canonical:
+            query = clean_text(query)
+            if not query:
+                raise ValueError("Movie search requires a 'query' parameter")
 
         page = int(original.get("page", 1) or 1)
 
@@ -127,9 +532,13 @@ class MoviesService:
 
     @staticmethod
     def _cache_key(provider: str, params: Dict[str, Any]) -> str:
+        values = {
+            key: normalize_text(value) if isinstance(value, str) else value
+            for key, value in params.items()
+        }
         serialized = ",".join(
-            f"{key}={params[key]}"
-            for key in sorted(params)
+            f"{key}={values[key]}"
+            for key in sorted(values)
         )
         return f"movies:{provider}:{serialized}"
 
@@ -5,4 +5,9 @@ from . import views
 urlpatterns = [
     path("movie/providers", views.movie_providers, name="movie_providers"),
     path("movies/search", views.MoviesSearchView.as_view(), name="movies_search"),
+    path(
+        "movies/autocomplete",
+        views.MoviesAutocompleteView.as_view(),
+        name="movies_autocomplete",
+    ),
 ]
@@ -1,12 +1,10 @@
-from dataclasses import asdict
-
-from asgiref.sync import async_to_sync
 from django.http import JsonResponse
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.response import Response
-from rest_framework.views import APIView
 
-from .serializers import MoviesSearchQuery
+from ..common.responses import response_cache
+from ..common.views import AsyncAPIView
+from .serializers import MoviesAutocompleteQuery, MoviesSearchQuery
 from .services import MoviesService
 
 
@@ -17,20 +15,20 @@ def movie_providers(request):
                 {
                     "id": "tmdb",
                     "name": "The Movie Database",
-                    "params": ["query", "page", "lang"],
+                    "params": ["query", "page", "page_size", "lang"],
                     "default": True,
                 },
                 {
                     "id": "omdb",
                     "name": "OMDb",
-                    "params": ["query", "page"],
+                    "params": ["query", "page", "page_size"],
                 },
             ]
         }
     )
 
 
-class MoviesSearchView(APIView):
+class MoviesSearchView(AsyncAPIView):
     """Handle movie search requests across providers."""
 
     service_class = MoviesService
@@ -40,23 +38,57 @@ class MoviesSearchView(APIView):
             OpenApiParameter(name="query", required=True, type=str),
             OpenApiParameter(name="provider", required=False, type=str),
             OpenApiParameter(name="page", required=False, type=int),
+            OpenApiParameter(name="page_size", required=False, type=int),
             OpenApiParameter(name="lang", required=False, type=str),
         ],
         responses={200: dict},
     )
-    def get(self, request):
+    async def get(self, request):
         serializer = MoviesSearchQuery(data=request.query_params)
+        cached = response_cache.lookup(request)
+        if cached is not None:
+            if serializer.is_valid():
+                self.service_class().record_response_hit(serializer.validated_data)
+            return cached
+
         serializer.is_valid(raise_exception=True)
 
         service = self.service_class()
-        result = async_to_sync(service.search)(**serializer.validated_data)
+        result = await service.search(**serializer.validated_data)
 
-        return Response(
+        return response_cache.store(
+            request,
             {
                 "source": result.source,
                 "page": result.page,
                 "total_pages": result.total_pages,
                 "total_results": result.total_results,
-                "items": [asdict(movie) for movie in result.items],
-            }
+                # Movie dataclasses are encoded directly by the ORJSON renderer.
+                "items": result.items,
+            },
+            service.expires_in(result.source, serializer.validated_data),
         )
+
+
+class MoviesAutocompleteView(AsyncAPIView):
+    """Suggest movies by title prefix, answered from the local title index when possible."""
+
+    service_class = MoviesService
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="query", required=True, type=str),
+            OpenApiParameter(name="provider", required=False, type=str),
+            OpenApiParameter(name="lang", required=False, type=str),
+            OpenApiParameter(name="limit", required=False, type=int),
+        ],
+        responses={200: dict},
+    )
+    async def get(self, request):
+        serializer = MoviesAutocompleteQuery(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        service = self.service_class()
+        items = await service.autocomplete(**serializer.validated_data)
+
+        return Response({"query": serializer.validated_data["query"], "items": items})
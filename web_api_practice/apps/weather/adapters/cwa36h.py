@@ -2,16 +2,23 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+from contextlib import aclosing
+from datetime import timedelta, timezone
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 
-import httpx
 from django.conf import settings
 
 from .base import BaseWeatherAdapter
 from ...common.http import get as http_get
+from ...common.http import get_client
+from ...common.http import stream as http_stream
+from ...common.jsonstream import iter_items
 from ...common.utils import to_iso_utc
 from ..schemas import CWAPeriod, Forecast
 
+# CWA startTime/endTime are naive Taiwan local times (no DST since 1979).
+TAIPEI = timezone(timedelta(hours=8), "Asia/Taipei")
+
 
 class Cwa36hAdapter(BaseWeatherAdapter):
     """Fetch and normalize Central Weather Administration 36h forecasts."""
@@ -27,33 +34,97 @@ class Cwa36hAdapter(BaseWeatherAdapter):
         units: str = "metric",
         elements: Iterable[str] | None = None,
     ) -> Forecast:
+        async with aclosing(self._iter_locations([location_name], elements)) as locations:
+            async for location in locations:
+                return self._build_forecast(
+                    location,
+                    fallback_name=location_name,
+                    country=country,
+                    units=units,
+                )
+
+        return Forecast(
+            location_name=location_name,
+            country=country,
+            units=units,
+            source="cwa",
+            periods=[],
+        )
+
+    async def fetch_forecasts(
+        self,
+        *,
+        location_names: Iterable[str] | None = None,
+        country: str = "TW",
+        units: str = "metric",
+        elements: Iterable[str] | None = None,
+    ) -> Dict[str, Forecast]:
+        """Fetch several counties in one request, keyed by CWA location name.
+
+        F-C0032-001 accepts a comma-separated ``locationName``; omitting it
+        returns every county and city in a single payload.
+        """
+
+        forecasts: Dict[str, Forecast] = {}
+        async for location in self._iter_locations(location_names, elements):
+            name = location.get("locationName")
+            if not name:
+                continue
+            forecasts[name] = self._build_forecast(
+                location,
+                fallback_name=name,
+                country=country,
+                units=units,
+            )
+        return forecasts
+
+    async def _iter_locations(
+        self,
+        location_names: Iterable[str] | None,
+        elements: Iterable[str] | None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the payload's location records one at a time.
+
+        With ``WEATHER_STREAMING_JSON`` each record is parsed straight off the
+        response stream and the rest of the document is never built.
+        """
+
         params = {
             "Authorization": getattr(settings, "CWA_API_KEY", settings.ENV.get("CWA_API_KEY", "")),
-            "locationName": location_name,
             "format": "JSON",
         }
 
+        names = [name for name in (location_names or ()) if name]
+        if names:
+            params["locationName"] = ",".join(names)
+
         selected_elements = tuple(elements) if elements else self.DEFAULT_ELEMENTS
         if selected_elements:
             params["elementName"] = ",".join(selected_elements)
 
-        async with httpx.AsyncClient(timeout=settings.HTTP_DEFAULT_TIMEOUT) as client:
-            response = await http_get(client, self.BASE_URL, params=params)
-            payload: Dict[str, Any] = response.json()
+        client = get_client(self.BASE_URL)
+        if getattr(settings, "WEATHER_STREAMING_JSON", False):
+            async with http_stream(client, self.BASE_URL, params=params) as response:
+                async for _prefix, location in iter_items(response, ("records.location.item",)):
+                    yield location
+            return
+
+        response = await http_get(client, self.BASE_URL, params=params)
+        payload: Dict[str, Any] = response.json()
 
         records = payload.get("records") or {}
-        locations = records.get("location") or []
-        if not locations:
-            return Forecast(
-                location_name=location_name,
-                country=country,
-                units=units,
-                source="cwa",
-                periods=[],
-            )
+        for location in records.get("location") or []:
+            yield location
 
-        location = locations[0]
-        actual_name = location.get("locationName") or location_name
+    def _build_forecast(
+        self,
+        location: Dict[str, Any],
+        *,
+        fallback_name: str,
+        country: str,
+        units: str,
+    ) -> Forecast:
+        actual_name = location.get("locationName") or fallback_name
         elements_map: Dict[str, List[Dict[str, Any]]] = {
             entry.get("elementName"): entry.get("time") or []
             for entry in location.get("weatherElement", [])
@@ -115,8 +186,8 @@ class Cwa36hAdapter(BaseWeatherAdapter):
         end_time = wx_entry.get("endTime") or (min_entry or {}).get("endTime") or (max_entry or {}).get("endTime")
 
         return CWAPeriod(
-            start=to_iso_utc(start_time),
-            end=to_iso_utc(end_time) if end_time else None,
+            start=to_iso_utc(start_time, TAIPEI),
+            end=to_iso_utc(end_time, TAIPEI) if end_time else None,
             desc=description,
             pop=pop_value,
             min_temp=min_temp,
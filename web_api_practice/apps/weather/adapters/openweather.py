@@ -4,11 +4,13 @@ from __future__ import annotations
 
 from typing import Any, Dict, List
 
-import httpx
 from django.conf import settings
 
 from .base import BaseWeatherAdapter
 from ...common.http import get as http_get
+from ...common.http import get_client
+from ...common.http import stream as http_stream
+from ...common.jsonstream import iter_items
 from ...common.utils import to_iso_utc
 from ..schemas import Forecast, OWMPeriod
 
@@ -21,31 +23,51 @@ class OpenWeatherAdapter(BaseWeatherAdapter):
     async def fetch_forecast(
         self,
         *,
-        city: str,
-        country: str,
+        city: str | None = None,
+        country: str | None = None,
+        lat: float | None = None,
+        lon: float | None = None,
         lang: str = "zh_tw",
         units: str = "metric",
     ) -> Forecast:
-        params = {
-            "q": f"{city},{country}",
+        """Forecast for ``city``/``country``, or for ``lat``/``lon`` when given instead."""
+
+        params: Dict[str, Any] = {
             "APPID": getattr(settings, "OWM_API_KEY", settings.ENV.get("OWM_API_KEY", "")),
             "lang": lang,
             "units": units,
         }
-
-        async with httpx.AsyncClient(timeout=settings.HTTP_DEFAULT_TIMEOUT) as client:
+        if city:
+            params["q"] = f"{city},{country}"
+        elif lat is not None and lon is not None:
+            params["lat"] = lat
+            params["lon"] = lon
+        else:
+            raise ValueError("OpenWeatherMap requires city/country or lat/lon")
+
+        client = get_client(self.BASE_URL)
+        city_info: Dict[str, Any] = {}
+        periods: List[OWMPeriod] = []
+        if getattr(settings, "WEATHER_STREAMING_JSON", False):
+            async with http_stream(client, self.BASE_URL, params=params) as response:
+                async for prefix, value in iter_items(response, ("list.item", "city")):
+                    if prefix == "city":
+                        city_info = value or {}
+                    else:
+                        period = self._build_period(value)
+                        if period:
+                            periods.append(period)
+        else:
             response = await http_get(client, self.BASE_URL, params=params)
             payload: Dict[str, Any] = response.json()
-
-        city_info: Dict[str, Any] = payload.get("city") or {}
-        location_name = city_info.get("name") or city
-        country_code = city_info.get("country") or country
-
-        periods: List[OWMPeriod] = []
-        for entry in payload.get("list", []):
-            period = self._build_period(entry)
-            if period:
-                periods.append(period)
+            city_info = payload.get("city") or {}
+            for entry in payload.get("list", []):
+                period = self._build_period(entry)
+                if period:
+                    periods.append(period)
+
+        location_name = city_info.get("name") or city or f"{lat},{lon}"
+        country_code = city_info.get("country") or country or ""
 
         return Forecast(
             location_name=location_name,
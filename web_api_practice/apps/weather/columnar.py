@@ -0,0 +1,286 @@
+"""Columnar (array-backed) view of a forecast and aggregates over it."""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from functools import cached_property, partial
+from typing import Any, Dict, List, Optional, Sequence
+
+try:  # Optional: real vectorized aggregation.
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+from ..common.utils import to_epoch_utc
+from .schemas import Forecast
+
+DAY = 86400
+
+# Period attribute(s) feeding each column; the first one present wins, so OWM
+# and CWA periods share columns (OWM has one temperature, CWA a min/max/avg).
+COLUMN_SOURCES: Dict[str, tuple[str, ...]] = {
+    "temp": ("temp", "avg_temp"),
+    "temp_min": ("temp", "min_temp"),
+    "temp_max": ("temp", "max_temp"),
+    "humidity": ("humidity",),
+    "wind_kph": ("wind_kph",),
+    "pop": ("pop",),
+}
+
+
+class ForecastColumns:
+    """Per-field float arrays over ``Forecast.periods``, each built on first use.
+
+    Columns are numpy arrays when numpy is installed and ``array("d")``
+    otherwise; missing values are NaN. ``ts`` holds each period's start as
+    epoch seconds and ``desc`` is a plain list of the descriptions.
+    """
+
+    def __init__(self, forecast: Forecast) -> None:
+        self.forecast = forecast
+
+    def __len__(self) -> int:
+        return len(self.forecast.periods)
+
+    @cached_property
+    def ts(self):
+        return _array(
+            _epoch(getattr(period, "ts", None) or getattr(period, "start", None))
+            for period in self.forecast.periods
+        )
+
+    @cached_property
+    def desc(self) -> List[str]:
+        return [period.desc for period in self.forecast.periods]
+
+    @cached_property
+    def temp(self):
+        return self._column("temp")
+
+    @cached_property
+    def temp_min(self):
+        return self._column("temp_min")
+
+    @cached_property
+    def temp_max(self):
+        return self._column("temp_max")
+
+    @cached_property
+    def humidity(self):
+        return self._column("humidity")
+
+    @cached_property
+    def wind_kph(self):
+        return self._column("wind_kph")
+
+    @cached_property
+    def pop(self):
+        return self._column("pop")
+
+    def _column(self, name: str):
+        sources = COLUMN_SOURCES[name]
+        return _array(_first(period, sources) for period in self.forecast.periods)
+
+
+# Resampling intervals accepted by ``resample``, in seconds.
+INTERVALS: Dict[str, int] = {"6h": 6 * 3600, "12h": 12 * 3600, "day": DAY}
+
+DAILY_STATS: Dict[str, tuple[str, str]] = {
+    "temp_min": ("temp_min", "min"),
+    "temp_max": ("temp_max", "max"),
+    "temp_mean": ("temp", "mean"),
+    "humidity_mean": ("humidity", "mean"),
+    "wind_kph_max": ("wind_kph", "max"),
+    "pop_max": ("pop", "max"),
+}
+
+RESAMPLE_STATS: Dict[str, tuple[str, str]] = {
+    "temp_min": ("temp_min", "min"),
+    "temp_max": ("temp_max", "max"),
+    "temp_mean": ("temp", "mean"),
+    "wind_kph_max": ("wind_kph", "max"),
+}
+
+
+def daily_summary(columns: ForecastColumns, utc_offset: float = 0) -> List[Dict[str, Any]]:
+    """Aggregate the periods per calendar day at ``utc_offset`` hours from UTC.
+
+    Each day reports its period count, min/max/mean temperature, mean
+    humidity, max wind speed and max precipitation probability (``None``
+    when no period of that day has the value).
+    """
+
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+    summary = []
+    for day, count, _, stats in _aggregate(columns, DAY, utc_offset * 3600, DAILY_STATS):
+        row: Dict[str, Any] = {
+            "date": (epoch + timedelta(days=day)).date().isoformat(),
+            "periods": count,
+        }
+        row.update(stats)
+        summary.append(row)
+    return summary
+
+
+def resample(columns: ForecastColumns, interval: str, utc_offset: float = 0) -> List[Dict[str, Any]]:
+    """Collapse the periods into ``INTERVALS[interval]`` buckets.
+
+    Buckets are aligned to midnight at ``utc_offset`` hours from UTC and
+    report their UTC start/end, period count, min/max/mean temperature, max
+    wind speed and the most common description (earliest wins ties).
+    """
+
+    width = INTERVALS[interval]
+    shift = utc_offset * 3600
+    descriptions = columns.desc
+    rows = []
+    for bucket, count, members, stats in _aggregate(columns, width, shift, RESAMPLE_STATS):
+        start = bucket * width - shift
+        row: Dict[str, Any] = {
+            "start": datetime.fromtimestamp(start, timezone.utc).isoformat(),
+            "end": datetime.fromtimestamp(start + width, timezone.utc).isoformat(),
+            "periods": count,
+            "desc": Counter(descriptions[i] for i in members).most_common(1)[0][0],
+        }
+        row.update(stats)
+        rows.append(row)
+    return rows
+
+
+def _aggregate(columns, width, shift, spec):
+    """Yield ``(bucket, count, member_indexes, stats)`` per non-empty bucket.
+
+    Periods fall into bucket ``floor((ts + shift) / width)``; ``spec`` maps
+    an output name to a ``(column, "min"|"max"|"mean")`` pair and reductions
+    skip NaN, reporting ``None`` for buckets without any value.
+    """
+
+    if np is not None:
+        bucket_index = np.floor((columns.ts + shift) / width)
+        valid = ~np.isnan(bucket_index)
+        buckets, groups = np.unique(bucket_index[valid], return_inverse=True)
+        size = len(buckets)
+        counts = np.bincount(groups, minlength=size)
+        positions = np.flatnonzero(valid)
+        order = np.argsort(groups, kind="stable")
+        members = np.split(positions[order], np.cumsum(counts)[:-1])
+        reducers = {
+            "min": partial(_np_reduce, np.fmin),
+            "max": partial(_np_reduce, np.fmax),
+            "mean": _np_mean,
+        }
+        results = {
+            name: reducers[op](getattr(columns, column)[valid], groups, size).tolist()
+            for name, (column, op) in spec.items()
+        }
+        for position, bucket in enumerate(buckets.tolist()):
+            stats = {name: _clean(values[position]) for name, values in results.items()}
+            yield int(bucket), int(counts[position]), members[position].tolist(), stats
+        return
+
+    grouped: Dict[int, List[int]] = defaultdict(list)
+    for index, ts in enumerate(columns.ts):
+        if not math.isnan(ts):
+            grouped[int((ts + shift) // width)].append(index)
+    reducers = {"min": min, "max": max, "mean": _mean}
+    for bucket in sorted(grouped):
+        indexes = grouped[bucket]
+        stats = {}
+        for name, (column, op) in spec.items():
+            data = getattr(columns, column)
+            values = [data[i] for i in indexes if not math.isnan(data[i])]
+            stats[name] = reducers[op](values) if values else None
+        yield bucket, len(indexes), indexes, stats
+
+
+def rolling_mean(values: Sequence[float], window: int):
+    """Trailing mean over ``window`` periods; the first ``window - 1`` are NaN."""
+
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    if np is not None:
+        data = np.asarray(values, dtype=float)
+        result = np.full(len(data), np.nan)
+        if len(data) >= window:
+            sums = np.cumsum(np.insert(data, 0, 0.0))
+            result[window - 1:] = (sums[window:] - sums[:-window]) / window
+        return result
+
+    result = array("d", [math.nan] * len(values))
+    total = 0.0
+    for index, value in enumerate(values):
+        total += value
+        if index >= window:
+            total -= values[index - window]
+        if index >= window - 1:
+            result[index] = total / window
+    return result
+
+
+def pop_windows(columns: ForecastColumns, threshold: float) -> List[tuple[int, int]]:
+    """Half-open ``(start, stop)`` period index runs with ``pop >= threshold``."""
+
+    if np is not None:
+        wet = np.nan_to_num(columns.pop, nan=-1.0) >= threshold
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], wet.astype(np.int8), [0]))))
+        return [(int(start), int(stop)) for start, stop in zip(edges[::2], edges[1::2])]
+
+    windows: List[tuple[int, int]] = []
+    start: Optional[int] = None
+    for index, value in enumerate(columns.pop):
+        wet = not math.isnan(value) and value >= threshold
+        if wet and start is None:
+            start = index
+        elif not wet and start is not None:
+            windows.append((start, index))
+            start = None
+    if start is not None:
+        windows.append((start, len(columns.pop)))
+    return windows
+
+
+def _array(values):
+    if np is not None:
+        return np.fromiter(values, dtype=float)
+    return array("d", values)
+
+
+def _first(period: Any, names: tuple[str, ...]) -> float:
+    for name in names:
+        value = getattr(period, name, None)
+        if value is not None:
+            return float(value)
+    return math.nan
+
+
+def _epoch(value: Optional[str]) -> float:
+    seconds = to_epoch_utc(value) if value else None
+    return math.nan if seconds is None else float(seconds)
+
+
+def _mean(values: List[float]) -> float:
+    return sum(values) / len(values)
+
+
+def _clean(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _np_reduce(ufunc, values, groups, size):
+    # fmin/fmax skip NaN; groups left at +/-inf had no value at all.
+    initial = np.inf if ufunc is np.fmin else -np.inf
+    result = np.full(size, initial)
+    ufunc.at(result, groups, values)
+    result[np.isinf(result)] = np.nan
+    return result
+
+
+def _np_mean(values, groups, size):
+    present = ~np.isnan(values)
+    sums = np.bincount(groups, weights=np.where(present, values, 0.0), minlength=size)
+    counts = np.bincount(groups, weights=present.astype(float), minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
@@ -0,0 +1,158 @@
+"""Canonical location names for the weather providers."""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+
+from ..common import geohash
+from ..common.normalize import clean_text, normalize_code, normalize_text
+
+# The 22 county-level names accepted by CWA F-C0032-001.
+CWA_COUNTIES: Tuple[str, ...] = (
+    "臺北市", "新北市", "桃園市", "臺中市", "臺南市", "高雄市",
+    "基隆市", "新竹市", "嘉義市", "新竹縣", "苗栗縣", "彰化縣",
+    "南投縣", "雲林縣", "嘉義縣", "屏東縣", "宜蘭縣", "花蓮縣",
+    "臺東縣", "澎湖縣", "金門縣", "連江縣",
+)
+
+# County seat coordinates, the reference points for routing coordinates to a
+# county. Nearest-seat routing is approximate along county borders.
+COUNTY_SEATS: Dict[str, Tuple[float, float]] = {
+    "臺北市": (25.0375, 121.5637),
+    "新北市": (25.0120, 121.4650),
+    "桃園市": (24.9936, 121.3010),
+    "臺中市": (24.1618, 120.6469),
+    "臺南市": (22.9920, 120.1850),
+    "高雄市": (22.6203, 120.3120),
+    "基隆市": (25.1316, 121.7445),
+    "新竹市": (24.8066, 120.9686),
+    "嘉義市": (23.4815, 120.4537),
+    "新竹縣": (24.8270, 121.0129),
+    "苗栗縣": (24.5650, 120.8206),
+    "彰化縣": (24.0755, 120.5447),
+    "南投縣": (23.9022, 120.6908),
+    "雲林縣": (23.7080, 120.5431),
+    "嘉義縣": (23.4588, 120.2929),
+    "屏東縣": (22.6730, 120.4880),
+    "宜蘭縣": (24.7303, 121.7631),
+    "花蓮縣": (23.9913, 121.6197),
+    "臺東縣": (22.7559, 121.1504),
+    "澎湖縣": (23.5712, 119.5793),
+    "金門縣": (24.4367, 118.3186),
+    "連江縣": (26.1580, 119.9510),
+}
+
+# (min_lat, min_lon, max_lat, max_lon)
+Box = Tuple[float, float, float, float]
+
+# Taiwan and its nearby islets (Green Island, Orchid Island, Xiaoliuqiu), where
+# the nearest county seat decides the county.
+MAIN_ISLAND: Box = (21.85, 119.95, 25.35, 122.05)
+
+# The outlying counties lie a few km off mainland China, so a distance cutoff
+# around their seats would take in Xiamen or Fuzhou; they are matched by tight
+# boxes around their islands instead.
+ISLAND_COUNTIES: Dict[str, Tuple[Box, ...]] = {
+    "澎湖縣": ((23.15, 119.30, 23.85, 119.75),),
+    "金門縣": (
+        (24.39, 118.27, 24.51, 118.48),  # Kinmen
+        (24.38, 118.21, 24.46, 118.27),  # Lieyu
+    ),
+    "連江縣": (
+        (26.13, 119.90, 26.26, 120.02),  # Nangan, Beigan
+        (25.93, 119.92, 25.99, 120.00),  # Juguang
+        (26.34, 120.46, 26.39, 120.52),  # Dongyin
+    ),
+}
+
+# "臺中" -> "臺中市"; stems shared by a city and a county (新竹, 嘉義) stay ambiguous.
+_STEMS = Counter(name[:-1] for name in CWA_COUNTIES)
+DEFAULT_COUNTY_ALIASES: Dict[str, str] = {
+    name[:-1]: name for name in CWA_COUNTIES if _STEMS[name[:-1]] == 1
+}
+
+
+def canonical_county(name: str) -> str:
+    """CWA ``locationName`` for ``name``.
+
+    Whitespace is dropped, the common variant 台 becomes 臺, and the result
+    goes through ``WEATHER_CWA_ALIASES`` (matched the same way) and then
+    ``DEFAULT_COUNTY_ALIASES``. Unknown names pass through otherwise intact.
+    """
+
+    key = _county_key(name)
+    configured = getattr(settings, "WEATHER_CWA_ALIASES", {})
+    for alias, target in configured.items():
+        if _county_key(alias) == key:
+            return target
+    if key in DEFAULT_COUNTY_ALIASES:
+        return DEFAULT_COUNTY_ALIASES[key]
+    return "".join(clean_text(name).split()).replace("台", "臺")
+
+
+def canonical_city(city: str, country: str) -> Tuple[str, str]:
+    """Cleaned OWM ``(city, country)``, mapped through ``WEATHER_OWM_ALIASES``.
+
+    The alias table maps ``(city, country)`` pairs to the pair OWM should be
+    asked for, e.g. ``("台北", "TW"): ("Taipei", "TW")``, and matches
+    regardless of case and spacing. ``country`` is upper-cased.
+    """
+
+    wanted = (normalize_text(city), normalize_code(country))
+    for alias, target in getattr(settings, "WEATHER_OWM_ALIASES", {}).items():
+        if (normalize_text(alias[0]), normalize_code(alias[1])) == wanted:
+            return clean_text(target[0]), normalize_code(target[1])
+    return clean_text(city), wanted[1]
+
+
+def nearest_county(lat: float, lon: float) -> Optional[str]:
+    """CWA ``locationName`` covering ``lat``/``lon``, or ``None`` outside Taiwan.
+
+    Points on an outlying island map to its county; points on the main
+    island map to the county whose seat is nearest, memoized per
+    ``WEATHER_GEOHASH_PRECISION`` cell, so routing never needs an upstream
+    geocoding call.
+    """
+
+    for county, boxes in ISLAND_COUNTIES.items():
+        if any(_inside(box, lat, lon) for box in boxes):
+            return county
+    if not _inside(MAIN_ISLAND, lat, lon):
+        return None
+    return _nearest_seat_in(geohash.encode(lat, lon, geohash_precision()))
+
+
+def geohash_precision() -> int:
+    return int(getattr(settings, "WEATHER_GEOHASH_PRECISION", 5))
+
+
+@lru_cache(maxsize=4096)
+def _nearest_seat_in(cell: str) -> str:
+    min_lat, min_lon, max_lat, max_lon = geohash.bounds(cell)
+    lat, lon = (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+    return min(
+        (_distance_km(lat, lon, *seat), name)
+        for name, seat in COUNTY_SEATS.items()
+        if name not in ISLAND_COUNTIES
+    )[1]
+
+
+def _inside(box: Box, lat: float, lon: float) -> bool:
+    min_lat, min_lon, max_lat, max_lon = box
+    return min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+
+
+def _distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    # Equirectangular approximation; plenty accurate at county scale.
+    x = math.radians(lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return 6371.0 * math.hypot(x, y)
+
+
+def _county_key(name: str) -> str:
+    return "".join(normalize_text(name).split()).replace("台", "臺")
@@ -6,7 +6,7 @@ from dataclasses import dataclass, field
 from typing import Optional, Union
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OWMPeriod:
     """Normalized period entry from OpenWeatherMap."""
 
@@ -17,7 +17,7 @@ class OWMPeriod:
     wind_kph: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CWAPeriod:
     """Normalized period entry from CWA 36-hour dataset."""
 
@@ -31,14 +31,33 @@ class CWAPeriod:
     comfort: Optional[str] = None
 
 
-Period = Union[OWMPeriod, CWAPeriod]
+@dataclass(slots=True, frozen=True)
+class MergedPeriod:
+    """An OWM 3-hour point annotated with the CWA window that contains it."""
+
+    ts: str  # ISO8601 UTC timestamp
+    temp: Optional[float]
+    desc: str
+    humidity: Optional[int] = None
+    wind_kph: Optional[float] = None
+    pop: Optional[int] = None
+    min_temp: Optional[float] = None
+    max_temp: Optional[float] = None
+    comfort: Optional[str] = None
+    window_desc: Optional[str] = None
+    window_start: Optional[str] = None
+    window_end: Optional[str] = None
+
+
+Period = Union[OWMPeriod, CWAPeriod, MergedPeriod]
 
 
-@dataclass
+@dataclass(slots=True)
 class Forecast:
     location_name: str
     country: str
     units: str  # "metric" | "imperial"
-    source: str  # "owm" | "cwa"
+    source: str  # "owm" | "cwa" | "merged"
     periods: list[Period] = field(default_factory=list)
+    parts: tuple[str, ...] = ()  # providers combined into a "merged" forecast
 
@@ -13,29 +13,62 @@ class ForecastQuery(serializers.Serializer):
     # CWA query fields
     locationName = serializers.CharField(required=False)
 
+    # Coordinates: OWM queries them directly, CWA routes them to the nearest county
+    lat = serializers.FloatField(required=False, min_value=-90, max_value=90)
+    lon = serializers.FloatField(required=False, min_value=-180, max_value=180)
+
     # Provider selector
-    provider = serializers.ChoiceField(choices=["owm", "cwa"], required=False)
+    provider = serializers.ChoiceField(choices=["owm", "cwa", "merged"], required=False)
 
     def validate(self, attrs):
         provider = attrs.get("provider")
 
+        if ("lat" in attrs) != ("lon" in attrs):
+            raise serializers.ValidationError("lat and lon must be given together")
+        has_coords = "lat" in attrs
+
         if provider == "cwa":
-            if not attrs.get("locationName"):
+            if not attrs.get("locationName") and not has_coords:
+                raise serializers.ValidationError(
+                    "locationName or lat+lon is required when provider=cwa"
+                )
+        elif provider == "merged":
+            has_cwa = bool(attrs.get("locationName")) or has_coords
+            has_owm = bool(attrs.get("city") and attrs.get("country")) or has_coords
+            if not (has_cwa and has_owm):
                 raise serializers.ValidationError(
-                    "locationName is required when provider=cwa"
+                    "lat+lon, or locationName plus city and country, are required when provider=merged"
                 )
         elif provider == "owm":
-            if not attrs.get("city") or not attrs.get("country"):
+            if not (attrs.get("city") and attrs.get("country")) and not has_coords:
                 raise serializers.ValidationError(
-                    "city and country are required when provider=owm"
+                    "city and country, or lat+lon, are required when provider=owm"
                 )
         else:
             # Provider optional; require at least one supported location input
             has_cwa = bool(attrs.get("locationName"))
             has_owm = bool(attrs.get("city") and attrs.get("country"))
-            if not (has_cwa or has_owm):
+            if not (has_cwa or has_owm or has_coords):
                 raise serializers.ValidationError(
-                    "Provide locationName (CWA) or city+country (OWM)."
+                    "Provide locationName (CWA), city+country (OWM) or lat+lon."
                 )
 
         return attrs
+
+
+class ForecastBatchQuery(serializers.Serializer):
+    MAX_ITEMS = 50
+
+    items = ForecastQuery(many=True, allow_empty=False, max_length=MAX_ITEMS)
+
+
+class ForecastSummaryQuery(serializers.Serializer):
+    """Optional aggregate views over a single forecast."""
+
+    summary = serializers.ChoiceField(choices=["daily"], required=False)
+    # Replaces ``periods`` with buckets of this size.
+    interval = serializers.ChoiceField(choices=["6h", "12h", "day"], required=False)
+    # Hours from UTC that define calendar days for summaries and buckets.
+    utc_offset = serializers.IntegerField(
+        required=False, default=0, min_value=-12, max_value=14
+    )
@@ -2,37 +2,81 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import time
+from collections import defaultdict
 from dataclasses import asdict, is_dataclass
-from typing import Any, Dict, Iterable, List
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Sequence
 
 from django.conf import settings
-from django.core.cache import cache
 
+from ..common import geohash, metrics
+from ..common.background import spawn
+from ..common.cache import CACHE_MODE_TTL, ServiceCache, tiered_cache
+from ..common.circuit import breakers
+from ..common.exceptions import CircuitOpenError, DeadlineExceeded, RateLimited
+from ..common.hedging import hedged
+from ..common.hotkeys import hot_keys
+from ..common.latency import latencies
+from ..common.normalize import clean_text, normalize_code, normalize_text, record_rewrite
+from ..common.ratelimit import limiter
+from ..common.retry import deadline, time_left
+from ..common.singleflight import flights
 from .adapters import Cwa36hAdapter, OpenWeatherAdapter
 from .adapters.base import BaseWeatherAdapter
+from .columnar import ForecastColumns, resample
+from .locations import canonical_city, canonical_county, geohash_precision, nearest_county
 from .schemas import Forecast
+from .timeline import merge_forecasts
+
+
+# Per-provider upstream slots of the ``get_forecasts`` batch running in this context.
+_batch_slots: contextvars.ContextVar[Dict[str, asyncio.Semaphore] | None] = contextvars.ContextVar(
+    "weather_batch_slots", default=None
+)
 
 
 class WeatherService:
     """Fetch forecasts with caching, provider selection, and graceful fallback."""
 
     DEFAULT_CACHE_TIMEOUT = 300
+    DEFAULT_STALE_CACHE_TIMEOUT = 3600
+    DEFAULT_BATCH_CONCURRENCY = 8
     DEFAULT_PROVIDER_ORDER: tuple[str, ...] = ("cwa", "owm")
     DEFAULT_FALLBACKS: dict[str, tuple[str, ...]] = {
         "cwa": ("owm",),
         "owm": ("cwa",),
     }
+    MERGED_PROVIDERS: tuple[str, ...] = ("cwa", "owm")
 
     def __init__(
         self,
         *,
         cache_timeout: int | None = None,
+        stale_cache_timeout: int | None = None,
+        cache_mode: str | None = None,
         provider_order: Iterable[str] | None = None,
         fallbacks: Dict[str, Iterable[str]] | None = None,
+        hedge: bool | None = None,
     ) -> None:
+        self._hedge = getattr(settings, "WEATHER_HEDGE_ENABLED", False) if hedge is None else hedge
         self._cache_timeout = cache_timeout or getattr(
             settings, "WEATHER_CACHE_TIMEOUT", self.DEFAULT_CACHE_TIMEOUT
         )
+        self._stale_cache_timeout = stale_cache_timeout or getattr(
+            settings, "WEATHER_STALE_CACHE_TIMEOUT", self.DEFAULT_STALE_CACHE_TIMEOUT
+        )
+        self._cache = ServiceCache(
+            namespace="weather",
+            value_type=Forecast,
+            timeout=self._cache_timeout,
+            stale_timeout=self._stale_cache_timeout,
+            mode=cache_mode or getattr(settings, "WEATHER_CACHE_MODE", CACHE_MODE_TTL),
+        )
 
         self._provider_order = tuple(
             provider_order
@@ -58,14 +102,25 @@ class WeatherService:
         provider: str | None = None,
         **kwargs: Any,
     ) -> Forecast:
-        """Return a unified forecast, trying providers in order with caching."""
+        """Return a unified forecast, trying providers in order with caching.
+
+        With hedging enabled, the first upstream call races the next provider
+        in the chain once it has run longer than the provider's hedge delay.
+        ``provider="merged"`` combines CWA and OWM, see ``_get_merged``.
+        """
+
+        if provider and provider.lower() == "merged":
+            return await self._get_merged(kwargs)
+        return await self._get_from_chain(self._build_provider_chain(provider), kwargs)
 
-        provider_chain = self._build_provider_chain(provider)
+    async def _get_from_chain(
+        self, provider_chain: Sequence[str], kwargs: Dict[str, Any]
+    ) -> Forecast:
         last_error: Exception | None = None
+        tried: set[str] = set()
 
-        for provider_name in provider_chain:
-            adapter = self._adapters.get(provider_name)
-            if adapter is None:
+        for position, provider_name in enumerate(provider_chain):
+            if provider_name not in self._adapters or provider_name in tried:
                 continue
 
             try:
@@ -73,25 +128,400 @@ class WeatherService:
             except ValueError as exc:
                 last_error = exc
                 continue
-
             cache_key = self._cache_key(provider_name, normalized_kwargs)
-            cached = cache.get(cache_key)
-            if isinstance(cached, Forecast):
-                return cached
+            self._record_lookup(provider_name, kwargs, normalized_kwargs)
+            fetch = partial(self._fetch_coalesced, provider_name, normalized_kwargs, cache_key)
+            cached = self._cache.lookup(cache_key)
+            if cached is not None:
+                if not cached.is_fresh():
+                    self._cache.revalidate(cache_key, fetch)
+                return cached.value
 
+            if self._hedge and not tried:
+                fetch = self._hedged(
+                    fetch, provider_name, provider_chain[position + 1:], kwargs, tried
+                )
+            tried.add(provider_name)
             try:
-                forecast = await adapter.fetch_forecast(**normalized_kwargs)
+                forecast = await fetch()
             except Exception as exc:  # noqa: BLE001 - surface provider error after fallbacks
                 last_error = exc
                 continue
 
-            cache.set(cache_key, forecast, timeout=self._cache_timeout)
             return forecast
 
         if last_error:
             raise last_error
         raise RuntimeError("No provider available for the requested forecast")
 
+    async def _get_merged(self, kwargs: Dict[str, Any]) -> Forecast:
+        """CWA and OWM fetched concurrently and aligned into one timeline.
+
+        Each part goes through the normal cached, single-provider path (no
+        fallback), so it is cached under the same key a plain request for
+        that provider uses. The response waits at most
+        ``WEATHER_MERGED_DEADLINE`` for both; a part that fails or is still
+        running is left out (``Forecast.parts`` lists the ones present) and
+        only when every part fails is the first error raised. A late part
+        keeps running in the background, bounded by the request deadline
+        alone, and is cached for the next request.
+        """
+
+        # Started outside the merged deadline so a late part can still finish.
+        tasks = [spawn(self._get_from_chain([name], kwargs)) for name in self.MERGED_PROVIDERS]
+        with deadline(getattr(settings, "WEATHER_MERGED_DEADLINE", None)):
+            timeout = time_left()
+        parts = await asyncio.gather(
+            *(
+                self._merged_part(name, task, timeout)
+                for name, task in zip(self.MERGED_PROVIDERS, tasks)
+            ),
+            return_exceptions=True,
+        )
+
+        forecasts: Dict[str, Forecast] = {}
+        errors: List[BaseException] = []
+        for name, part in zip(self.MERGED_PROVIDERS, parts):
+            if isinstance(part, Forecast):
+                forecasts[name] = part
+            else:
+                metrics.incr(f"weather.merged.{name}.failed")
+                errors.append(part)
+        if not forecasts:
+            raise errors[0]
+        return merge_forecasts(forecasts.get("cwa"), forecasts.get("owm"))
+
+    @staticmethod
+    async def _merged_part(
+        provider: str, task: asyncio.Task, timeout: float | None
+    ) -> Forecast:
+        try:
+            # Shielded: giving up on the part must not cancel (and uncache) it.
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded(provider) from None
+
+    async def get_forecasts(
+        self,
+        queries: Sequence[Dict[str, Any]],
+    ) -> List[Forecast | Exception]:
+        """Resolve many forecast queries at once, one result or error per slot.
+
+        Every query's primary cache key is read with a single multi-get; only
+        the misses go upstream, and stale entries are served while refreshed
+        in the background, as single lookups are. CWA misses are grouped into
+        one multi-location request; the rest go through ``get_forecast``,
+        concurrently, with at most ``WEATHER_BATCH_CONCURRENCY`` upstream
+        calls in flight per provider, fallbacks and hedges included.
+        """
+
+        results: List[Forecast | Exception | None] = [None] * len(queries)
+        primaries = [self._primary_lookup(query) for query in queries]
+
+        keys = sorted({primary[1] for primary in primaries if primary})
+        cached = self._cache.lookup_many(keys) if keys else {}
+        for key, entry in cached.items():
+            if not entry.is_fresh():
+                provider_name, _, params = next(
+                    primary for primary in primaries if primary and primary[1] == key
+                )
+                self._cache.revalidate(
+                    key, partial(self._fetch_coalesced, provider_name, params, key)
+                )
+        for index, primary in enumerate(primaries):
+            entry = cached.get(primary[1]) if primary else None
+            if entry is not None:
+                results[index] = entry.value
+
+        limit = int(
+            getattr(settings, "WEATHER_BATCH_CONCURRENCY", self.DEFAULT_BATCH_CONCURRENCY)
+        )
+        token = _batch_slots.set(defaultdict(lambda: asyncio.Semaphore(limit)))
+        try:
+            await self._fill_cwa_misses(primaries, results)
+
+            async def resolve(index: int) -> None:
+                try:
+                    results[index] = await self.get_forecast(**queries[index])
+                except Exception as exc:  # noqa: BLE001 - reported in the item's slot
+                    results[index] = exc
+
+            await asyncio.gather(
+                *(resolve(index) for index, result in enumerate(results) if result is None)
+            )
+        finally:
+            _batch_slots.reset(token)
+        return results
+
+    async def warm_cwa(
+        self,
+        location_names: Iterable[str] | None = None,
+        *,
+        country: str = "TW",
+        units: str = "metric",
+    ) -> Dict[str, Forecast]:
+        """Fetch many CWA counties in one upstream call and cache each one.
+
+        With no ``location_names`` every county is fetched, which warms the
+        whole of Taiwan with a single request.
+        """
+
+        if not await limiter.acquire("cwa"):
+            raise RateLimited("cwa")
+        breaker = breakers.get("cwa")
+        if not breaker.allow():
+            raise CircuitOpenError("cwa")
+        try:
+            forecasts = await self._adapters["cwa"].fetch_forecasts(
+                location_names=location_names,
+                country=country,
+                units=units,
+            )
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release_probe()
+            raise
+        breaker.record_success()
+        for name, forecast in forecasts.items():
+            params = self._normalize_kwargs(
+                "cwa", {"location_name": name, "country": country, "units": units}
+            )
+            self._cache.set(self._cache_key("cwa", params), forecast)
+        return forecasts
+
+    def record_response_hit(self, query: Dict[str, Any]) -> None:
+        """Account for ``query`` served by the response cache in front of this service.
+
+        Records the hot key, the normalization outcome and a cache hit for the
+        provider(s) that would have served it, so pre-warming and the
+        ``weather.*`` metrics see those requests; nothing is read or fetched.
+        """
+
+        kwargs = dict(query)
+        provider = kwargs.pop("provider", None)
+        if provider and provider.lower() == "merged":
+            chains = [[name] for name in self.MERGED_PROVIDERS]
+        else:
+            chains = [self._build_provider_chain(provider)]
+        for chain in chains:
+            for provider_name in chain:
+                if provider_name not in self._adapters:
+                    continue
+                try:
+                    params = self._normalize_kwargs(provider_name, kwargs)
+                except ValueError:
+                    continue
+                self._record_lookup(provider_name, kwargs, params)
+                self._cache.count_hit()
+                break
+
+    def resolve(self, query: Dict[str, Any]) -> tuple[str, Dict[str, Any]] | None:
+        """Return the ``(provider, params)`` that would serve ``query`` first."""
+
+        primary = self._primary_lookup(query)
+        return (primary[0], primary[2]) if primary else None
+
+    def expires_in(
+        self, provider: str, query: Dict[str, Any], *, parts: Iterable[str] | None = None
+    ) -> float:
+        """Seconds the cached ``provider`` forecast for ``query`` stays fresh.
+
+        0 when that is unknown (no fresh entry, e.g. a stale fallback was
+        served), so the response isn't cached.
+        Likewise for a merged forecast whose ``parts`` miss a provider.
+        """
+
+        if provider == "merged":
+            if parts is not None and set(parts) != set(self.MERGED_PROVIDERS):
+                return 0.0
+            return min(self.expires_in(name, query) for name in self.MERGED_PROVIDERS)
+        try:
+            params = self._normalize_kwargs(provider, query)
+        except ValueError:
+            return 0.0
+        remaining = self._cache.expires_in(self._cache_key(provider, params))
+        return 0.0 if remaining is None else max(0.0, remaining)
+
+    def resample(
+        self, forecast: Forecast, interval: str, utc_offset: float = 0
+    ) -> List[Dict[str, Any]]:
+        """Return ``forecast`` resampled to ``interval`` buckets, memoized per forecast.
+
+        The result is cached under a digest of the forecast itself for the
+        forecast cache timeout, so every client reading the same cached
+        ``Forecast`` shares one computation and a refreshed forecast never
+        picks up buckets computed from its predecessor.
+        """
+
+        digest = hashlib.blake2b(repr(forecast).encode(), digest_size=12).hexdigest()
+        key = f"resample:{interval}:{utc_offset}:{digest}"
+        rows = tiered_cache.get(key)
+        if rows is not None:
+            metrics.incr("weather.resample.hit")
+            return rows
+
+        metrics.incr("weather.resample.miss")
+        rows = resample(ForecastColumns(forecast), interval, utc_offset)
+        tiered_cache.set(key, rows, timeout=self._cache_timeout)
+        return rows
+
+    def needs_refresh(self, provider: str, params: Dict[str, Any], lead_time: float) -> bool:
+        """Whether the cached entry is missing or goes stale within ``lead_time`` seconds."""
+
+        remaining = self._cache.expires_in(self._cache_key(provider, params))
+        return remaining is None or remaining <= lead_time
+
+    async def refresh(self, provider: str, params: Dict[str, Any]) -> Forecast:
+        """Fetch ``provider``/``params`` upstream and overwrite its cache entry."""
+
+        if provider not in self._adapters:
+            raise ValueError(f"Unsupported provider '{provider}'")
+        cache_key = self._cache_key(provider, params)
+        return await flights.do(
+            cache_key, partial(self._fetch_and_store, provider, params, cache_key)
+        )
+
+    async def _fill_cwa_misses(
+        self,
+        primaries: List[tuple[str, str, Dict[str, Any]] | None],
+        results: List[Forecast | Exception | None],
+    ) -> None:
+        """Resolve batched CWA misses with one multi-location upstream call per unit/country."""
+
+        groups: dict[tuple[str, str], dict[str, list[int]]] = defaultdict(
+            lambda: defaultdict(list)
+        )
+        for index, primary in enumerate(primaries):
+            if results[index] is None and primary and primary[0] == "cwa":
+                params = primary[2]
+                group = groups[(params["country"], params["units"])]
+                group[params["location_name"]].append(index)
+
+        for (country, units), indexes_by_name in groups.items():
+            if sum(len(indexes) for indexes in indexes_by_name.values()) < 2:
+                continue
+            try:
+                forecasts = await self.warm_cwa(list(indexes_by_name), country=country, units=units)
+            except Exception:  # noqa: BLE001 - leave these slots to the per-item path
+                continue
+            for name, indexes in indexes_by_name.items():
+                forecast = forecasts.get(name)
+                if forecast is None:
+                    continue
+                for index in indexes:
+                    results[index] = forecast
+
+    def _record_lookup(
+        self, provider: str, kwargs: Dict[str, Any], params: Dict[str, Any]
+    ) -> None:
+        record_rewrite("weather", self._normalize_kwargs(provider, kwargs, canonical=False), params)
+        hot_keys.record("weather", provider, params)
+
+    def _primary_lookup(
+        self, query: Dict[str, Any]
+    ) -> tuple[str, str, Dict[str, Any]] | None:
+        """Return ``(provider, cache_key, params)`` for the first provider able to serve ``query``."""
+
+        kwargs = dict(query)
+        for provider_name in self._build_provider_chain(kwargs.pop("provider", None)):
+            if provider_name not in self._adapters:
+                continue
+            try:
+                params = self._normalize_kwargs(provider_name, kwargs)
+            except ValueError:
+                continue
+            return provider_name, self._cache_key(provider_name, params), params
+        return None
+
+    def _hedged(
+        self,
+        fetch: Callable[[], Awaitable[Forecast]],
+        provider: str,
+        backups: Sequence[str],
+        query: Dict[str, Any],
+        tried: set[str],
+    ) -> Callable[[], Awaitable[Forecast]]:
+        """Wrap ``fetch`` so the first backup able to serve ``query`` races it."""
+
+        for backup_name in backups:
+            if backup_name == provider or backup_name not in self._adapters:
+                continue
+            try:
+                params = self._normalize_kwargs(backup_name, query)
+            except ValueError:
+                continue
+            break
+        else:
+            return fetch
+
+        cache_key = self._cache_key(backup_name, params)
+
+        async def backup() -> Forecast:
+            tried.add(backup_name)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                return cached
+            return await self._fetch_coalesced(backup_name, params, cache_key)
+
+        return partial(hedged, fetch, backup, latencies.hedge_delay(provider))
+
+    async def _fetch_coalesced(
+        self,
+        provider: str,
+        params: Dict[str, Any],
+        cache_key: str,
+    ) -> Forecast:
+        """Fetch and cache ``cache_key``, sharing the call with concurrent lookups."""
+
+        return await flights.do(
+            cache_key,
+            partial(self._fetch_and_store, provider, params, cache_key),
+            peek=partial(self._cache.get, cache_key),
+            stale=partial(self._cache.get_stale, cache_key),
+        )
+
+    async def _fetch_and_store(
+        self,
+        provider: str,
+        params: Dict[str, Any],
+        cache_key: str,
+    ) -> Forecast:
+        slots = _batch_slots.get()
+        async with slots[provider] if slots is not None else contextlib.nullcontext():
+            return await self._call_and_store(provider, params, cache_key)
+
+    async def _call_and_store(
+        self,
+        provider: str,
+        params: Dict[str, Any],
+        cache_key: str,
+    ) -> Forecast:
+        # Rate limit first: a rejected call must not hold the half-open probe.
+        if not await limiter.acquire(provider):
+            raise RateLimited(provider)
+        breaker = breakers.get(provider)
+        if not breaker.allow():
+            raise CircuitOpenError(provider)
+        started = time.perf_counter()
+        try:
+            forecast = await self._adapters[provider].fetch_forecast(**params)
+        except Exception:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled (a hedge loser, a merged part): no outcome to record.
+            breaker.release_probe()
+            raise
+        finally:
+            # Failed and cancelled calls count too, as lower bounds: leaving
+            # them out would hide a slow provider from the hedge delay.
+            latencies.observe(provider, time.perf_counter() - started)
+        breaker.record_success()
+        self._cache.set(cache_key, forecast)
+        return forecast
+
     def _build_provider_chain(self, provider: str | None) -> List[str]:
         if provider:
             primary = provider.lower()
@@ -100,29 +530,64 @@ class WeatherService:
 
         return list(self._provider_order)
 
-    def _normalize_kwargs(self, provider: str, original: Dict[str, Any]) -> Dict[str, Any]:
+    def _normalize_kwargs(
+        self, provider: str, original: Dict[str, Any], *, canonical: bool = True
+    ) -> Dict[str, Any]:
+        """Adapter params for ``provider``; ``canonical`` folds equivalent spellings.
+
+        Canonical params (see ``apps.weather.locations``) together with the
+        case-folded ``_cache_key`` make "Taipei" and " taipei ", or 臺北市 and
+        台北市, share one cache key and upstream call.
+        """
+
         provider = provider.lower()
 
+        lat, lon = original.get("lat"), original.get("lon")
+        has_coords = lat is not None and lon is not None
+
         if provider == "owm":
             city = original.get("city")
             country = original.get("country")
+            lang = original.get("lang", "zh_tw")
+            if canonical:
+                lang = clean_text(lang)
+            if (not city or not country) and has_coords:
+                if canonical:
+                    # Nearby coordinates share one geohash cell, so one cache entry.
+                    lat, lon = geohash.snap(lat, lon, geohash_precision())
+                return {
+                    "lat": lat,
+                    "lon": lon,
+                    "lang": lang,
+                    "units": original.get("units", "metric"),
+                }
             if not city or not country:
-                raise ValueError("OpenWeatherMap requires 'city' and 'country' parameters")
+                raise ValueError("OpenWeatherMap requires 'city' and 'country' (or 'lat'/'lon') parameters")
+            if canonical:
+                city, country = canonical_city(city, country)
             params: Dict[str, Any] = {
                 "city": city,
                 "country": country,
-                "lang": original.get("lang", "zh_tw"),
+                "lang": lang,
                 "units": original.get("units", "metric"),
             }
             return params
 
         if provider == "cwa":
             location_name = original.get("location_name") or original.get("locationName")
+            if not location_name and has_coords:
+                location_name = nearest_county(lat, lon)
+                if location_name is None:
+                    raise ValueError(f"Coordinates {lat},{lon} are outside CWA coverage")
             if not location_name:
                 raise ValueError("CWA adapter requires 'location_name' (or 'locationName') parameter")
+            country = original.get("country", "TW")
+            if canonical:
+                location_name = canonical_county(location_name)
+                country = normalize_code(country)
             params = {
                 "location_name": location_name,
-                "country": original.get("country", "TW"),
+                "country": country,
                 "units": original.get("units", "metric"),
             }
             return params
@@ -138,6 +603,8 @@ class WeatherService:
                 value_repr = asdict(value)
             elif isinstance(value, (dict, list, tuple)):
                 value_repr = str(value)
+            elif isinstance(value, str):
+                value_repr = normalize_text(value)
             else:
                 value_repr = value
             parts.append(f"{key}={value_repr}")
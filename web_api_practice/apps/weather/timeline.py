@@ -0,0 +1,99 @@
+"""Align CWA forecast windows with OWM 3-hour points into one timeline."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import List, Optional
+
+from ..common.utils import to_epoch_utc
+from .schemas import CWAPeriod, Forecast, MergedPeriod
+
+
+def merge_forecasts(cwa: Optional[Forecast], owm: Optional[Forecast]) -> Forecast:
+    """One ``source="merged"`` forecast built from whichever parts are present.
+
+    Each OWM point becomes a ``MergedPeriod`` carrying the PoP, comfort and
+    min/max temperature of the CWA window that contains it (windows are
+    half-open, ``start <= ts < end``). Points outside every window keep
+    ``None`` there. Without OWM, each CWA window becomes one point at its start.
+    """
+
+    if cwa is None and owm is None:
+        raise ValueError("merge_forecasts needs at least one forecast")
+    location = cwa or owm
+    windows = _Windows(cwa.periods if cwa is not None else [])
+    if owm is not None:
+        periods = [
+            _merged_point(period, windows.at(to_epoch_utc(period.ts)))
+            for period in owm.periods
+        ]
+    else:
+        periods = [_window_point(window) for window in windows.periods]
+    return Forecast(
+        location_name=location.location_name,
+        country=location.country,
+        units=(owm or cwa).units,
+        source="merged",
+        periods=periods,
+        parts=tuple(name for name, part in (("cwa", cwa), ("owm", owm)) if part is not None),
+    )
+
+
+class _Windows:
+    """CWA periods sorted by start, searchable by epoch seconds."""
+
+    def __init__(self, periods) -> None:
+        timed = sorted(
+            (
+                (to_epoch_utc(period.start), period)
+                for period in periods
+                if isinstance(period, CWAPeriod) and to_epoch_utc(period.start) is not None
+            ),
+            key=lambda item: item[0],
+        )
+        self._starts = [start for start, _ in timed]
+        self.periods: List[CWAPeriod] = [period for _, period in timed]
+
+    def at(self, epoch: Optional[int]) -> Optional[CWAPeriod]:
+        if epoch is None:
+            return None
+        position = bisect_right(self._starts, epoch) - 1
+        if position < 0:
+            return None
+        window = self.periods[position]
+        end = to_epoch_utc(window.end) if window.end else None
+        if end is not None and epoch >= end:
+            return None
+        return window
+
+
+def _merged_point(period, window: Optional[CWAPeriod]) -> MergedPeriod:
+    return MergedPeriod(
+        ts=period.ts,
+        temp=period.temp,
+        desc=period.desc,
+        humidity=period.humidity,
+        wind_kph=period.wind_kph,
+        pop=window.pop if window else None,
+        min_temp=window.min_temp if window else None,
+        max_temp=window.max_temp if window else None,
+        comfort=window.comfort if window else None,
+        window_desc=window.desc if window else None,
+        window_start=window.start if window else None,
+        window_end=window.end if window else None,
+    )
+
+
+def _window_point(window: CWAPeriod) -> MergedPeriod:
+    return MergedPeriod(
+        ts=window.start,
+        temp=window.avg_temp,
+        desc=window.desc,
+        pop=window.pop,
+        min_temp=window.min_temp,
+        max_temp=window.max_temp,
+        comfort=window.comfort,
+        window_desc=window.desc,
+        window_start=window.start,
+        window_end=window.end,
+    )
@@ -8,4 +8,9 @@ from . import views
 urlpatterns = [
     path("providers", views.providers, name="providers"),
     path("weather/forecast", views.ForecastView.as_view(), name="forecast"),
+    path(
+        "weather/forecast/batch",
+        views.ForecastBatchView.as_view(),
+        name="forecast_batch",
+    ),
 ]
@@ -1,14 +1,24 @@
 """Public weather API views."""
 
-from asgiref.sync import async_to_sync
+import logging
+
 from django.http import JsonResponse
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework.response import Response
-from rest_framework.views import APIView
 
-from .serializers import ForecastQuery
+from ..common.views import AsyncAPIView
+from ..common.exceptions import UpstreamError
+from ..common.responses import response_cache
+from .columnar import ForecastColumns, daily_summary
+from .schemas import Forecast
+from .serializers import ForecastBatchQuery, ForecastQuery, ForecastSummaryQuery
 from .services import WeatherService
 
+logger = logging.getLogger(__name__)
+
+# Returned instead of the exception text, which may contain upstream URLs and API keys.
+UPSTREAM_ERROR_MESSAGE = "The weather provider could not be reached."
+
 
 def providers(request):
     """Return metadata about supported weather providers."""
@@ -19,48 +29,115 @@ def providers(request):
                 {
                     "id": "cwa",
                     "name": "CWA 36h",
-                    "params": ["locationName"],
+                    "params": ["locationName", "lat", "lon"],
                     "default": True,
                 },
                 {
                     "id": "owm",
                     "name": "OpenWeatherMap 5d/3h",
-                    "params": ["city", "country", "lang", "units"],
+                    "params": ["city", "country", "lat", "lon", "lang", "units"],
+                },
+                {
+                    "id": "merged",
+                    "name": "CWA 36h + OpenWeatherMap 5d/3h",
+                    "params": ["locationName", "city", "country", "lat", "lon", "lang", "units"],
                 },
             ]
         }
     )
 
 
-class ForecastView(APIView):
+class ForecastView(AsyncAPIView):
     """Return a normalized forecast from the weather service."""
 
     @extend_schema(
         parameters=[
-            OpenApiParameter(name="provider", required=False, type=str),
+            OpenApiParameter(
+                name="provider", required=False, type=str, enum=["cwa", "owm", "merged"]
+            ),
             OpenApiParameter(name="locationName", required=False, type=str),
             OpenApiParameter(name="city", required=False, type=str),
             OpenApiParameter(name="country", required=False, type=str),
+            OpenApiParameter(name="lat", required=False, type=float),
+            OpenApiParameter(name="lon", required=False, type=float),
             OpenApiParameter(name="lang", required=False, type=str),
             OpenApiParameter(name="units", required=False, type=str),
+            OpenApiParameter(name="summary", required=False, type=str, enum=["daily"]),
+            OpenApiParameter(
+                name="interval", required=False, type=str, enum=["6h", "12h", "day"]
+            ),
+            OpenApiParameter(name="utc_offset", required=False, type=int),
         ],
         responses={200: dict},
     )
-    def get(self, request):
+    async def get(self, request):
         query = ForecastQuery(data=request.query_params)
+        cached = response_cache.lookup(request)
+        if cached is not None:
+            if query.is_valid():
+                WeatherService().record_response_hit(query.validated_data)
+            return cached
+
         query.is_valid(raise_exception=True)
+        options = ForecastSummaryQuery(data=request.query_params)
+        options.is_valid(raise_exception=True)
 
         service = WeatherService()
-        forecast = async_to_sync(service.get_forecast)(**query.validated_data)
-
-        payload = {
-            "location": {
-                "name": forecast.location_name,
-                "country": forecast.country,
-            },
-            "units": forecast.units,
-            "source": forecast.source,
-            "periods": [vars(period) for period in forecast.periods],
-        }
+        forecast = await service.get_forecast(**query.validated_data)
+
+        utc_offset = options.validated_data["utc_offset"]
+        payload = forecast_payload(forecast)
+        interval = options.validated_data.get("interval")
+        if interval:
+            payload["interval"] = interval
+            payload["periods"] = service.resample(forecast, interval, utc_offset)
+        if options.validated_data.get("summary") == "daily":
+            payload["daily"] = daily_summary(ForecastColumns(forecast), utc_offset)
+
+        ttl = service.expires_in(forecast.source, query.validated_data, parts=forecast.parts)
+        return response_cache.store(request, payload, ttl)
+
+
+class ForecastBatchView(AsyncAPIView):
+    """Return forecasts for many locations, one result or error per item."""
+
+    @extend_schema(request=ForecastBatchQuery, responses={200: dict})
+    async def post(self, request):
+        query = ForecastBatchQuery(data=request.data)
+        query.is_valid(raise_exception=True)
+
+        service = WeatherService()
+        results = await service.get_forecasts(query.validated_data["items"])
+
+        return Response({"results": [_batch_item(result) for result in results]})
+
+
+def forecast_payload(forecast: Forecast) -> dict:
+    payload = {
+        "location": {
+            "name": forecast.location_name,
+            "country": forecast.country,
+        },
+        "units": forecast.units,
+        "source": forecast.source,
+        # Period dataclasses are encoded directly by the ORJSON renderer.
+        "periods": forecast.periods,
+    }
+    if forecast.parts:
+        payload["parts"] = list(forecast.parts)
+    return payload
+
+
+def _batch_item(result) -> dict:
+    if isinstance(result, Forecast):
+        return {"ok": True, "forecast": forecast_payload(result)}
 
-        return Response(payload)
+    if isinstance(result, UpstreamError):
+        code, message = result.code, str(result)
+    elif type(result) is ValueError:
+        # Raised by the service's own query validation, so the text is safe to echo.
+        code, message = "invalid_query", str(result)
+    else:
+        logger.error("Batch forecast item failed", exc_info=result)
+        code, message = "upstream_error", UPSTREAM_ERROR_MESSAGE
+    return {"ok": False, "error": {"code": code, "message": message}}
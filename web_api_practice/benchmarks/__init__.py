@@ -0,0 +1,10 @@
+"""Standalone micro-benchmarks; run with ``python -m benchmarks.<name>``."""
+
+import os
+
+import django
+
+
+def setup() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "web_api_practice.settings")
+    django.setup()
@@ -0,0 +1,82 @@
+"""Compare cache payload size and encode/decode time: pickle vs SchemaSerializer.
+
+    cd web_api_practice
+    python -m benchmarks.cache_codec
+"""
+
+from __future__ import annotations
+
+import pickle
+import timeit
+
+from . import setup
+
+setup()
+
+from apps.common.codecs import SchemaSerializer  # noqa: E402
+from apps.movies.schemas import Movie, SearchResult  # noqa: E402
+from apps.weather.schemas import Forecast, OWMPeriod  # noqa: E402
+
+ROUNDS = 2000
+
+
+def sample_forecast() -> Forecast:
+    return Forecast(
+        location_name="Taipei",
+        country="TW",
+        units="metric",
+        source="owm",
+        periods=[
+            OWMPeriod(
+                ts=f"2025-09-{22 + i // 8:02d}T{(i % 8) * 3:02d}:00:00+00:00",
+                temp=24.0 + i * 0.1,
+                desc="scattered clouds",
+                humidity=70,
+                wind_kph=10.8,
+            )
+            for i in range(40)
+        ],
+    )
+
+
+def sample_search() -> SearchResult:
+    return SearchResult(
+        items=[
+            Movie(
+                id=str(i),
+                title=f"Star Wars: Episode {i}",
+                year="1977",
+                plot=f"Episode {i}: a long time ago in a galaxy far, far away...",
+                poster=f"https://image.tmdb.org/t/p/w500/poster{i}.jpg",
+                genres=[12, 28, 878],
+                rating=8.2,
+            )
+            for i in range(20)
+        ],
+        page=1,
+        total_pages=5,
+        total_results=100,
+        source="tmdb",
+    )
+
+
+def bench(label: str, value, dumps, loads) -> None:
+    blob = dumps(value)
+    encode = timeit.timeit(lambda: dumps(value), number=ROUNDS) / ROUNDS * 1e6
+    decode = timeit.timeit(lambda: loads(blob), number=ROUNDS) / ROUNDS * 1e6
+    print(f"{label:<28} {len(blob):>7} B  encode {encode:7.1f} us  decode {decode:7.1f} us")
+
+
+def main() -> None:
+    plain = SchemaSerializer({"COMPRESSION": "none"})
+    compressed = SchemaSerializer({"COMPRESSION": "zstd", "COMPRESSION_THRESHOLD": 512})
+
+    for name, value in (("forecast (40 OWM periods)", sample_forecast()), ("search (20 movies)", sample_search())):
+        print(name)
+        bench("  pickle", value, lambda v: pickle.dumps(v, pickle.HIGHEST_PROTOCOL), pickle.loads)
+        bench("  schema", value, plain.dumps, plain.loads)
+        bench("  schema + zstd (if installed)", value, compressed.dumps, compressed.loads)
+
+
+if __name__ == "__main__":
+    main()
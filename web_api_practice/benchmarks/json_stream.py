@@ -0,0 +1,152 @@
+"""Compare peak memory and latency: response.json() vs streamed parsing.
+
+    cd web_api_practice
+    python -m benchmarks.json_stream
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import tracemalloc
+
+import httpx
+from django.test.utils import override_settings
+
+from . import setup
+
+setup()
+
+from apps.common import jsonstream  # noqa: E402
+from apps.weather.adapters.cwa36h import Cwa36hAdapter  # noqa: E402
+from apps.weather.adapters.openweather import OpenWeatherAdapter  # noqa: E402
+
+ROUNDS = 50
+CHUNK_SIZE = 16 * 1024
+
+
+def owm_payload() -> dict:
+    return {
+        "cod": "200",
+        "cnt": 40,
+        "list": [
+            {
+                "dt": 1758499200 + i * 10800,
+                "dt_txt": f"2025-09-{22 + i // 8:02d} {(i % 8) * 3:02d}:00:00",
+                "main": {
+                    "temp": 24.0 + i * 0.1,
+                    "feels_like": 25.1,
+                    "temp_min": 23.2,
+                    "temp_max": 24.9,
+                    "pressure": 1009,
+                    "sea_level": 1009,
+                    "grnd_level": 1004,
+                    "humidity": 70,
+                    "temp_kf": 0.4,
+                },
+                "weather": [
+                    {"id": 802, "main": "Clouds", "description": "scattered clouds", "icon": "03d"}
+                ],
+                "clouds": {"all": 40},
+                "wind": {"speed": 3.0, "deg": 90, "gust": 4.2},
+                "visibility": 10000,
+                "pop": 0.2,
+                "sys": {"pod": "d"},
+            }
+            for i in range(40)
+        ],
+        "city": {"id": 1668341, "name": "Taipei", "country": "TW", "population": 2600000},
+    }
+
+
+def cwa_payload() -> dict:
+    elements = ("Wx", "PoP", "MinT", "MaxT", "CI")
+
+    def location(index: int) -> dict:
+        return {
+            "locationName": f"縣市{index:02d}",
+            "weatherElement": [
+                {
+                    "elementName": element,
+                    "time": [
+                        {
+                            "startTime": f"2025-09-22 {6 + slot * 12:02d}:00:00",
+                            "endTime": f"2025-09-23 {slot * 12:02d}:00:00",
+                            "parameter": {
+                                "parameterName": f"{element}-{slot}",
+                                "parameterValue": "1",
+                            },
+                        }
+                        for slot in range(3)
+                    ],
+                }
+                for element in elements
+            ],
+        }
+
+    return {
+        "success": "true",
+        "result": {
+            "resource_id": "F-C0032-001",
+            "fields": [{"id": "datasetDescription", "type": "String"}],
+        },
+        "records": {
+            "datasetDescription": "三十六小時天氣預報",
+            "location": [location(i) for i in range(22)],
+        },
+    }
+
+
+def client_for(payload: dict) -> httpx.AsyncClient:
+    body = json.dumps(payload, ensure_ascii=False).encode()
+
+    class Chunked(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for start in range(0, len(body), CHUNK_SIZE):
+                yield body[start:start + CHUNK_SIZE]
+
+    return httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, stream=Chunked()))
+    )
+
+
+async def measure(call) -> tuple[float, float]:
+    await call()  # warm up imports and caches
+    tracemalloc.start()
+    await call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        await call()
+    elapsed = (time.perf_counter() - started) / ROUNDS * 1e3
+    return peak / 1024, elapsed
+
+
+async def main() -> None:
+    import apps.weather.adapters.cwa36h as cwa_module
+    import apps.weather.adapters.openweather as owm_module
+
+    owm_client = client_for(owm_payload())
+    cwa_client = client_for(cwa_payload())
+    owm_module.get_client = lambda url: owm_client
+    cwa_module.get_client = lambda url: cwa_client
+
+    cases = (
+        ("OWM 40 periods", lambda: OpenWeatherAdapter().fetch_forecast(city="Taipei", country="TW")),
+        ("CWA 22 counties", lambda: Cwa36hAdapter().fetch_forecasts()),
+    )
+    parser = "ijson" if jsonstream.STREAMING_AVAILABLE else "whole-body fallback (ijson missing)"
+    print(f"streaming parser: {parser}")
+    for name, call in cases:
+        print(name)
+        for label, streaming in (("response.json()", False), ("streamed", True)):
+            with override_settings(WEATHER_STREAMING_JSON=streaming):
+                peak, elapsed = await measure(call)
+            print(f"  {label:<16} peak {peak:8.1f} KiB  {elapsed:7.2f} ms/call")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
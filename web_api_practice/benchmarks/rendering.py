@@ -0,0 +1,71 @@
+"""Compare per-response rendering cost: dict building + JSONRenderer vs ORJSONRenderer.
+
+    cd web_api_practice
+    python -m benchmarks.rendering
+"""
+
+from __future__ import annotations
+
+import timeit
+from dataclasses import asdict
+
+from . import setup
+
+setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.common.renderers import ORJSONRenderer  # noqa: E402
+from apps.weather.views import forecast_payload  # noqa: E402
+
+from .cache_codec import sample_forecast, sample_search  # noqa: E402
+
+ROUNDS = 2000
+
+
+def legacy_forecast(forecast) -> dict:
+    return {
+        "location": {"name": forecast.location_name, "country": forecast.country},
+        "units": forecast.units,
+        "source": forecast.source,
+        "periods": [asdict(period) for period in forecast.periods],
+    }
+
+
+def search_payload(result, items) -> dict:
+    return {
+        "source": result.source,
+        "page": result.page,
+        "total_pages": result.total_pages,
+        "total_results": result.total_results,
+        "items": items,
+    }
+
+
+def bench(label: str, render) -> None:
+    size = len(render())
+    cost = timeit.timeit(render, number=ROUNDS) / ROUNDS * 1e6
+    print(f"{label:<34} {size:>6} B  {cost:7.1f} us/response")
+
+
+def main() -> None:
+    stock, fast = JSONRenderer(), ORJSONRenderer()
+    forecast, search = sample_forecast(), sample_search()
+
+    print("forecast (40 OWM periods)")
+    bench("  asdict() + JSONRenderer", lambda: stock.render(legacy_forecast(forecast)))
+    bench("  dataclasses + ORJSONRenderer", lambda: fast.render(forecast_payload(forecast)))
+
+    print("search (20 movies)")
+    bench(
+        "  asdict() + JSONRenderer",
+        lambda: stock.render(search_payload(search, [asdict(movie) for movie in search.items])),
+    )
+    bench(
+        "  dataclasses + ORJSONRenderer",
+        lambda: fast.render(search_payload(search, search.items)),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Memory per 10k schema objects: plain ``@dataclass`` vs the slotted schemas.
+
+    cd web_api_practice
+    python -m benchmarks.schema_memory
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import tracemalloc
+
+from . import setup
+
+setup()
+
+from apps.movies.schemas import Movie  # noqa: E402
+from apps.weather.schemas import CWAPeriod, OWMPeriod  # noqa: E402
+
+COUNT = 10_000
+
+
+def plain_variant(cls: type) -> type:
+    """The same fields as ``cls`` as a regular, ``__dict__``-backed dataclass."""
+
+    return dataclasses.make_dataclass(
+        f"Plain{cls.__name__}",
+        [(field.name, field.type, field) for field in dataclasses.fields(cls)],
+    )
+
+
+SAMPLES = {
+    OWMPeriod: lambda i: ("2025-09-22T00:00:00+00:00", 24.0 + i, "scattered clouds", 70, 10.8),
+    CWAPeriod: lambda i: (
+        "2025-09-22T10:00:00+00:00",
+        "2025-09-22T22:00:00+00:00",
+        "多雲時晴",
+        20,
+        26.0,
+        31.0 + i,
+        28.5,
+        "舒適至悶熱",
+    ),
+    Movie: lambda i: (str(i), "Inception", "2010", "A thief...", None, [28, 878], 8.4, "tmdb"),
+}
+
+
+def measure(cls: type, make_args) -> float:
+    rows = [make_args(i) for i in range(COUNT)]
+    tracemalloc.start()
+    objects = [cls(*row) for row in rows]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / 1024
+
+
+def main() -> None:
+    print(f"{'schema':<12} {'@dataclass':>12} {'slots=True':>12}   per {COUNT:,} objects")
+    for cls, make_args in SAMPLES.items():
+        plain = measure(plain_variant(cls), make_args)
+        slotted = measure(cls, make_args)
+        print(f"{cls.__name__:<12} {plain:>9.0f} KiB {slotted:>9.0f} KiB   ({slotted / plain:.0%})")
+
+
+if __name__ == "__main__":
+    main()
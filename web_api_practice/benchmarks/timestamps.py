@@ -0,0 +1,56 @@
+"""Per-period timestamp normalization: the original parser vs the memoized one.
+
+    cd web_api_practice
+    python -m benchmarks.timestamps
+"""
+
+from __future__ import annotations
+
+import timeit
+from datetime import datetime, timezone
+
+from . import setup
+
+setup()
+
+from apps.common.utils import _parse_utc, to_epoch_utc, to_iso_utc  # noqa: E402
+
+ROUNDS = 200
+
+# One batch: 22 CWA counties x 3 periods x start/end, plus 40 OWM periods.
+CWA_WINDOWS = [
+    ("2025-09-22 06:00:00", "2025-09-22 18:00:00"),
+    ("2025-09-22 18:00:00", "2025-09-23 06:00:00"),
+    ("2025-09-23 06:00:00", "2025-09-23 18:00:00"),
+]
+CWA_STAMPS = [stamp for _ in range(22) for window in CWA_WINDOWS for stamp in window]
+OWM_STAMPS = [f"2025-09-{22 + i // 8:02d} {(i % 8) * 3:02d}:00:00" for i in range(40)]
+STAMPS = CWA_STAMPS + OWM_STAMPS
+
+
+def legacy_to_iso_utc(dt_str: str) -> str:
+    try:
+        return (
+            datetime.fromisoformat(dt_str.replace("Z", ""))
+            .replace(tzinfo=timezone.utc)
+            .isoformat()
+        )
+    except Exception:
+        return dt_str
+
+
+def bench(label: str, normalize) -> None:
+    cost = timeit.timeit(lambda: [normalize(stamp) for stamp in STAMPS], number=ROUNDS)
+    print(f"{label:<22} {cost / ROUNDS / len(STAMPS) * 1e9:8.0f} ns/timestamp")
+
+
+def main() -> None:
+    print(f"{len(STAMPS)} timestamps per batch, {len(set(STAMPS))} distinct")
+    bench("legacy to_iso_utc", legacy_to_iso_utc)
+    bench("memoized to_iso_utc", to_iso_utc)
+    bench("memoized to_epoch_utc", to_epoch_utc)
+    print(f"cache: {_parse_utc.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
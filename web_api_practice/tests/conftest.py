@@ -0,0 +1,38 @@
+import pytest
+
+from apps.common.cache import tiered_cache
+from apps.common.circuit import breakers
+from apps.common.ratelimit import limiter
+from apps.movies.index import title_index
+
+
+@pytest.fixture(autouse=True)
+def clear_local_cache():
+    """Keep the per-process L1 cache from leaking entries between tests."""
+
+    tiered_cache.local.clear()
+    yield
+    tiered_cache.local.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Failures recorded by one test must not open a provider's circuit for the next."""
+
+    breakers.reset()
+    yield
+    breakers.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    limiter.reset()
+    yield
+    limiter.reset()
+
+
+@pytest.fixture(autouse=True)
+def clear_title_index():
+    title_index.clear()
+    yield
+    title_index.clear()
@@ -121,8 +121,44 @@ async def test_cwa_adapter_maps_elements(monkeypatch):
     first_period = forecast.periods[0]
     assert isinstance(first_period, CWAPeriod)
     assert first_period.desc == "陰短暫陣雨或雷雨"
+    assert first_period.start == "2025-09-22T10:00:00+00:00"  # 18:00 Taiwan time
     assert first_period.pop == 60
     assert first_period.min_temp == pytest.approx(28.0)
     assert first_period.max_temp == pytest.approx(30.0)
     assert first_period.avg_temp == pytest.approx(29.0)
     assert first_period.comfort == "悶熱"
+
+
+@pytest.mark.asyncio
+async def test_cwa_adapter_splits_multi_location_payload(monkeypatch):
+    def location(name, desc):
+        return {
+            "locationName": name,
+            "weatherElement": [
+                {
+                    "elementName": "Wx",
+                    "time": [
+                        {
+                            "startTime": "2025-09-22 18:00:00",
+                            "parameter": {"parameterName": desc},
+                        }
+                    ],
+                }
+            ],
+        }
+
+    payload = {"records": {"location": [location("臺北市", "晴"), location("高雄市", "多雲")]}}
+    seen_params = {}
+
+    async def fake_http_get(client, url, params=None):
+        seen_params.update(params)
+        return DummyResponse(payload)
+
+    monkeypatch.setattr("apps.weather.adapters.cwa36h.http_get", fake_http_get)
+
+    adapter = Cwa36hAdapter()
+    forecasts = await adapter.fetch_forecasts(location_names=["臺北市", "高雄市"])
+
+    assert seen_params["locationName"] == "臺北市,高雄市"
+    assert set(forecasts) == {"臺北市", "高雄市"}
+    assert forecasts["高雄市"].periods[0].desc == "多雲"
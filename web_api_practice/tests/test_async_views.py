@@ -0,0 +1,56 @@
+"""Async view dispatch tests for the forecast and movie search endpoints."""
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+from rest_framework.throttling import AnonRateThrottle
+
+from apps.movies.schemas import Movie, SearchResult
+from apps.movies.views import MoviesSearchView
+from apps.weather.views import ForecastView
+
+
+def test_endpoints_are_coroutine_views():
+    assert ForecastView.view_is_async
+    assert MoviesSearchView.view_is_async
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.asyncio
+async def test_movies_search_runs_on_event_loop(async_client, monkeypatch):
+    class StubService:
+        async def search(self, **kwargs):
+            return SearchResult(
+                items=[Movie(id="1", title="Inception", year="2010")],
+                page=1,
+                total_pages=1,
+                total_results=1,
+                source="tmdb",
+            )
+
+        def expires_in(self, provider, query, **kwargs):
+            return 0.0
+
+    monkeypatch.setattr(MoviesSearchView, "service_class", StubService)
+
+    response = await async_client.get("/api/v1/movies/search", {"query": "inception"})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["source"] == "tmdb"
+    assert payload["items"][0]["title"] == "Inception"
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+@pytest.mark.django_db
+def test_async_views_still_throttle(client, monkeypatch):
+    cache.clear()
+    monkeypatch.setattr(AnonRateThrottle, "THROTTLE_RATES", {"anon": "1/minute"})
+
+    first = client.get("/api/v1/movies/search")
+    second = client.get("/api/v1/movies/search")
+
+    assert first.status_code == 400
+    assert second.status_code == 429
@@ -0,0 +1,208 @@
+"""Batch forecast endpoint and service fan-out tests."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.weather.schemas import Forecast, OWMPeriod
+from apps.weather.services import WeatherService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def _forecast(city):
+    return Forecast(
+        location_name=city,
+        country="TW",
+        units="metric",
+        source="owm",
+        periods=[OWMPeriod(ts="2025-09-22T00:00:00+00:00", temp=24.0, desc="clear")],
+    )
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_get_forecasts_fills_each_slot(monkeypatch):
+    cache.clear()
+    service = WeatherService(provider_order=("owm",))
+    cached_key = service._primary_lookup({"city": "Tainan", "country": "TW"})[1]
+    service._cache.set(cached_key, _forecast("Tainan"))
+
+    fetched = []
+
+    async def fetch(**kwargs):
+        fetched.append(kwargs["city"])
+        if kwargs["city"] == "Nowhere":
+            raise RuntimeError("city not found")
+        return _forecast(kwargs["city"])
+
+    monkeypatch.setattr(service._adapters["owm"], "fetch_forecast", fetch)
+
+    results = await service.get_forecasts(
+        [
+            {"city": "Tainan", "country": "TW"},
+            {"city": "Taipei", "country": "TW"},
+            {"city": "Nowhere", "country": "TW"},
+        ]
+    )
+
+    assert results[0].location_name == "Tainan"
+    assert results[1].location_name == "Taipei"
+    assert isinstance(results[2], RuntimeError)
+    assert sorted(fetched) == ["Nowhere", "Taipei"]
+
+
+@pytest.mark.django_db
+def test_batch_endpoint_reports_per_item_results(client, monkeypatch):
+    class StubService:
+        async def get_forecasts(self, queries):
+            return [
+                _forecast("Taipei"),
+                ValueError("CWA adapter requires 'location_name'"),
+                httpx.HTTPStatusError(
+                    "Server error for url 'https://upstream.test/?APPID=SECRETKEY'",
+                    request=httpx.Request("GET", "https://upstream.test/?APPID=SECRETKEY"),
+                    response=httpx.Response(502),
+                ),
+            ]
+
+    monkeypatch.setattr("apps.weather.views.WeatherService", StubService)
+
+    response = client.post(
+        "/api/v1/weather/forecast/batch",
+        {
+            "items": [
+                {"city": "Taipei", "country": "TW"},
+                {"locationName": "臺北市"},
+                {"locationName": "高雄市"},
+            ]
+        },
+        content_type="application/json",
+    )
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["ok"] is True
+    assert results[0]["forecast"]["location"]["name"] == "Taipei"
+    assert results[1] == {
+        "ok": False,
+        "error": {"code": "invalid_query", "message": "CWA adapter requires 'location_name'"},
+    }
+    assert results[2]["error"]["code"] == "upstream_error"
+    assert "SECRETKEY" not in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_batch_endpoint_validates_items(client):
+    response = client.post(
+        "/api/v1/weather/forecast/batch",
+        {"items": [{"city": "Taipei"}]},
+        content_type="application/json",
+    )
+
+    assert response.status_code == 400
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_batched_cwa_misses_share_one_upstream_call(monkeypatch):
+    cache.clear()
+    service = WeatherService()
+    calls = []
+
+    async def fetch_forecasts(*, location_names=None, country="TW", units="metric"):
+        calls.append(list(location_names))
+        return {
+            name: Forecast(location_name=name, country=country, units=units, source="cwa")
+            for name in location_names
+        }
+
+    async def fetch_forecast(**kwargs):  # pragma: no cover - batched path expected
+        raise AssertionError("per-location CWA call should not be needed")
+
+    monkeypatch.setattr(service._adapters["cwa"], "fetch_forecasts", fetch_forecasts)
+    monkeypatch.setattr(service._adapters["cwa"], "fetch_forecast", fetch_forecast)
+
+    results = await service.get_forecasts(
+        [{"locationName": "臺北市"}, {"locationName": "高雄市"}, {"locationName": "臺北市"}]
+    )
+
+    assert [result.location_name for result in results] == ["臺北市", "高雄市", "臺北市"]
+    assert len(calls) == 1
+
+    again = await service.get_forecast(provider="cwa", locationName="高雄市")
+    assert again.location_name == "高雄市"
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_stale_batch_entries_are_served_and_refreshed_in_background(monkeypatch):
+    cache.clear()
+    service = WeatherService(cache_timeout=60, cache_mode="swr")
+    keys = []
+    for name in ("臺北市", "高雄市"):
+        key = service._primary_lookup({"locationName": name})[1]
+        service._cache.set(key, Forecast(name, "TW", "metric", "cwa"))
+        keys.append(key)
+    refreshed = asyncio.Event()
+    calls = []
+    batched = []
+
+    async def fetch_forecasts(**kwargs):
+        batched.append(kwargs)
+        return {}
+
+    async def fetch_forecast(*, location_name, **kwargs):
+        calls.append(location_name)
+        if len(calls) == 2:
+            refreshed.set()
+        return Forecast(location_name, "TW", "metric", "cwa", periods=[])
+
+    monkeypatch.setattr(service._adapters["cwa"], "fetch_forecasts", fetch_forecasts)
+    monkeypatch.setattr(service._adapters["cwa"], "fetch_forecast", fetch_forecast)
+    monkeypatch.setattr(time, "time", lambda now=time.time(): now + 120)
+
+    results = await service.get_forecasts([{"locationName": "臺北市"}, {"locationName": "高雄市"}])
+
+    assert [result.location_name for result in results] == ["臺北市", "高雄市"]
+    await asyncio.wait_for(refreshed.wait(), 1)
+    assert sorted(calls) == ["臺北市", "高雄市"]
+    assert batched == []
+
+
+@override_settings(CACHES=LOCMEM, WEATHER_BATCH_CONCURRENCY=1)
+@pytest.mark.asyncio
+async def test_batch_concurrency_bounds_fallback_calls(monkeypatch):
+    cache.clear()
+    service = WeatherService(provider_order=("owm", "cwa"), fallbacks={"owm": ["cwa"]})
+    in_flight = []
+    peak = 0
+
+    async def failing_owm(**kwargs):
+        raise RuntimeError("owm down")
+
+    async def cwa(*, location_name, **kwargs):
+        nonlocal peak
+        in_flight.append(location_name)
+        peak = max(peak, len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(location_name)
+        return Forecast(location_name, "TW", "metric", "cwa")
+
+    monkeypatch.setattr(service._adapters["owm"], "fetch_forecast", failing_owm)
+    monkeypatch.setattr(service._adapters["cwa"], "fetch_forecast", cwa)
+
+    # One item falls back from OWM to CWA while another queries CWA directly.
+    results = await service.get_forecasts(
+        [
+            {"provider": "owm", "city": "Taipei", "country": "TW", "locationName": "臺北市"},
+            {"provider": "cwa", "locationName": "高雄市"},
+        ]
+    )
+
+    assert [result.source for result in results] == ["cwa", "cwa"]
+    assert peak == 1
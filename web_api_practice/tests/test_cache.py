@@ -0,0 +1,111 @@
+"""Tests for the shared service cache policy."""
+
+import asyncio
+import time
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.common import metrics
+from apps.common.cache import _MISSING, CacheEntry, LocalCache, TwoTierCache, _estimate_size
+from apps.weather.schemas import Forecast, OWMPeriod
+from apps.weather.services import WeatherService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def _forecast(temp_source):
+    return Forecast(location_name="Taipei", country="TW", units="metric", source=temp_source)
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_swr_serves_stale_entry_and_refreshes_once(monkeypatch):
+    cache.clear()
+    metrics.reset()
+    service = WeatherService(cache_mode="swr", cache_timeout=60, stale_cache_timeout=600)
+    params = service._normalize_kwargs("owm", {"city": "Taipei", "country": "TW"})
+    key = service._cache_key("owm", params)
+    cache.set(key, CacheEntry(value=_forecast("old"), fresh_until=time.time() - 1))
+
+    calls = {"owm": 0}
+
+    async def fetch(**kwargs):
+        calls["owm"] += 1
+        return _forecast("owm")
+
+    monkeypatch.setattr(service._adapters["owm"], "fetch_forecast", fetch)
+
+    first = await service.get_forecast(provider="owm", city="Taipei", country="TW")
+    second = await service.get_forecast(provider="owm", city="Taipei", country="TW")
+    assert first.source == "old"
+    assert second.source == "old"
+
+    await asyncio.sleep(0.01)
+    third = await service.get_forecast(provider="owm", city="Taipei", country="TW")
+
+    assert third.source == "owm"
+    assert calls["owm"] == 1
+    assert metrics.get("weather.cache.stale") == 2
+    assert metrics.get("weather.cache.refresh") == 1
+    assert metrics.get("weather.cache.hit") == 1
+
+
+def test_local_cache_evicts_least_recently_used(settings):
+    settings.CACHE_L1_MAX_ENTRIES = 2
+    local = LocalCache()
+
+    local.set("a", 1, timeout=60)
+    local.set("b", 2, timeout=60)
+    assert local.get("a") == 1
+    local.set("c", 3, timeout=60)
+
+    assert local.get("b") is _MISSING
+    assert local.get("a") == 1
+    assert local.get("c") == 3
+
+
+def test_local_cache_respects_byte_budget_and_ttl(settings):
+    settings.CACHE_L1_MAX_BYTES = 200
+    local = LocalCache()
+
+    local.set("big", "x" * 500, timeout=60)
+    local.set("expired", "v", timeout=-1)
+
+    assert local.get("big") is _MISSING
+    assert local.get("expired") is _MISSING
+    assert len(local) == 0
+
+
+def test_local_cache_sizes_forecasts_by_period_count(settings):
+    periods = [
+        OWMPeriod(ts=f"2025-09-22T{hour:02d}:00:00+00:00", temp=24.0, desc="clear")
+        for hour in range(20)
+    ]
+    small = _forecast("owm")
+    large = Forecast("Taipei", "TW", "metric", "owm", periods=periods * 2)
+
+    assert _estimate_size(large) > _estimate_size(small)
+    assert _estimate_size(CacheEntry(value=large)) == _estimate_size(large)
+
+    settings.CACHE_L1_MAX_BYTES = _estimate_size(large) * 2 - 1
+    local = LocalCache()
+    local.set("a", large, timeout=60)
+    local.set("b", large, timeout=60)
+
+    assert local.get("a") is _MISSING
+    assert local.get("b") is large
+
+
+@override_settings(CACHES=LOCMEM)
+def test_two_tier_cache_serves_hot_keys_from_process_memory():
+    cache.clear()
+    tiered = TwoTierCache()
+
+    tiered.set("hot", {"v": 1}, timeout=60)
+    cache.delete("hot")
+    assert tiered.get("hot") == {"v": 1}
+
+    tiered._on_message({"data": '{"origin": "other-worker", "key": "hot"}'})
+    assert tiered.get("hot") is None
@@ -0,0 +1,152 @@
+"""Circuit breaker state machine and provider failover tests."""
+
+import asyncio
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.common import circuit
+from apps.common.circuit import CircuitBreaker, breakers
+from apps.common.exceptions import CircuitOpenError
+from apps.weather.schemas import Forecast
+from apps.weather.services import WeatherService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize("backend", ["local", "redis"])
+def test_breaker_opens_probes_and_closes(monkeypatch, backend):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit.time, "monotonic", clock)
+
+    with override_settings(
+        CACHES=LOCMEM,
+        CIRCUIT_BACKEND=backend,
+        CIRCUIT_FAILURE_THRESHOLD=2,
+        CIRCUIT_RECOVERY_TIMEOUT=30,
+    ):
+        cache.clear()
+        breaker = CircuitBreaker("owm")
+
+        breaker.record_failure()
+        assert breaker.state == circuit.STATE_CLOSED
+        breaker.record_failure()
+        assert breaker.state == circuit.STATE_OPEN
+        assert breaker.allow() is False
+
+        if backend == "redis":
+            cache.delete(breaker._key("open"))  # the recovery timeout elapsing
+        else:
+            clock.now += 31
+        assert breaker.state == circuit.STATE_HALF_OPEN
+        assert breaker.allow() is True
+        assert breaker.allow() is False  # only one probe at a time
+
+        breaker.record_success()
+        assert breaker.state == circuit.STATE_CLOSED
+        assert breaker.allow() is True
+
+
+def test_failed_probe_reopens_the_circuit(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit.time, "monotonic", clock)
+
+    with override_settings(CIRCUIT_FAILURE_THRESHOLD=1, CIRCUIT_RECOVERY_TIMEOUT=30):
+        breaker = CircuitBreaker("tmdb")
+        breaker.record_failure()
+        clock.now += 31
+        assert breaker.allow() is True
+
+        breaker.record_failure()
+
+        assert breaker.state == circuit.STATE_OPEN
+
+
+@pytest.mark.parametrize("backend", ["local", "redis"])
+def test_released_probe_can_be_claimed_again(monkeypatch, backend):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit.time, "monotonic", clock)
+
+    with override_settings(
+        CACHES=LOCMEM, CIRCUIT_BACKEND=backend, CIRCUIT_FAILURE_THRESHOLD=1
+    ):
+        cache.clear()
+        breaker = CircuitBreaker("owm")
+        breaker.record_failure()
+        if backend == "redis":
+            cache.delete(breaker._key("open"))
+        else:
+            clock.now += 31
+
+        assert breaker.allow() is True
+        breaker.release_probe()
+        assert breaker.state == circuit.STATE_HALF_OPEN
+        assert breaker.allow() is True
+
+
+@override_settings(CACHES=LOCMEM, CIRCUIT_FAILURE_THRESHOLD=1)
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_the_breaker(monkeypatch):
+    cache.clear()
+    service = WeatherService(cache_timeout=60, fallbacks={})
+    breaker = breakers.get("owm")
+    breaker.record_failure()
+    breaker._opened_at -= breaker.recovery_timeout  # recovery timeout elapsed
+
+    async def hanging_owm(**kwargs):
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(service._adapters["owm"], "fetch_forecast", hanging_owm)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            service.get_forecast(provider="owm", city="Taipei", country="TW"), 0.05
+        )
+
+    assert breaker.allow() is True
+
+
+@override_settings(CACHES=LOCMEM, CIRCUIT_FAILURE_THRESHOLD=2)
+@pytest.mark.asyncio
+async def test_open_provider_is_skipped_for_the_fallback(monkeypatch):
+    cache.clear()
+    service = WeatherService()
+    owm_calls = []
+
+    async def failing_cwa(**kwargs):
+        raise RuntimeError("CWA is down")
+
+    async def owm(**kwargs):
+        owm_calls.append(kwargs["city"])
+        return Forecast(location_name=kwargs["city"], country="TW", units="metric", source="owm")
+
+    monkeypatch.setattr(service._adapters["cwa"], "fetch_forecast", failing_cwa)
+    monkeypatch.setattr(service._adapters["owm"], "fetch_forecast", owm)
+
+    for location, city in (("臺北市", "Taipei"), ("臺南市", "Tainan")):
+        await service.get_forecast(provider="cwa", locationName=location, city=city, country="TW")
+
+    assert breakers.get("cwa").state == circuit.STATE_OPEN
+
+    async def unreachable(**kwargs):  # pragma: no cover - the circuit must short-circuit
+        raise AssertionError("open provider should not be called")
+
+    monkeypatch.setattr(service._adapters["cwa"], "fetch_forecast", unreachable)
+
+    forecast = await service.get_forecast(
+        provider="cwa", locationName="高雄市", city="Kaohsiung", country="TW"
+    )
+    assert forecast.source == "owm"
+    assert owm_calls == ["Taipei", "Tainan", "Kaohsiung"]
+
+    with pytest.raises(CircuitOpenError):
+        await service.refresh("cwa", {"location_name": "新竹市", "country": "TW", "units": "metric"})
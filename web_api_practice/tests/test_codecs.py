@@ -0,0 +1,107 @@
+"""Round-trip tests for the schema-aware cache serializer."""
+
+import dataclasses
+import pickle
+
+import pytest
+
+from apps.common.cache import CacheEntry
+from apps.common import codecs
+from apps.common.codecs import FORMAT_VERSION, SchemaSerializer
+from apps.movies.schemas import Movie, SearchResult
+from apps.weather.schemas import CWAPeriod, Forecast, OWMPeriod
+
+# Pickled with the pre-slots (dict-based) schemas, as caches held them
+# before SchemaSerializer was enabled.
+LEGACY_FORECAST = (
+    b"\x80\x05\x95\xf3\x00\x00\x00\x00\x00\x00\x00\x8c\x14apps.weather.schemas\x94"
+    b"\x8c\x08Forecast\x94\x93\x94)\x81\x94}\x94(\x8c\rlocation_name\x94\x8c\x06Taipei\x94"
+    b"\x8c\x07country\x94\x8c\x02TW\x94\x8c\x05units\x94\x8c\x06metric\x94\x8c\x06source\x94"
+    b"\x8c\x03owm\x94\x8c\x07periods\x94]\x94h\x00\x8c\tOWMPeriod\x94\x93\x94)\x81\x94}\x94("
+    b"\x8c\x02ts\x94\x8c\x192025-09-22T21:00:00+00:00\x94\x8c\x04temp\x94G@8\x80\x00\x00\x00"
+    b"\x00\x00\x8c\x04desc\x94\x8c\x05clear\x94\x8c\x08humidity\x94KF\x8c\x08wind_kph\x94"
+    b"Nubaub."
+)
+LEGACY_SEARCH_RESULT = (
+    b"\x80\x05\x95\xe4\x00\x00\x00\x00\x00\x00\x00\x8c\x13apps.movies.schemas\x94"
+    b"\x8c\x0cSearchResult\x94\x93\x94)\x81\x94}\x94(\x8c\x05items\x94]\x94h\x00\x8c\x05Movie"
+    b"\x94\x93\x94)\x81\x94}\x94(\x8c\x02id\x94\x8c\x03603\x94\x8c\x05title\x94\x8c\n"
+    b"The Matrix\x94\x8c\x04year\x94N\x8c\x04plot\x94N\x8c\x06poster\x94N\x8c\x06genres\x94N"
+    b"\x8c\x06rating\x94G@ ffffff\x8c\x06source\x94\x8c\x04tmdb\x94uba\x8c\x04page\x94K\x01"
+    b"\x8c\x0btotal_pages\x94K\x01\x8c\rtotal_results\x94K\x01h\x14h\x15ub."
+)
+
+
+def _forecast():
+    return Forecast(
+        location_name="臺北市",
+        country="TW",
+        units="metric",
+        source="cwa",
+        periods=[
+            CWAPeriod(start="2025-09-22T18:00:00+00:00", end=None, desc="陰", pop=60),
+            OWMPeriod(ts="2025-09-22T21:00:00+00:00", temp=24.5, desc="clear", humidity=70),
+        ],
+    )
+
+
+def test_forecast_round_trip_is_compact():
+    serializer = SchemaSerializer({})
+    forecast = _forecast()
+
+    blob = serializer.dumps(forecast)
+
+    assert blob[0] == FORMAT_VERSION
+    assert len(blob) < len(pickle.dumps(forecast))
+    assert serializer.loads(blob) == forecast
+
+
+def test_cache_entry_and_search_result_round_trip():
+    serializer = SchemaSerializer({})
+    result = SearchResult(
+        items=[Movie(id="603", title="The Matrix", genres=[28, 878], rating=8.2)],
+        page=1,
+        total_pages=1,
+        total_results=1,
+        source="tmdb",
+    )
+
+    for value in (CacheEntry(value=result, fresh_until=1700000000.5), CacheEntry(value=_forecast())):
+        assert serializer.loads(serializer.dumps(value)) == value
+
+
+def test_other_values_and_legacy_pickle_still_load():
+    serializer = SchemaSerializer({})
+    throttle_history = [1700000000.1, 1700000001.2]
+
+    assert serializer.loads(serializer.dumps(throttle_history)) == throttle_history
+    assert serializer.loads(pickle.dumps(throttle_history)) == throttle_history
+    assert serializer.loads(bytes((FORMAT_VERSION + 1,)) + b"o-[]") is None
+
+
+@pytest.mark.parametrize("blob", [LEGACY_FORECAST, LEGACY_SEARCH_RESULT])
+def test_legacy_pickled_schemas_load_as_a_miss(blob):
+    assert SchemaSerializer({}).loads(blob) is None
+
+
+@pytest.mark.parametrize(
+    "header, library",
+    [(b"oz", "zstandard"), (b"ol", "lz4_frame"), (b"m-", "msgpack")],
+)
+def test_payload_needing_a_missing_library_loads_as_a_miss(monkeypatch, header, library):
+    monkeypatch.setattr(codecs, library, None)
+
+    blob = bytes((FORMAT_VERSION,)) + header + b"\x00\x01"
+
+    assert SchemaSerializer({}).loads(blob) is None
+
+
+def test_slotted_schemas_pickle_and_stay_immutable():
+    forecast = _forecast()
+    period = forecast.periods[0]
+
+    assert not hasattr(period, "__dict__")
+    assert not hasattr(forecast, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        period.desc = "晴"
+    assert pickle.loads(pickle.dumps(forecast)) == forecast
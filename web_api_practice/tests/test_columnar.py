@@ -0,0 +1,160 @@
+"""Columnar forecast view and aggregation tests."""
+
+import math
+
+import pytest
+
+from apps.weather import columnar
+from apps.weather.columnar import (
+    ForecastColumns,
+    daily_summary,
+    pop_windows,
+    resample,
+    rolling_mean,
+)
+from apps.weather.schemas import CWAPeriod, Forecast, OWMPeriod
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "array":
+        monkeypatch.setattr(columnar, "np", None)
+    elif columnar.np is None:
+        pytest.skip("numpy is not installed")
+    return request.param
+
+
+def owm_forecast():
+    rows = [
+        ("2025-09-22T00:00:00+00:00", 24.0, 70, 10.0),
+        ("2025-09-22T12:00:00+00:00", 30.0, 60, 20.0),
+        ("2025-09-22T21:00:00+00:00", 26.0, None, 5.0),
+        ("2025-09-23T03:00:00+00:00", 28.0, 80, None),
+    ]
+    periods = [
+        OWMPeriod(ts=ts, temp=temp, desc="clear", humidity=humidity, wind_kph=wind)
+        for ts, temp, humidity, wind in rows
+    ]
+    return Forecast("Taipei", "TW", "metric", "owm", periods)
+
+
+def cwa_forecast():
+    rows = [
+        ("2025-09-22T10:00:00+00:00", 20, 26.0, 31.0),
+        ("2025-09-22T22:00:00+00:00", 70, 25.0, 27.0),
+        ("2025-09-23T10:00:00+00:00", 80, 27.0, 33.0),
+    ]
+    periods = [
+        CWAPeriod(start=start, end=None, desc="多雲", pop=pop, min_temp=low, max_temp=high)
+        for start, pop, low, high in rows
+    ]
+    return Forecast("臺北市", "TW", "metric", "cwa", periods)
+
+
+def test_columns_are_built_lazily_with_nan_for_missing(backend):
+    columns = ForecastColumns(owm_forecast())
+    assert "humidity" not in vars(columns)
+
+    humidity = list(columns.humidity)
+
+    assert "humidity" in vars(columns) and "pop" not in vars(columns)
+    assert humidity[:2] == [70.0, 60.0] and math.isnan(humidity[2])
+    assert list(columns.ts)[0] == 1758499200.0
+    assert all(math.isnan(value) for value in columns.pop)
+
+
+def test_daily_summary_groups_by_calendar_day(backend):
+    summary = daily_summary(ForecastColumns(owm_forecast()))
+
+    assert summary == [
+        {
+            "date": "2025-09-22",
+            "periods": 3,
+            "temp_min": 24.0,
+            "temp_max": 30.0,
+            "temp_mean": pytest.approx(80 / 3),
+            "humidity_mean": 65.0,
+            "wind_kph_max": 20.0,
+            "pop_max": None,
+        },
+        {
+            "date": "2025-09-23",
+            "periods": 1,
+            "temp_min": 28.0,
+            "temp_max": 28.0,
+            "temp_mean": 28.0,
+            "humidity_mean": 80.0,
+            "wind_kph_max": None,
+            "pop_max": None,
+        },
+    ]
+
+
+def test_daily_summary_respects_utc_offset(backend):
+    summary = daily_summary(ForecastColumns(owm_forecast()), utc_offset=8)
+
+    assert [(day["date"], day["periods"]) for day in summary] == [
+        ("2025-09-22", 2),
+        ("2025-09-23", 2),
+    ]
+
+
+def test_cwa_columns_use_min_max_and_pop(backend):
+    columns = ForecastColumns(cwa_forecast())
+    summary = daily_summary(columns, utc_offset=8)
+
+    assert [day["temp_min"] for day in summary] == [26.0, 25.0]
+    assert [day["temp_max"] for day in summary] == [31.0, 33.0]
+    assert [day["pop_max"] for day in summary] == [20.0, 80.0]
+    assert pop_windows(columns, 50) == [(1, 3)]
+    assert pop_windows(columns, 10) == [(0, 3)]
+    assert pop_windows(columns, 90) == []
+
+
+def test_rolling_mean(backend):
+    result = list(rolling_mean([1.0, 2.0, 3.0, 4.0], 2))
+
+    assert math.isnan(result[0])
+    assert result[1:] == [1.5, 2.5, 3.5]
+    assert all(math.isnan(value) for value in rolling_mean([1.0], 3))
+    with pytest.raises(ValueError):
+        rolling_mean([1.0], 0)
+
+
+def test_resample_buckets_with_dominant_description(backend):
+    periods = [
+        OWMPeriod(ts=f"2025-09-22T{hour:02d}:00:00+00:00", temp=20.0 + hour, desc=desc, wind_kph=wind)
+        for hour, desc, wind in [
+            (0, "rain", 5.0),
+            (3, "clear", 9.0),
+            (6, "clear", None),
+            (9, "clouds", 4.0),
+            (12, "clouds", 2.0),
+        ]
+    ]
+    columns = ForecastColumns(Forecast("Taipei", "TW", "metric", "owm", periods))
+
+    rows = resample(columns, "6h")
+
+    assert [(row["start"], row["end"], row["periods"]) for row in rows] == [
+        ("2025-09-22T00:00:00+00:00", "2025-09-22T06:00:00+00:00", 2),
+        ("2025-09-22T06:00:00+00:00", "2025-09-22T12:00:00+00:00", 2),
+        ("2025-09-22T12:00:00+00:00", "2025-09-22T18:00:00+00:00", 1),
+    ]
+    assert [row["desc"] for row in rows] == ["rain", "clear", "clouds"]
+    assert rows[0] | {"start": None, "end": None} == {
+        "start": None,
+        "end": None,
+        "periods": 2,
+        "desc": "rain",
+        "temp_min": 20.0,
+        "temp_max": 23.0,
+        "temp_mean": 21.5,
+        "wind_kph_max": 9.0,
+    }
+
+    daily = resample(columns, "day", utc_offset=8)
+    assert [(row["start"], row["periods"]) for row in daily] == [
+        ("2025-09-21T16:00:00+00:00", 5)
+    ]
+    assert daily[0]["desc"] == "clear"
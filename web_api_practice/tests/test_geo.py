@@ -0,0 +1,126 @@
+"""Coordinate queries: geohash snapping and county routing tests."""
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.common import geohash
+from apps.weather.adapters.openweather import OpenWeatherAdapter
+from apps.weather.locations import nearest_county
+from apps.weather.schemas import Forecast
+from apps.weather.serializers import ForecastQuery
+from apps.weather.services import WeatherService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def test_geohash_encode_and_snap():
+    assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    min_lat, min_lon, max_lat, max_lon = geohash.bounds(geohash.encode(25.0375, 121.5637))
+    lat, lon = geohash.snap(25.0375, 121.5637)
+    assert min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+    assert geohash.snap(25.0376, 121.5638) == (lat, lon)
+    with pytest.raises(ValueError):
+        geohash.encode(91, 0)
+
+
+@pytest.mark.parametrize(
+    "lat, lon, county",
+    [
+        (25.0330, 121.5654, "臺北市"),  # Taipei 101
+        (22.6273, 120.3014, "高雄市"),
+        (24.4500, 118.3800, "金門縣"),
+        (23.9800, 121.6000, "花蓮縣"),
+        (26.1580, 119.9510, "連江縣"),  # Nangan
+        (23.5712, 119.5793, "澎湖縣"),
+        (22.0440, 121.5480, "臺東縣"),  # Orchid Island
+        (24.4798, 118.0894, None),  # Xiamen
+        (24.5460, 118.2500, None),  # Xiang'an, facing Kinmen
+        (24.8741, 118.6757, None),  # Quanzhou
+        (26.0745, 119.2965, None),  # Fuzhou
+        (35.6762, 139.6503, None),  # Tokyo
+    ],
+)
+def test_nearest_county(lat, lon, county):
+    assert nearest_county(lat, lon) == county
+
+
+@pytest.mark.parametrize(
+    "data, valid",
+    [
+        ({"lat": 25.03, "lon": 121.56}, True),
+        ({"provider": "owm", "lat": 25.03, "lon": 121.56}, True),
+        ({"provider": "cwa", "lat": 25.03, "lon": 121.56}, True),
+        ({"provider": "owm", "lat": 25.03}, False),
+        ({"lat": 95, "lon": 121.56}, False),
+    ],
+)
+def test_forecast_query_accepts_coordinates(data, valid):
+    assert ForecastQuery(data=data).is_valid() is valid
+
+
+@pytest.mark.asyncio
+async def test_openweather_adapter_queries_coordinates(monkeypatch):
+    seen = {}
+
+    class DummyResponse:
+        def json(self):
+            return {"city": {"country": "TW"}, "list": []}
+
+    async def fake_http_get(client, url, params=None):
+        seen.update(params)
+        return DummyResponse()
+
+    monkeypatch.setattr("apps.weather.adapters.openweather.http_get", fake_http_get)
+
+    forecast = await OpenWeatherAdapter().fetch_forecast(lat=25.03, lon=121.56)
+
+    assert (seen["lat"], seen["lon"]) == (25.03, 121.56)
+    assert "q" not in seen
+    assert forecast.location_name == "25.03,121.56"
+    assert forecast.country == "TW"
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_nearby_coordinates_share_one_owm_call(monkeypatch):
+    cache.clear()
+    service = WeatherService(cache_timeout=60)
+    calls = []
+
+    async def fake_owm(**kwargs):
+        calls.append((kwargs["lat"], kwargs["lon"]))
+        return Forecast("Taipei", "TW", "metric", "owm")
+
+    monkeypatch.setattr(service._adapters["owm"], "fetch_forecast", fake_owm)
+
+    await service.get_forecast(provider="owm", lat=25.0375, lon=121.5637)
+    await service.get_forecast(provider="owm", lat=25.0376, lon=121.5638)
+
+    assert calls == [geohash.snap(25.0375, 121.5637)]
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_coordinates_route_to_cwa_county_or_fall_back(monkeypatch):
+    cache.clear()
+    service = WeatherService(cache_timeout=60, fallbacks={"cwa": ["owm"]})
+    calls = []
+
+    async def fake_cwa(**kwargs):
+        calls.append(("cwa", kwargs["location_name"]))
+        return Forecast(kwargs["location_name"], "TW", "metric", "cwa")
+
+    async def fake_owm(**kwargs):
+        calls.append(("owm", kwargs["lat"], kwargs["lon"]))
+        return Forecast("Tokyo", "JP", "metric", "owm")
+
+    monkeypatch.setattr(service._adapters["cwa"], "fetch_forecast", fake_cwa)
+    monkeypatch.setattr(service._adapters["owm"], "fetch_forecast", fake_owm)
+
+    taipei = await service.get_forecast(provider="cwa", lat=25.0330, lon=121.5654)
+    tokyo = await service.get_forecast(provider="cwa", lat=35.6762, lon=139.6503)
+
+    assert taipei.location_name == "臺北市"
+    assert tokyo.source == "owm"
+    assert calls == [("cwa", "臺北市"), ("owm", *geohash.snap(35.6762, 139.6503))]
@@ -0,0 +1,93 @@
+"""Hedged request and latency tracking tests."""
+
+import asyncio
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.common.hedging import hedged
+from apps.common.latency import LatencyTracker, latencies
+from apps.movies.schemas import SearchResult
+from apps.movies.services import MoviesService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(HEDGE_MIN_SAMPLES=10, HEDGE_DEFAULT_DELAY=0.5, HEDGE_MIN_DELAY=0.01)
+def test_hedge_delay_follows_the_p95_once_warmed_up():
+    tracker = LatencyTracker()
+    for _ in range(9):
+        tracker.observe("owm", 0.1)
+    assert tracker.hedge_delay("owm") == 0.5
+
+    for index in range(91):
+        tracker.observe("owm", 0.1 if index < 85 else 2.0)
+
+    assert tracker.percentile("owm", 50) == 0.1
+    assert tracker.hedge_delay("owm") == 2.0
+    assert tracker.hedge_delay("cwa") == 0.5
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_never_starts_the_backup():
+    started = []
+
+    async def primary():
+        return "primary"
+
+    async def backup():  # pragma: no cover - must not run
+        started.append("backup")
+        return "backup"
+
+    assert await hedged(primary, backup, delay=0.05) == "primary"
+    assert started == []
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_loses_to_the_backup_and_is_cancelled():
+    cancelled = asyncio.Event()
+
+    async def primary():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def backup():
+        return "backup"
+
+    assert await hedged(primary, backup, delay=0.01) == "backup"
+    await asyncio.wait_for(cancelled.wait(), 1)
+
+
+@override_settings(CACHES=LOCMEM, HEDGE_DEFAULT_DELAY=0.01, HEDGE_MIN_DELAY=0.01)
+@pytest.mark.asyncio
+async def test_search_races_the_fallback_provider(monkeypatch):
+    cache.clear()
+    latencies.clear()
+    service = MoviesService(hedge=True)
+    upstream_cancelled = asyncio.Event()
+
+    async def slow_tmdb(**kwargs):
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            upstream_cancelled.set()
+            raise
+
+    async def omdb(**kwargs):
+        return SearchResult(items=[], page=1, total_pages=1, total_results=0, source="omdb")
+
+    monkeypatch.setattr(service._adapters["tmdb"], "search", slow_tmdb)
+    monkeypatch.setattr(service._adapters["omdb"], "search", omdb)
+
+    result = await service.search(query="Inception")
+
+    assert result.source == "omdb"
+    await asyncio.wait_for(upstream_cancelled.wait(), 1)
+    await asyncio.sleep(0)
+    # The cancelled loser still counts, as a lower bound on TMDB's latency.
+    assert latencies.count("tmdb") == 1
+    assert latencies.percentile("tmdb", 100) >= 0.01
@@ -0,0 +1,115 @@
+"""Tests for the shared HTTP client registry and ASGI lifespan hooks."""
+
+import asyncio
+import gc
+import weakref
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from apps.common.background import spawn
+from apps.common.http import ClientRegistry, clients
+from apps.common.lifespan import LifespanMiddleware
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_client_per_origin():
+    registry = ClientRegistry()
+
+    first = registry.get("https://api.themoviedb.org/3/search/movie")
+    second = registry.get("https://api.themoviedb.org/3/movie/1")
+    other = registry.get("https://www.omdbapi.com/")
+
+    assert first is second
+    assert first is not other
+
+    await registry.aclose()
+
+    assert first.is_closed
+    assert other.is_closed
+    assert registry.get("https://api.themoviedb.org/3/search/movie") is not first
+    await registry.aclose()
+
+
+def test_per_request_loops_release_their_pool():
+    registry = ClientRegistry()
+    loops = []
+
+    async def request():
+        async with registry.session():
+            loops.append(weakref.ref(asyncio.get_running_loop()))
+            client = registry.get("https://api.themoviedb.org/3/search/movie")
+        assert client.is_closed
+
+    for _ in range(5):
+        async_to_sync(request)()
+    gc.collect()
+
+    assert len(registry._pools) == 0
+    assert all(loop() is None for loop in loops)
+
+
+def test_background_tasks_keep_a_per_request_pool_open():
+    url = "https://api.themoviedb.org/3/search/movie"
+
+    async def background():
+        client = clients.get(url)
+        await asyncio.sleep(0.01)
+        return client, client.is_closed
+
+    async def request():
+        async with clients.session():
+            task = spawn(background())
+            await asyncio.sleep(0)
+        client, closed_while_running = await task
+        return client, closed_while_running
+
+    client, closed_while_running = async_to_sync(request)()
+
+    assert closed_while_running is False
+    assert client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_kept_open_loop_pools_across_sessions():
+    registry = ClientRegistry()
+    registry.keep_open()
+
+    async with registry.session():
+        first = registry.get("https://www.omdbapi.com/")
+    async with registry.session():
+        assert registry.get("https://www.omdbapi.com/") is first
+
+    assert not first.is_closed
+    await registry.aclose()
+    assert first.is_closed
+
+
+@pytest.mark.asyncio
+async def test_lifespan_runs_startup_and_shutdown_hooks():
+    calls = []
+
+    async def on_startup():
+        calls.append("startup")
+
+    async def on_shutdown():
+        calls.append("shutdown")
+
+    async def django_app(scope, receive, send):  # pragma: no cover - not reached
+        raise AssertionError("lifespan scope must not reach Django")
+
+    app = LifespanMiddleware(django_app, on_startup=[on_startup], on_shutdown=[on_shutdown])
+
+    messages = iter([{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}])
+    sent = []
+
+    async def receive():
+        return next(messages)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    await app({"type": "lifespan"}, receive, send)
+
+    assert calls == ["startup", "shutdown"]
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
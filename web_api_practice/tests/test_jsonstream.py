@@ -0,0 +1,112 @@
+"""Streaming JSON parsing tests for the weather adapters."""
+
+import json
+
+import httpx
+import pytest
+from django.test.utils import override_settings
+
+from apps.common import jsonstream
+from apps.weather.adapters.cwa36h import Cwa36hAdapter
+from apps.weather.adapters.openweather import OpenWeatherAdapter
+
+OWM_PAYLOAD = {
+    "cod": "200",
+    "list": [
+        {
+            "dt_txt": f"2025-09-22 {hour:02d}:00:00",
+            "main": {"temp": 23.5 + hour, "humidity": 65},
+            "weather": [{"description": "few clouds"}],
+            "wind": {"speed": 2.0},
+        }
+        for hour in (0, 3, 6)
+    ],
+    "city": {"name": "Taipei", "country": "TW"},
+}
+
+
+def _streaming_client(payload, chunk_size=7):
+    body = json.dumps(payload, ensure_ascii=False).encode()
+
+    class Chunked(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for start in range(0, len(body), chunk_size):
+                yield body[start:start + chunk_size]
+
+    def handler(request):
+        return httpx.Response(200, stream=Chunked())
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.fixture(params=["ijson", "fallback"])
+def parser(request, monkeypatch):
+    if request.param == "ijson":
+        pytest.importorskip("ijson")
+    else:
+        monkeypatch.setattr(jsonstream, "ijson", None)
+    return request.param
+
+
+@override_settings(WEATHER_STREAMING_JSON=True)
+@pytest.mark.asyncio
+async def test_openweather_streams_periods(monkeypatch, parser):
+    client = _streaming_client(OWM_PAYLOAD)
+    monkeypatch.setattr("apps.weather.adapters.openweather.get_client", lambda url: client)
+
+    forecast = await OpenWeatherAdapter().fetch_forecast(city="taipei", country="TW")
+
+    assert forecast.location_name == "Taipei"
+    assert [period.temp for period in forecast.periods] == [23.5, 26.5, 29.5]
+    assert isinstance(forecast.periods[0].temp, float)
+    assert forecast.periods[0].wind_kph == pytest.approx(7.2)
+
+
+@override_settings(WEATHER_STREAMING_JSON=True)
+@pytest.mark.asyncio
+async def test_cwa_streams_locations(monkeypatch, parser):
+    def location(name, desc):
+        return {
+            "locationName": name,
+            "weatherElement": [
+                {
+                    "elementName": "Wx",
+                    "time": [
+                        {
+                            "startTime": "2025-09-22 18:00:00",
+                            "endTime": "2025-09-23 06:00:00",
+                            "parameter": {"parameterName": desc},
+                        }
+                    ],
+                }
+            ],
+        }
+
+    payload = {
+        "success": "true",
+        "records": {"location": [location("臺北市", "晴"), location("高雄市", "多雲")]},
+    }
+    client = _streaming_client(payload)
+    monkeypatch.setattr("apps.weather.adapters.cwa36h.get_client", lambda url: client)
+
+    forecasts = await Cwa36hAdapter().fetch_forecasts(location_names=["臺北市", "高雄市"])
+
+    assert {name: forecast.periods[0].desc for name, forecast in forecasts.items()} == {
+        "臺北市": "晴",
+        "高雄市": "多雲",
+    }
+
+
+@pytest.mark.asyncio
+async def test_missing_ijson_is_logged_once(monkeypatch, caplog):
+    monkeypatch.setattr(jsonstream, "ijson", None)
+    jsonstream._warn_without_ijson.cache_clear()
+
+    for _ in range(2):
+        async with _streaming_client(OWM_PAYLOAD) as client:
+            async with client.stream("GET", "https://example.test") as response:
+                items = [item async for item in jsonstream.iter_items(response, ["city"])]
+        assert items == [("city", OWM_PAYLOAD["city"])]
+
+    warnings = [record for record in caplog.records if "ijson is not installed" in record.message]
+    assert len(warnings) == 1
@@ -0,0 +1,190 @@
+"""Merged CWA + OWM forecast tests."""
+
+import asyncio
+import json
+from dataclasses import asdict
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.common import metrics
+from apps.common.codecs import SchemaSerializer
+from apps.common.renderers import ORJSONRenderer
+from apps.weather.adapters.cwa36h import Cwa36hAdapter
+from apps.weather.schemas import CWAPeriod, Forecast, MergedPeriod, OWMPeriod
+from apps.weather.serializers import ForecastQuery
+from apps.weather.services import WeatherService
+from apps.weather.timeline import merge_forecasts
+from apps.weather.views import forecast_payload
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+CWA = Forecast(
+    "臺北市",
+    "TW",
+    "metric",
+    "cwa",
+    [
+        CWAPeriod(
+            "2025-09-22T10:00:00+00:00", "2025-09-22T22:00:00+00:00", "多雲",
+            pop=20, min_temp=26, max_temp=33, comfort="悶熱",
+        ),
+        CWAPeriod(
+            "2025-09-22T22:00:00+00:00", "2025-09-23T10:00:00+00:00", "陣雨",
+            pop=60, min_temp=25, max_temp=28, comfort="舒適",
+        ),
+    ],
+)
+OWM = Forecast(
+    "Taipei",
+    "TW",
+    "metric",
+    "owm",
+    [
+        OWMPeriod("2025-09-22T09:00:00+00:00", 31.0, "few clouds", humidity=60),
+        OWMPeriod("2025-09-22T12:00:00+00:00", 30.0, "clouds", humidity=65),
+        OWMPeriod("2025-09-22T21:00:00+00:00", 27.0, "rain", humidity=80),
+        OWMPeriod("2025-09-23T00:00:00+00:00", 26.0, "rain", humidity=85),
+    ],
+)
+
+
+def test_merge_aligns_owm_points_with_cwa_windows():
+    merged = merge_forecasts(CWA, OWM)
+
+    assert merged.source == "merged"
+    assert merged.location_name == "臺北市"
+    assert [period.ts for period in merged.periods] == [period.ts for period in OWM.periods]
+    assert [period.pop for period in merged.periods] == [None, 20, 20, 60]
+    assert [period.comfort for period in merged.periods] == [None, "悶熱", "悶熱", "舒適"]
+    assert merged.periods[3].temp == 26.0
+    assert merged.periods[3].window_start == "2025-09-22T22:00:00+00:00"
+
+
+@pytest.mark.asyncio
+async def test_cwa_local_windows_align_with_owm_utc_points(monkeypatch):
+    def element(name, value, start, end):
+        return {
+            "elementName": name,
+            "time": [{"startTime": start, "endTime": end, "parameter": {"parameterName": value}}],
+        }
+
+    payload = {
+        "records": {
+            "location": [
+                {
+                    "locationName": "臺北市",
+                    "weatherElement": [
+                        element(name, value, "2025-09-22 18:00:00", "2025-09-23 06:00:00")
+                        for name, value in (("Wx", "多雲"), ("PoP", "30"), ("CI", "舒適"))
+                    ],
+                }
+            ]
+        }
+    }
+
+    class DummyResponse:
+        def json(self):
+            return payload
+
+    async def fake_http_get(client, url, params=None):
+        return DummyResponse()
+
+    monkeypatch.setattr("apps.weather.adapters.cwa36h.http_get", fake_http_get)
+    cwa = await Cwa36hAdapter().fetch_forecast(location_name="臺北市")
+
+    merged = merge_forecasts(cwa, OWM)
+
+    # The 18:00-06:00 Taiwan window is 10:00-22:00 UTC.
+    assert [period.pop for period in merged.periods] == [None, 30, 30, None]
+
+
+def test_merge_without_owm_uses_cwa_windows():
+    merged = merge_forecasts(CWA, None)
+
+    assert [period.ts for period in merged.periods] == [period.start for period in CWA.periods]
+    assert merged.periods[0].pop == 20 and merged.periods[0].temp is None
+
+
+def test_merged_forecast_round_trips_and_renders():
+    merged = merge_forecasts(CWA, OWM)
+    serializer = SchemaSerializer({})
+
+    assert serializer.loads(serializer.dumps(merged)) == merged
+    body = ORJSONRenderer().render(forecast_payload(merged))
+    assert json.loads(body)["periods"] == [asdict(period) for period in merged.periods]
+
+
+@pytest.mark.parametrize(
+    "data, valid",
+    [
+        ({"provider": "merged", "lat": 25.03, "lon": 121.56}, True),
+        ({"provider": "merged", "locationName": "臺北市", "city": "Taipei", "country": "TW"}, True),
+        ({"provider": "merged", "locationName": "臺北市"}, False),
+    ],
+)
+def test_merged_query_needs_both_locations(data, valid):
+    assert ForecastQuery(data=data).is_valid() is valid
+
+
+def _service(monkeypatch, owm_delay=0.0):
+    service = WeatherService(cache_timeout=60, cache_mode="swr")
+    calls = []
+    started = asyncio.Event()
+
+    async def fake_cwa(**kwargs):
+        calls.append("cwa")
+        started.set()
+        return CWA
+
+    async def fake_owm(**kwargs):
+        calls.append("owm")
+        # Only completes once CWA is in flight too: the parts run concurrently.
+        await asyncio.wait_for(started.wait(), 1)
+        await asyncio.sleep(owm_delay)
+        return OWM
+
+    monkeypatch.setattr(service._adapters["cwa"], "fetch_forecast", fake_cwa)
+    monkeypatch.setattr(service._adapters["owm"], "fetch_forecast", fake_owm)
+    return service, calls
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_merged_parts_are_fetched_concurrently_and_cached_separately(monkeypatch):
+    cache.clear()
+    service, calls = _service(monkeypatch)
+
+    merged = await service.get_forecast(provider="merged", lat=25.0330, lon=121.5654)
+    owm = await service.get_forecast(provider="owm", lat=25.0330, lon=121.5654)
+    cwa = await service.get_forecast(provider="cwa", locationName="台北市")
+
+    assert isinstance(merged.periods[0], MergedPeriod)
+    assert merged.parts == ("cwa", "owm")
+    assert owm == OWM and cwa == CWA
+    assert sorted(calls) == ["cwa", "owm"]
+    assert service.expires_in("merged", {"lat": 25.0330, "lon": 121.5654}, parts=merged.parts) > 0
+
+
+@override_settings(CACHES=LOCMEM, WEATHER_MERGED_DEADLINE=0.05)
+@pytest.mark.asyncio
+async def test_merged_part_past_the_deadline_is_left_out(monkeypatch):
+    cache.clear()
+    metrics.reset()
+    service, calls = _service(monkeypatch, owm_delay=0.5)
+
+    merged = await service.get_forecast(provider="merged", lat=25.0330, lon=121.5654)
+
+    assert merged.source == "merged"
+    assert merged.parts == ("cwa",)
+    assert [period.ts for period in merged.periods] == [period.start for period in CWA.periods]
+    assert metrics.get("weather.merged.owm.failed") == 1
+    query = {"lat": 25.0330, "lon": 121.5654}
+    assert service.expires_in("merged", query, parts=merged.parts) == 0.0
+
+    # The late part was not cancelled: it finishes in the background and is cached.
+    await asyncio.sleep(0.6)
+    owm = await service.get_forecast(provider="owm", **query)
+    assert owm == OWM
+    assert calls.count("owm") == 1
@@ -0,0 +1,174 @@
+"""Movie search re-paging and prefetch tests."""
+
+import asyncio
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.common import metrics
+from apps.common.hotkeys import hot_keys
+from apps.movies.schemas import Movie, SearchResult
+from apps.movies.serializers import MoviesSearchQuery
+from apps.movies.services import MoviesService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+TOTAL_RESULTS = 45
+
+
+@pytest.fixture
+def tmdb(monkeypatch):
+    """A TMDb adapter serving 45 results, 20 per page, that records page calls."""
+
+    service = MoviesService(cache_timeout=60)
+    calls = []
+
+    async def fake_search(*, query, page=1, lang="zh-TW"):
+        calls.append(page)
+        await asyncio.sleep(0.01)
+        if page > 3:
+            raise RuntimeError("page out of range")
+        ids = range((page - 1) * 20, min(page * 20, TOTAL_RESULTS))
+        return SearchResult(
+            items=[Movie(id=str(i), title=f"movie {i}") for i in ids],
+            page=page,
+            total_pages=3,
+            total_results=TOTAL_RESULTS,
+            source="tmdb",
+        )
+
+    monkeypatch.setattr(service._adapters["tmdb"], "search", fake_search)
+    return service, calls
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_page_size_assembles_upstream_pages(tmdb):
+    service, calls = tmdb
+    cache.clear()
+
+    first = await service.search(query="star", page_size=30)
+    second = await service.search(query="star", page=2, page_size=30)
+
+    assert [movie.id for movie in first.items] == [str(i) for i in range(30)]
+    assert [movie.id for movie in second.items] == [str(i) for i in range(30, 45)]
+    assert (first.page, first.total_pages, first.total_results) == (1, 2, 45)
+    assert second.page == 2
+    assert sorted(calls) == [1, 2, 3]  # upstream page 2 served both from the cache
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_pages_past_the_end_are_not_requested(tmdb):
+    service, calls = tmdb
+    cache.clear()
+
+    result = await service.search(query="star", page=2, page_size=40)
+
+    assert calls == [3]  # upstream page 4 is past total_pages
+    assert [movie.id for movie in result.items] == [str(i) for i in range(40, 45)]
+    assert result.total_pages == 2
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_first_upstream_page_is_fetched_before_the_rest(tmdb, monkeypatch):
+    service, calls = tmdb
+    cache.clear()
+    search = service._adapters["tmdb"].search
+    in_flight = []
+
+    async def tracked(**kwargs):
+        in_flight.append(kwargs["page"])
+        try:
+            if kwargs["page"] > 1:
+                assert 1 not in in_flight
+            return await search(**kwargs)
+        finally:
+            in_flight.remove(kwargs["page"])
+
+    monkeypatch.setattr(service._adapters["tmdb"], "search", tracked)
+
+    result = await service.search(query="star", page_size=60)
+
+    assert calls[0] == 1 and sorted(calls) == [1, 2, 3]
+    assert len(result.items) == TOTAL_RESULTS
+
+
+@pytest.mark.parametrize(
+    "data, valid",
+    [
+        ({"query": "star", "page": 10, "page_size": 100}, True),
+        ({"query": "star", "page": 11, "page_size": 100}, False),
+        ({"query": "star", "page": 5000}, True),
+    ],
+)
+def test_page_depth_is_capped_when_re_paging(data, valid):
+    assert MoviesSearchQuery(data=data).is_valid() is valid
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_prefetch_warms_the_following_pages(tmdb):
+    service, calls = tmdb
+    cache.clear()
+    service._prefetch_pages = 5
+    metrics.reset()
+
+    await service.search(query="star")
+    assert calls == [1]
+    await asyncio.sleep(0.1)
+
+    assert calls == [1, 2, 3]  # stops at total_pages
+    assert metrics.get("movies.prefetch.pages") == 2
+
+    result = await service.search(query="star", page=3)
+    assert result.page == 3
+    assert calls == [1, 2, 3]
+
+
+@override_settings(CACHES=LOCMEM, MOVIES_PREFETCH_PAGES=0)
+@pytest.mark.asyncio
+async def test_prefetch_is_off_by_default(tmdb):
+    service, calls = tmdb
+    cache.clear()
+
+    await service.search(query="star")
+    await asyncio.sleep(0.05)
+
+    assert calls == [1]
+
+
+@override_settings(CACHES=LOCMEM)
+def test_response_cache_hit_records_the_first_upstream_page():
+    cache.clear()
+    hot_keys.clear()
+    metrics.reset()
+
+    MoviesService().record_response_hit(
+        {"query": "Star", "page": 2, "page_size": 30, "lang": "zh-TW"}
+    )
+
+    [(provider, params)] = hot_keys.top("movies", 5)
+    assert provider == "tmdb" and params["page"] == 2
+    assert metrics.get("movies.cache.hit") == 1
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_assembled_page_expires_with_its_shortest_lived_part(tmdb):
+    service, calls = tmdb
+    cache.clear()
+
+    await service.search(query="star", page_size=30)
+    query = {"query": "star", "page": 1, "page_size": 30, "lang": "zh-TW"}
+    assert 55 < service.expires_in("tmdb", query) <= 60
+
+    params = service._normalize_kwargs("tmdb", {"query": "star", "page": 2, "lang": "zh-TW"})
+    service._cache.timeout = 5
+    service._cache.set(service._cache_key("tmdb", params), await service.search(query="star", page=2))
+    assert 0 < service.expires_in("tmdb", query) <= 5
+
+    # Upstream page 4 is past total_pages: it was never fetched and doesn't count.
+    await service.search(query="star", page=2, page_size=40)
+    assert service.expires_in("tmdb", {**query, "page": 2, "page_size": 40}) > 0
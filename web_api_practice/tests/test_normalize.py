@@ -0,0 +1,92 @@
+"""Query normalization and cache-key folding tests."""
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.common import metrics
+from apps.movies.schemas import SearchResult
+from apps.movies.services import MoviesService
+from apps.weather.locations import canonical_city, canonical_county
+from apps.weather.schemas import Forecast
+from apps.weather.services import WeatherService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.mark.parametrize(
+    "raw, county",
+    [
+        ("臺北市", "臺北市"),
+        ("台北市", "臺北市"),
+        (" 台 中 ", "臺中市"),
+        ("高雄", "高雄市"),
+        ("新竹", "新竹"),  # city and county share the stem
+        ("Springfield", "Springfield"),
+    ],
+)
+def test_canonical_county(raw, county):
+    assert canonical_county(raw) == county
+
+
+@override_settings(
+    WEATHER_CWA_ALIASES={"taipei": "臺北市"},
+    WEATHER_OWM_ALIASES={("台北", "tw"): ("Taipei", "TW")},
+)
+def test_configured_aliases():
+    assert canonical_county(" Taipei ") == "臺北市"
+    assert canonical_city("台北", "TW") == ("Taipei", "TW")
+    assert canonical_city("  New   York ", " us") == ("New York", "US")
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_equivalent_weather_queries_share_one_upstream_call(monkeypatch):
+    cache.clear()
+    metrics.reset()
+    service = WeatherService(cache_timeout=60)
+    calls = []
+
+    async def fake_owm(**kwargs):
+        calls.append(("owm", kwargs["city"], kwargs["country"]))
+        return Forecast(kwargs["city"], kwargs["country"], "metric", "owm")
+
+    async def fake_cwa(**kwargs):
+        calls.append(("cwa", kwargs["location_name"], kwargs["country"]))
+        return Forecast(kwargs["location_name"], "TW", "metric", "cwa")
+
+    monkeypatch.setattr(service._adapters["owm"], "fetch_forecast", fake_owm)
+    monkeypatch.setattr(service._adapters["cwa"], "fetch_forecast", fake_cwa)
+
+    for city, country in (("Taipei", "TW"), (" taipei ", "tw"), ("TAIPEI", "TW")):
+        await service.get_forecast(provider="owm", city=city, country=country)
+    for name in ("台北市", "臺北市", "臺北"):
+        await service.get_forecast(provider="cwa", locationName=name)
+
+    assert calls == [("owm", "Taipei", "TW"), ("cwa", "臺北市", "TW")]
+    assert metrics.get("weather.normalize.rewritten") == 3  # case-only "TAIPEI" is not
+    assert metrics.get("weather.normalize.unchanged") == 3
+    assert metrics.hit_rate("weather") == pytest.approx(4 / 6)
+
+
+@override_settings(CACHES=LOCMEM, MOVIES_INDEX_ENABLED=False)
+@pytest.mark.asyncio
+async def test_equivalent_movie_queries_share_one_upstream_call(monkeypatch):
+    cache.clear()
+    metrics.reset()
+    service = MoviesService(cache_timeout=60)
+    calls = []
+
+    async def fake_search(*, query, page=1, lang="zh-TW"):
+        calls.append(query)
+        return SearchResult(items=[], page=page, total_pages=0, total_results=0, source="tmdb")
+
+    monkeypatch.setattr(service._adapters["tmdb"], "search", fake_search)
+
+    for query in ("Star Wars", " star   wars", "ＳＴＡＲ　ＷＡＲＳ"):
+        await service.search(query=query)
+
+    assert calls == ["Star Wars"]
+    assert metrics.get("movies.normalize.rewritten") == 2
+    assert metrics.hit_rate("movies") == pytest.approx(2 / 3)
+    assert metrics.hit_rate("nothing") is None
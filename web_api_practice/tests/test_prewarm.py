@@ -0,0 +1,111 @@
+"""Cache pre-warmer and hot-key statistics tests."""
+
+import asyncio
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.common.hotkeys import HotKeyTracker, hot_keys
+from apps.common.prewarm import Prewarmer
+from apps.movies.schemas import SearchResult
+from apps.movies.services import MoviesService
+from apps.weather.schemas import Forecast
+from apps.weather.services import WeatherService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def test_hot_key_tracker_ranks_lookups():
+    tracker = HotKeyTracker()
+    for _ in range(3):
+        tracker.record("movies", "tmdb", {"query": "dune", "page": 1})
+    tracker.record("movies", "tmdb", {"query": "heat", "page": 1})
+
+    assert tracker.top("movies", 1) == [("tmdb", {"query": "dune", "page": 1})]
+    assert tracker.top("weather", 5) == []
+
+
+@override_settings(
+    CACHES=LOCMEM,
+    PREWARM_WEATHER_QUERIES=[
+        {"provider": "cwa", "locationName": "臺北市"},
+        {"provider": "cwa", "locationName": "高雄市"},
+    ],
+    PREWARM_MOVIES_QUERIES=[],
+    PREWARM_JITTER=0,
+    PREWARM_RATE_LIMITS={"cwa": 1000, "tmdb": 1000},
+)
+@pytest.mark.asyncio
+async def test_prewarmer_refreshes_due_targets_within_budget(monkeypatch):
+    cache.clear()
+    hot_keys.clear()
+    weather = WeatherService()
+    movies = MoviesService()
+
+    cwa_calls = []
+
+    async def fetch_forecasts(*, location_names=None, country="TW", units="metric"):
+        cwa_calls.append(sorted(location_names))
+        return {
+            name: Forecast(location_name=name, country=country, units=units, source="cwa")
+            for name in location_names
+        }
+
+    searches = []
+
+    async def search(**kwargs):
+        searches.append(kwargs["query"])
+        return SearchResult(items=[], page=1, total_pages=1, total_results=0, source="tmdb")
+
+    monkeypatch.setattr(weather._adapters["cwa"], "fetch_forecasts", fetch_forecasts)
+    monkeypatch.setattr(movies._adapters["tmdb"], "search", search)
+    hot_keys.record("movies", "tmdb", {"query": "dune", "page": 1, "lang": "zh-TW"})
+
+    prewarmer = Prewarmer(weather_service=weather, movies_service=movies)
+    stats = await prewarmer.run_once()
+
+    assert stats == {"refreshed": 3, "skipped": 0, "failed": 0}
+    assert cwa_calls == [["臺北市", "高雄市"]]
+    assert searches == ["dune"]
+
+
+@override_settings(CACHES=LOCMEM, PREWARM_LEAD_TIME=60)
+def test_prewarmer_skips_entries_that_stay_fresh():
+    cache.clear()
+    weather = WeatherService(cache_mode="swr", cache_timeout=300)
+    params = weather._normalize_kwargs("cwa", {"locationName": "臺北市"})
+    weather._cache.set(
+        weather._cache_key("cwa", params),
+        Forecast(location_name="臺北市", country="TW", units="metric", source="cwa"),
+    )
+
+    assert not weather.needs_refresh("cwa", params, lead_time=60)
+    assert weather.needs_refresh("cwa", params, lead_time=600)
+
+
+@override_settings(CACHES=LOCMEM, PREWARM_JITTER=0)
+@pytest.mark.asyncio
+async def test_only_one_scheduler_runs_each_pass(monkeypatch):
+    cache.clear()
+    passes = []
+
+    async def run_once(self):
+        passes.append(self)
+        return {}
+
+    monkeypatch.setattr(Prewarmer, "run_once", run_once)
+    workers = [
+        Prewarmer(weather_service=WeatherService(), movies_service=MoviesService())
+        for _ in range(3)
+    ]
+
+    tasks = [asyncio.create_task(worker.run_forever(interval=60)) for worker in workers]
+    await asyncio.sleep(0.05)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert len(passes) == 1
+    cache.delete(Prewarmer.TICK_KEY)
+    assert workers[1].claim_tick(60) is True
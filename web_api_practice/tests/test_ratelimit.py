@@ -0,0 +1,48 @@
+"""Client-side upstream rate limiting tests."""
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.common.ratelimit import RateLimiter
+from apps.movies.schemas import SearchResult
+from apps.movies.services import MoviesService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@override_settings(UPSTREAM_RATE_LIMITS={"owm": {"rate": 50.0, "burst": 2}})
+@pytest.mark.asyncio
+async def test_limiter_queues_briefly_then_rejects():
+    limiter = RateLimiter()
+
+    assert await limiter.acquire("owm", max_wait=0)
+    assert await limiter.acquire("owm", max_wait=0)
+    assert not await limiter.acquire("owm", max_wait=0)
+    assert await limiter.acquire("owm", max_wait=0.5)  # one token refills in 20ms
+    assert await limiter.acquire("cwa", max_wait=0)  # no configured limit
+
+
+@override_settings(
+    CACHES=LOCMEM,
+    UPSTREAM_RATE_LIMITS={"tmdb": {"rate": 0.001, "burst": 1}},
+    UPSTREAM_RATE_LIMIT_WAIT=0,
+)
+@pytest.mark.asyncio
+async def test_over_budget_provider_routes_to_the_fallback(monkeypatch):
+    cache.clear()
+    service = MoviesService()
+    calls = []
+
+    async def search(source, **kwargs):
+        calls.append(source)
+        return SearchResult(items=[], page=1, total_pages=1, total_results=0, source=source)
+
+    monkeypatch.setattr(service._adapters["tmdb"], "search", lambda **kw: search("tmdb", **kw))
+    monkeypatch.setattr(service._adapters["omdb"], "search", lambda **kw: search("omdb", **kw))
+
+    first = await service.search(query="Alien")
+    second = await service.search(query="Aliens")
+
+    assert (first.source, second.source) == ("tmdb", "omdb")
+    assert calls == ["tmdb", "omdb"]
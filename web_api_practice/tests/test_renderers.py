@@ -0,0 +1,49 @@
+"""ORJSON renderer tests."""
+
+import json
+from dataclasses import asdict
+
+import pytest
+
+from apps.common import renderers
+from apps.common.renderers import ORJSONRenderer
+from apps.movies.schemas import Movie
+from apps.weather.schemas import Forecast, OWMPeriod
+from apps.weather.views import forecast_payload
+
+
+@pytest.fixture(params=["orjson", "fallback"])
+def renderer(request, monkeypatch):
+    if request.param == "fallback":
+        monkeypatch.setattr(renderers, "orjson", None)
+    return ORJSONRenderer()
+
+
+def test_dataclasses_render_like_their_dicts(renderer):
+    forecast = Forecast(
+        location_name="臺北市",
+        country="TW",
+        units="metric",
+        source="owm",
+        periods=[OWMPeriod(ts="2025-09-22T00:00:00+00:00", temp=24.5, desc="晴", humidity=70)],
+    )
+    movie = Movie(id="1", title="Inception", genres=[28, 878], rating=8.4)
+
+    body = renderer.render({"forecast": forecast_payload(forecast), "items": [movie]})
+
+    assert json.loads(body) == {
+        "forecast": {
+            "location": {"name": "臺北市", "country": "TW"},
+            "units": "metric",
+            "source": "owm",
+            "periods": [asdict(period) for period in forecast.periods],
+        },
+        "items": [asdict(movie)],
+    }
+    assert "臺北市".encode() in body
+
+
+def test_indent_and_empty_bodies(renderer):
+    assert renderer.render(None) == b""
+    pretty = renderer.render({"a": 1}, "application/json; indent=2")
+    assert b"\n" in pretty
@@ -0,0 +1,129 @@
+"""Rendered response cache and conditional GET tests."""
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.common import metrics
+from apps.common.hotkeys import hot_keys
+from apps.weather.schemas import Forecast, OWMPeriod
+from apps.weather.services import WeatherService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def stub_service(monkeypatch):
+    calls = []
+
+    class StubService(WeatherService):
+        async def get_forecast(self, **kwargs):
+            calls.append(kwargs)
+            return Forecast(
+                location_name="Taipei",
+                country="TW",
+                units="metric",
+                source="owm",
+                periods=[OWMPeriod(ts="2025-09-22T00:00:00+00:00", temp=24.0, desc="clear")],
+            )
+
+        def expires_in(self, provider, query, **kwargs):
+            return 120.0
+
+    monkeypatch.setattr("apps.weather.views.WeatherService", StubService)
+    return calls
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.django_db
+def test_repeat_polls_are_served_from_the_response_cache(client, stub_service):
+    cache.clear()
+    params = {"city": "Taipei", "country": "TW"}
+
+    first = client.get("/api/v1/weather/forecast", params)
+    second = client.get("/api/v1/weather/forecast", {"country": "TW", "city": "Taipei"})
+
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert first["ETag"] == second["ETag"]
+    assert first["Cache-Control"] in ("public, max-age=119", "public, max-age=120")
+    assert len(stub_service) == 1
+
+    other = client.get("/api/v1/weather/forecast", {"city": "Tainan", "country": "TW"})
+    assert other.status_code == 200
+    assert len(stub_service) == 2
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.django_db
+def test_response_cache_hits_still_count_as_hot_cache_hits(client, stub_service):
+    cache.clear()
+    hot_keys.clear()
+    metrics.reset()
+    params = {"city": "Taipei", "country": "TW"}
+
+    client.get("/api/v1/weather/forecast", params)
+    client.get("/api/v1/weather/forecast", params)
+    client.get("/api/v1/weather/forecast", params)
+
+    assert len(stub_service) == 1
+    assert metrics.get("weather.cache.hit") == 2
+    assert hot_keys.top("weather", 1)[0][0] == "owm"
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.django_db
+def test_matching_if_none_match_gets_304(client, stub_service):
+    cache.clear()
+    params = {"city": "Taipei", "country": "TW"}
+    etag = client.get("/api/v1/weather/forecast", params)["ETag"]
+
+    response = client.get(
+        "/api/v1/weather/forecast", params, HTTP_IF_NONE_MATCH=f'W/{etag}, "other"'
+    )
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response["ETag"] == etag
+
+
+@override_settings(CACHES=LOCMEM, RESPONSE_CACHE_ENABLED=False)
+@pytest.mark.django_db
+def test_disabled_cache_still_revalidates(client, stub_service):
+    params = {"city": "Taipei", "country": "TW"}
+    etag = client.get("/api/v1/weather/forecast", params)["ETag"]
+
+    response = client.get("/api/v1/weather/forecast", params, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert len(stub_service) == 2
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.django_db
+def test_browsable_api_is_rendered_and_not_cached(client, stub_service):
+    cache.clear()
+    params = {"city": "Taipei", "country": "TW"}
+
+    html = client.get("/api/v1/weather/forecast", params, HTTP_ACCEPT="text/html")
+    json_body = client.get("/api/v1/weather/forecast", params)
+
+    assert html["Content-Type"].startswith("text/html")
+    assert json_body["Content-Type"] == "application/json"
+    assert len(stub_service) == 2
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.django_db
+def test_unknown_freshness_is_not_cached(client, stub_service, monkeypatch):
+    cache.clear()
+    monkeypatch.setattr(
+        "apps.weather.views.WeatherService.expires_in", lambda self, provider, query, **kwargs: 0.0
+    )
+    params = {"city": "Taipei", "country": "TW"}
+
+    first = client.get("/api/v1/weather/forecast", params)
+    client.get("/api/v1/weather/forecast", params)
+
+    assert first["Cache-Control"] == "no-cache"
+    assert len(stub_service) == 2
@@ -0,0 +1,92 @@
+"""Retry engine tests: Retry-After, request deadlines and the retry budget."""
+
+import httpx
+import pytest
+from django.test.utils import override_settings
+
+from apps.common import http, retry
+from apps.common.exceptions import DeadlineExceeded
+
+
+def _client(responses):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        result = responses[min(len(calls), len(responses)) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler)), calls
+
+
+@pytest.fixture(autouse=True)
+def fresh_policy(monkeypatch):
+    monkeypatch.setattr(http, "policy", retry.RetryPolicy())
+
+
+@override_settings(HTTP_RETRY_BACKOFF_BASE=0)
+@pytest.mark.asyncio
+async def test_retries_transient_failures_then_succeeds():
+    client, calls = _client(
+        [
+            httpx.ConnectError("refused"),
+            httpx.Response(503, headers={"Retry-After": "0"}),
+            httpx.Response(200, json={"ok": True}),
+        ]
+    )
+
+    response = await http.get(client, "https://example.test/")
+
+    assert response.json() == {"ok": True}
+    assert len(calls) == 3
+
+
+@override_settings(HTTP_MAX_RETRIES=5, HTTP_RETRY_AFTER_MAX=5)
+@pytest.mark.asyncio
+async def test_retry_after_longer_than_the_deadline_gives_up():
+    client, calls = _client([httpx.Response(429, headers={"Retry-After": "3"})])
+
+    with retry.deadline(1.0):
+        with pytest.raises(httpx.HTTPStatusError):
+            await http.get(client, "https://example.test/")
+
+    assert len(calls) == 1
+
+
+@override_settings(
+    HTTP_MAX_RETRIES=5,
+    HTTP_RETRY_BACKOFF_BASE=0,
+    HTTP_RETRY_BUDGET_BURST=2,
+    HTTP_RETRY_BUDGET_RATE=0,
+)
+@pytest.mark.asyncio
+async def test_retry_budget_is_shared_across_calls():
+    client, calls = _client([httpx.Response(502)])
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await http.get(client, "https://example.test/")
+    assert len(calls) == 3  # first attempt + the whole budget of 2 retries
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await http.get(client, "https://example.test/")
+    assert len(calls) == 4  # budget exhausted: no retry at all
+
+
+@pytest.mark.asyncio
+async def test_expired_deadline_skips_the_call():
+    client, calls = _client([httpx.Response(200)])
+
+    with retry.deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            await http.get(client, "https://example.test/")
+
+    assert calls == []
+
+
+def test_parse_retry_after_accepts_seconds_and_dates():
+    assert retry.parse_retry_after("7") == 7.0
+    assert retry.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert retry.parse_retry_after("soon") is None
+    assert retry.parse_retry_after(None) is None
@@ -89,3 +89,57 @@ async def test_service_fallbacks_to_secondary_provider(monkeypatch):
 
     assert result.source == "owm"
     assert result.periods[0].temp == 25.0
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+def test_resample_is_memoized_per_forecast(monkeypatch):
+    cache.clear()
+    service = WeatherService(cache_timeout=60)
+    calls = []
+
+    def counting_resample(columns, interval, utc_offset=0):
+        calls.append(interval)
+        return [{"periods": len(columns)}]
+
+    monkeypatch.setattr("apps.weather.services.resample", counting_resample)
+
+    def forecast(temp):
+        return Forecast(
+            location_name="Taipei",
+            country="TW",
+            units="metric",
+            source="owm",
+            periods=[OWMPeriod(ts="2025-09-22T00:00:00+00:00", temp=temp, desc="clear")],
+        )
+
+    assert service.resample(forecast(24.5), "day") == [{"periods": 1}]
+    assert service.resample(forecast(24.5), "day") == [{"periods": 1}]
+    assert calls == ["day"]
+
+    service.resample(forecast(24.5), "6h")
+    service.resample(forecast(26.0), "day")
+    assert calls == ["day", "6h", "day"]
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+def test_expires_in_reads_the_expiry_stored_with_the_entry():
+    cache.clear()
+    query = {"city": "Taipei", "country": "TW"}
+
+    ttl = WeatherService(cache_timeout=60)
+    assert ttl.expires_in("owm", query) == 0.0
+
+    # Expiry travels with the entry, so even a backend without ``ttl`` knows it.
+    params = ttl._normalize_kwargs("owm", query)
+    ttl._cache.set(ttl._cache_key("owm", params), Forecast("Taipei", "TW", "metric", "owm"))
+    assert 0 < ttl.expires_in("owm", query) <= 60
+    cache.clear()
+
+    swr = WeatherService(cache_timeout=60, cache_mode="swr")
+    params = swr._normalize_kwargs("owm", query)
+    swr._cache.set(swr._cache_key("owm", params), Forecast("Taipei", "TW", "metric", "owm"))
+    assert 0 < swr.expires_in("owm", query) <= 60
@@ -0,0 +1,89 @@
+"""Request coalescing tests for the weather and movies services."""
+
+import asyncio
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.common.cache import stale_key
+from apps.common.singleflight import SingleFlight
+from apps.movies.schemas import SearchResult
+from apps.movies.services import MoviesService
+from apps.weather.schemas import Forecast
+from apps.weather.services import WeatherService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+def _forecast(source="owm"):
+    return Forecast(location_name="Taipei", country="TW", units="metric", source=source)
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_concurrent_forecasts_share_one_upstream_call(monkeypatch):
+    cache.clear()
+    service = WeatherService()
+    calls = {"owm": 0}
+
+    async def slow_fetch(**kwargs):
+        calls["owm"] += 1
+        await asyncio.sleep(0.05)
+        return _forecast()
+
+    monkeypatch.setattr(service._adapters["owm"], "fetch_forecast", slow_fetch)
+
+    results = await asyncio.gather(
+        *(service.get_forecast(provider="owm", city="Taipei", country="TW") for _ in range(10))
+    )
+
+    assert calls["owm"] == 1
+    assert all(result.source == "owm" for result in results)
+
+
+@override_settings(CACHES=LOCMEM, SINGLEFLIGHT_WAIT_TIMEOUT=0.01)
+@pytest.mark.asyncio
+async def test_follower_falls_back_to_stale_copy(monkeypatch):
+    cache.clear()
+    service = MoviesService()
+    params = service._normalize_kwargs("omdb", {"query": "heat", "page": 1})
+    key = service._cache_key("omdb", params)
+    stale = SearchResult(items=[], page=1, total_pages=0, total_results=0, source="omdb")
+    cache.set(stale_key(key), stale)
+
+    release = asyncio.Event()
+
+    async def hanging_search(**kwargs):
+        await release.wait()
+        return SearchResult(items=[], page=1, total_pages=1, total_results=0, source="omdb")
+
+    monkeypatch.setattr(service._adapters["omdb"], "search", hanging_search)
+
+    leader = asyncio.ensure_future(service.search(provider="omdb", query="heat"))
+    await asyncio.sleep(0)
+    follower = await service.search(provider="omdb", query="heat")
+
+    assert follower is not None
+    assert follower.total_pages == 0
+
+    release.set()
+    assert (await leader).total_pages == 1
+
+
+@override_settings(CACHES=LOCMEM, SINGLEFLIGHT_BACKEND="redis", SINGLEFLIGHT_POLL_INTERVAL=0.01)
+@pytest.mark.asyncio
+async def test_lock_holder_in_other_worker_is_awaited():
+    cache.clear()
+    cache.add(f"{SingleFlight.LOCK_PREFIX}k", "other-worker")
+    group = SingleFlight()
+
+    async def fn():  # pragma: no cover - the other worker owns the call
+        raise AssertionError("should not call upstream while the lock is held")
+
+    async def publish():
+        await asyncio.sleep(0.03)
+        cache.set("k", "value")
+
+    asyncio.ensure_future(publish())
+    assert await group.do("k", fn, peek=lambda: cache.get("k")) == "value"
@@ -0,0 +1,134 @@
+"""Local movie title index and autocomplete tests."""
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+
+from apps.movies.index import TitleIndex
+from apps.movies.schemas import Movie, SearchResult
+from apps.movies.services import MoviesService
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+SCOPE = ("tmdb", "zh-TW")
+
+STAR_MOVIES = [
+    Movie(id="1", title="Star Wars"),
+    Movie(id="2", title="Star Trek"),
+    Movie(id="3", title="Ｌｏｎｅ  Star"),
+    Movie(id="4", title="Rogue One: A Star Wars Story"),
+]
+
+
+def test_lookup_matches_word_prefixes_and_ranks_title_prefixes_first():
+    index = TitleIndex()
+    index.add(SCOPE, STAR_MOVIES)
+
+    assert [movie.id for movie in index.lookup(SCOPE, "star w")] == ["1", "4"]
+    assert [movie.id for movie in index.lookup(SCOPE, "STAR")] == ["2", "1", "3", "4"]
+    assert [movie.id for movie in index.lookup(SCOPE, "lone")] == ["3"]
+    assert index.lookup(SCOPE, "wars", limit=1)[0].id == "1"
+    assert index.lookup(("tmdb", "en-US"), "star") == []
+    assert index.lookup(SCOPE, "  ") == []
+
+
+def test_refreshing_a_movie_replaces_its_title_words():
+    index = TitleIndex()
+    index.add(SCOPE, [Movie(id="1", title="星際大戰")])
+    index.add(SCOPE, [Movie(id="1", title="Star Wars")])
+
+    assert index.lookup(SCOPE, "星際") == []
+    assert [movie.title for movie in index.lookup(SCOPE, "star")] == ["Star Wars"]
+    assert len(index) == 1
+
+
+def test_coverage_extends_to_refinements_until_it_expires(monkeypatch):
+    index = TitleIndex()
+    index.add(SCOPE, STAR_MOVIES, query="Star", complete=True)
+    index.add(SCOPE, [Movie(id="9", title="Alien")], query="alien", complete=False)
+    index.add(SCOPE, [Movie(id="8", title="Aliens")], query="aliens", complete=True)
+    index.add(SCOPE, [], query="st", complete=True)
+
+    assert index.covers(SCOPE, "star wars")
+    assert index.covers(SCOPE, "wars  STAR")
+    assert not index.covers(SCOPE, "sta")
+    assert not index.covers(SCOPE, "stars")
+    assert not index.covers(SCOPE, "alien")
+    assert not index.covers(SCOPE, "st")  # empty results are never complete
+    assert not index.covers(SCOPE, "star " + " ".join("abcdefg"))
+
+    with override_settings(MOVIES_INDEX_TTL=0):
+        assert not index.covers(SCOPE, "star wars")
+        assert index.lookup(SCOPE, "star") == []
+
+
+@override_settings(MOVIES_INDEX_MAX_ENTRIES=2)
+def test_evicting_past_the_limit_drops_coverage():
+    index = TitleIndex()
+    index.add(SCOPE, STAR_MOVIES[:2], query="star", complete=True)
+    assert index.covers(SCOPE, "star trek")
+
+    index.add(SCOPE, [Movie(id="5", title="Alien")])
+
+    assert len(index) == 2
+    assert not index.covers(SCOPE, "star trek")
+    assert [movie.id for movie in index.lookup(SCOPE, "star")] == ["2"]
+
+
+@pytest.fixture
+def tmdb(monkeypatch):
+    service = MoviesService(cache_timeout=60)
+    calls = []
+
+    async def fake_search(*, query, page=1, lang="zh-TW"):
+        calls.append(query)
+        items = [movie for movie in STAR_MOVIES if query.lower() in movie.title.lower()]
+        return SearchResult(
+            items=items, page=page, total_pages=1, total_results=len(items), source="tmdb"
+        )
+
+    monkeypatch.setattr(service._adapters["tmdb"], "search", fake_search)
+    return service, calls
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_searches_always_go_upstream_despite_coverage(tmdb):
+    service, calls = tmdb
+    cache.clear()
+
+    await service.search(query="star")
+    refined = await service.search(query="Star W")
+
+    assert calls == ["star", "Star W"]
+    assert [movie.id for movie in refined.items] == ["1", "4"]
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.asyncio
+async def test_autocomplete_goes_upstream_only_without_local_coverage(tmdb):
+    service, calls = tmdb
+    cache.clear()
+
+    first = await service.autocomplete(query="star", limit=3)
+    second = await service.autocomplete(query="star t", limit=3)
+
+    assert [movie.id for movie in first] == ["2", "1", "3"]
+    assert [movie.id for movie in second] == ["2"]
+    assert calls == ["star"]
+
+
+@override_settings(CACHES=LOCMEM)
+@pytest.mark.django_db
+def test_autocomplete_endpoint(client, monkeypatch):
+    class StubService:
+        async def autocomplete(self, **kwargs):
+            assert kwargs == {"query": "star", "lang": "zh-TW", "limit": 5}
+            return STAR_MOVIES[:1]
+
+    monkeypatch.setattr("apps.movies.views.MoviesAutocompleteView.service_class", StubService)
+
+    response = client.get("/api/v1/movies/autocomplete", {"query": "star", "limit": 5})
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["title"] == "Star Wars"
+    assert client.get("/api/v1/movies/autocomplete").status_code == 400
@@ -0,0 +1,43 @@
+"""Timestamp normalization tests."""
+
+from datetime import timedelta, timezone
+
+import pytest
+
+from apps.common.utils import _parse_utc, to_epoch_utc, to_iso_utc
+
+
+@pytest.mark.parametrize(
+    "raw, iso, epoch",
+    [
+        ("2025-09-22 18:00:00", "2025-09-22T18:00:00+00:00", 1758564000),
+        ("2025-09-22T18:00:00Z", "2025-09-22T18:00:00+00:00", 1758564000),
+        ("2025-09-23T02:00:00+08:00", "2025-09-22T18:00:00+00:00", 1758564000),
+    ],
+)
+def test_timestamps_normalize_to_utc(raw, iso, epoch):
+    assert to_iso_utc(raw) == iso
+    assert to_epoch_utc(raw) == epoch
+
+
+def test_naive_timestamps_in_another_zone():
+    taipei = timezone(timedelta(hours=8))
+
+    assert to_iso_utc("2025-09-23 02:00:00", taipei) == "2025-09-22T18:00:00+00:00"
+    assert to_epoch_utc("2025-09-23 02:00:00", taipei) == 1758564000
+    assert to_epoch_utc("2025-09-22T18:00:00Z", taipei) == 1758564000
+
+
+@pytest.mark.parametrize("raw", ["", "not a date", None, ["2025-09-22"], {"dt": 1}])
+def test_unparseable_timestamps(raw):
+    assert to_iso_utc(raw) == raw
+    assert to_epoch_utc(raw) is None
+
+
+def test_repeated_timestamps_hit_the_memo():
+    _parse_utc.cache_clear()
+    for _ in range(3):
+        to_iso_utc("2025-09-22 21:00:00")
+
+    info = _parse_utc.cache_info()
+    assert (info.hits, info.misses) == (2, 1)
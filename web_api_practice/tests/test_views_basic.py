@@ -2,6 +2,7 @@
 
 import pytest
 
+from apps.weather.columnar import ForecastColumns, resample
 from apps.weather.schemas import Forecast, OWMPeriod
 
 
@@ -35,6 +36,9 @@ def test_forecast_endpoint_returns_normalized_payload(client, monkeypatch):
                 ],
             )
 
+        def expires_in(self, provider, query, **kwargs):
+            return 0.0
+
     monkeypatch.setattr("apps.weather.views.WeatherService", StubService)
 
     response = client.get(
@@ -47,3 +51,60 @@ def test_forecast_endpoint_returns_normalized_payload(client, monkeypatch):
     assert data["source"] == "owm"
     assert len(data["periods"]) == 1
     assert data["periods"][0]["temp"] == 24.0
+
+
+@pytest.mark.django_db
+def test_forecast_endpoint_summary_and_interval(client, monkeypatch):
+    calls = []
+
+    class StubService:
+        async def get_forecast(self, **kwargs):
+            calls.append(kwargs)
+            return Forecast(
+                location_name="Taipei",
+                country="TW",
+                units="metric",
+                source="owm",
+                periods=[
+                    OWMPeriod(ts="2025-09-22T00:00:00+00:00", temp=24.0, desc="clear"),
+                    OWMPeriod(ts="2025-09-22T18:00:00+00:00", temp=28.0, desc="clear"),
+                ],
+            )
+
+        def expires_in(self, provider, query, **kwargs):
+            return 0.0
+
+        def resample(self, forecast, interval, utc_offset=0):
+            return resample(ForecastColumns(forecast), interval, utc_offset)
+
+    monkeypatch.setattr("apps.weather.views.WeatherService", StubService)
+
+    response = client.get(
+        "/api/v1/weather/forecast",
+        {"city": "Taipei", "country": "TW", "summary": "daily", "utc_offset": 8},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["periods"]) == 2
+    assert [(day["date"], day["temp_max"]) for day in data["daily"]] == [
+        ("2025-09-22", 24.0),
+        ("2025-09-23", 28.0),
+    ]
+    assert "summary" not in calls[0] and "utc_offset" not in calls[0]
+
+    resampled = client.get(
+        "/api/v1/weather/forecast",
+        {"city": "Taipei", "country": "TW", "interval": "12h", "utc_offset": 8},
+    ).json()
+    assert resampled["interval"] == "12h"
+    assert [(period["start"], period["temp_max"]) for period in resampled["periods"]] == [
+        ("2025-09-21T16:00:00+00:00", 24.0),
+        ("2025-09-22T16:00:00+00:00", 28.0),
+    ]
+    assert "daily" not in resampled
+
+    invalid = client.get(
+        "/api/v1/weather/forecast", {"city": "Taipei", "country": "TW", "summary": "hourly"}
+    )
+    assert invalid.status_code == 400
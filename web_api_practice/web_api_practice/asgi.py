@@ -13,4 +13,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'web_api_practice.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after Django is configured so app modules can read settings.
+from apps.common.http import close_clients, open_clients  # noqa: E402
+from apps.common.lifespan import LifespanMiddleware  # noqa: E402
+from apps.common.prewarm import start_scheduler, stop_scheduler  # noqa: E402
+
+application = LifespanMiddleware(
+    django_application,
+    on_startup=[open_clients, start_scheduler],
+    on_shutdown=[stop_scheduler, close_clients],
+)
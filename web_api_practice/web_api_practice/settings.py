@@ -24,13 +24,90 @@ ENV = {
     "CWA_API_KEY": os.getenv("CWA_API_KEY", ""),
     "HTTP_DEFAULT_TIMEOUT": float(os.getenv("HTTP_DEFAULT_TIMEOUT", 8.0)),
     "HTTP_MAX_RETRIES": int(os.getenv("HTTP_MAX_RETRIES", 2)),
+    "HTTP_REQUEST_DEADLINE": float(os.getenv("HTTP_REQUEST_DEADLINE", 10.0)),
+    "HTTP_RETRY_BUDGET_RATE": float(os.getenv("HTTP_RETRY_BUDGET_RATE", 5.0)),
+    "HTTP_RETRY_BUDGET_BURST": float(os.getenv("HTTP_RETRY_BUDGET_BURST", 20)),
+    "HTTP_POOL_MAX_CONNECTIONS": int(os.getenv("HTTP_POOL_MAX_CONNECTIONS", 100)),
+    "HTTP_POOL_MAX_KEEPALIVE": int(os.getenv("HTTP_POOL_MAX_KEEPALIVE", 20)),
+    "HTTP_POOL_KEEPALIVE_EXPIRY": float(os.getenv("HTTP_POOL_KEEPALIVE_EXPIRY", 30.0)),
+    "HTTP_ENABLE_HTTP2": os.getenv("HTTP_ENABLE_HTTP2", "true").lower() == "true",
     "REDIS_URL": os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+    "CACHE_L1_ENABLED": os.getenv("CACHE_L1_ENABLED", "true").lower() == "true",
+    "CACHE_L1_TIMEOUT": float(os.getenv("CACHE_L1_TIMEOUT", 30)),
+    "CACHE_L1_MAX_ENTRIES": int(os.getenv("CACHE_L1_MAX_ENTRIES", 1024)),
+    "CACHE_L1_MAX_BYTES": int(os.getenv("CACHE_L1_MAX_BYTES", 32 * 1024 * 1024)),
+    "CACHE_SERIALIZER": os.getenv("CACHE_SERIALIZER", "apps.common.codecs.SchemaSerializer"),
+    "CACHE_COMPRESSION": os.getenv("CACHE_COMPRESSION", "none"),
+    "CACHE_COMPRESSION_THRESHOLD": int(os.getenv("CACHE_COMPRESSION_THRESHOLD", 1024)),
+    "WEATHER_CACHE_MODE": os.getenv("WEATHER_CACHE_MODE", "ttl"),
+    "MOVIES_CACHE_MODE": os.getenv("MOVIES_CACHE_MODE", "ttl"),
+    "HOTKEYS_BACKEND": os.getenv("HOTKEYS_BACKEND", "local"),
+    "PREWARM_SCHEDULER_ENABLED": os.getenv("PREWARM_SCHEDULER_ENABLED", "false").lower() == "true",
+    "PREWARM_INTERVAL": float(os.getenv("PREWARM_INTERVAL", 120)),
+    "SINGLEFLIGHT_BACKEND": os.getenv("SINGLEFLIGHT_BACKEND", "local"),
+    "SINGLEFLIGHT_WAIT_TIMEOUT": float(os.getenv("SINGLEFLIGHT_WAIT_TIMEOUT", 10.0)),
+    "CIRCUIT_BACKEND": os.getenv("CIRCUIT_BACKEND", "local"),
+    "CIRCUIT_FAILURE_THRESHOLD": int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5)),
+    "CIRCUIT_RECOVERY_TIMEOUT": float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", 30.0)),
+    "WEATHER_HEDGE_ENABLED": os.getenv("WEATHER_HEDGE_ENABLED", "false").lower() == "true",
+    "MOVIES_HEDGE_ENABLED": os.getenv("MOVIES_HEDGE_ENABLED", "false").lower() == "true",
+    "HEDGE_DEFAULT_DELAY": float(os.getenv("HEDGE_DEFAULT_DELAY", 1.0)),
+    "HEDGE_PERCENTILE": float(os.getenv("HEDGE_PERCENTILE", 95)),
+    "UPSTREAM_RATE_LIMIT_BACKEND": os.getenv("UPSTREAM_RATE_LIMIT_BACKEND", "local"),
+    "UPSTREAM_RATE_LIMIT_WAIT": float(os.getenv("UPSTREAM_RATE_LIMIT_WAIT", 0.5)),
+    "WEATHER_STREAMING_JSON": os.getenv("WEATHER_STREAMING_JSON", "false").lower() == "true",
+    "RESPONSE_CACHE_ENABLED": os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true",
+    "MOVIES_PREFETCH_PAGES": int(os.getenv("MOVIES_PREFETCH_PAGES", 0)),
+    "MOVIES_MAX_RESULT_DEPTH": int(os.getenv("MOVIES_MAX_RESULT_DEPTH", 1000)),
+    "MOVIES_INDEX_ENABLED": os.getenv("MOVIES_INDEX_ENABLED", "true").lower() == "true",
+    "MOVIES_INDEX_TTL": float(os.getenv("MOVIES_INDEX_TTL", 3600)),
+    "MOVIES_INDEX_MAX_ENTRIES": int(os.getenv("MOVIES_INDEX_MAX_ENTRIES", 20000)),
+    "WEATHER_GEOHASH_PRECISION": int(os.getenv("WEATHER_GEOHASH_PRECISION", 5)),
+    "WEATHER_MERGED_DEADLINE": float(os.getenv("WEATHER_MERGED_DEADLINE", 8.0)),
     "TMDB_API_KEY": os.getenv("TMDB_API_KEY", ""),
     "OMDB_API_KEY": os.getenv("OMDB_API_KEY", ""),
     "TMDB_IMAGE_BASE": os.getenv("TMDB_IMAGE_BASE", "https://image.tmdb.org/t/p/w500"),
 }
 HTTP_DEFAULT_TIMEOUT = ENV["HTTP_DEFAULT_TIMEOUT"]
 HTTP_MAX_RETRIES = ENV["HTTP_MAX_RETRIES"]
+HTTP_REQUEST_DEADLINE = ENV["HTTP_REQUEST_DEADLINE"]
+HTTP_RETRY_BUDGET_RATE = ENV["HTTP_RETRY_BUDGET_RATE"]
+HTTP_RETRY_BUDGET_BURST = ENV["HTTP_RETRY_BUDGET_BURST"]
+HTTP_POOL_MAX_CONNECTIONS = ENV["HTTP_POOL_MAX_CONNECTIONS"]
+HTTP_POOL_MAX_KEEPALIVE = ENV["HTTP_POOL_MAX_KEEPALIVE"]
+HTTP_POOL_KEEPALIVE_EXPIRY = ENV["HTTP_POOL_KEEPALIVE_EXPIRY"]
+HTTP_ENABLE_HTTP2 = ENV["HTTP_ENABLE_HTTP2"]
+CACHE_L1_ENABLED = ENV["CACHE_L1_ENABLED"]
+CACHE_L1_TIMEOUT = ENV["CACHE_L1_TIMEOUT"]
+CACHE_L1_MAX_ENTRIES = ENV["CACHE_L1_MAX_ENTRIES"]
+CACHE_L1_MAX_BYTES = ENV["CACHE_L1_MAX_BYTES"]
+CACHE_COMPRESSION = ENV["CACHE_COMPRESSION"]
+CACHE_COMPRESSION_THRESHOLD = ENV["CACHE_COMPRESSION_THRESHOLD"]
+WEATHER_CACHE_MODE = ENV["WEATHER_CACHE_MODE"]
+MOVIES_CACHE_MODE = ENV["MOVIES_CACHE_MODE"]
+HOTKEYS_BACKEND = ENV["HOTKEYS_BACKEND"]
+PREWARM_SCHEDULER_ENABLED = ENV["PREWARM_SCHEDULER_ENABLED"]
+PREWARM_INTERVAL = ENV["PREWARM_INTERVAL"]
+SINGLEFLIGHT_BACKEND = ENV["SINGLEFLIGHT_BACKEND"]
+SINGLEFLIGHT_WAIT_TIMEOUT = ENV["SINGLEFLIGHT_WAIT_TIMEOUT"]
+CIRCUIT_BACKEND = ENV["CIRCUIT_BACKEND"]
+CIRCUIT_FAILURE_THRESHOLD = ENV["CIRCUIT_FAILURE_THRESHOLD"]
+CIRCUIT_RECOVERY_TIMEOUT = ENV["CIRCUIT_RECOVERY_TIMEOUT"]
+WEATHER_HEDGE_ENABLED = ENV["WEATHER_HEDGE_ENABLED"]
+MOVIES_HEDGE_ENABLED = ENV["MOVIES_HEDGE_ENABLED"]
+HEDGE_DEFAULT_DELAY = ENV["HEDGE_DEFAULT_DELAY"]
+HEDGE_PERCENTILE = ENV["HEDGE_PERCENTILE"]
+UPSTREAM_RATE_LIMIT_BACKEND = ENV["UPSTREAM_RATE_LIMIT_BACKEND"]
+UPSTREAM_RATE_LIMIT_WAIT = ENV["UPSTREAM_RATE_LIMIT_WAIT"]
+WEATHER_STREAMING_JSON = ENV["WEATHER_STREAMING_JSON"]
+RESPONSE_CACHE_ENABLED = ENV["RESPONSE_CACHE_ENABLED"]
+MOVIES_PREFETCH_PAGES = ENV["MOVIES_PREFETCH_PAGES"]
+MOVIES_MAX_RESULT_DEPTH = ENV["MOVIES_MAX_RESULT_DEPTH"]
+MOVIES_INDEX_ENABLED = ENV["MOVIES_INDEX_ENABLED"]
+MOVIES_INDEX_TTL = ENV["MOVIES_INDEX_TTL"]
+MOVIES_INDEX_MAX_ENTRIES = ENV["MOVIES_INDEX_MAX_ENTRIES"]
+WEATHER_GEOHASH_PRECISION = ENV["WEATHER_GEOHASH_PRECISION"]
+WEATHER_MERGED_DEADLINE = ENV["WEATHER_MERGED_DEADLINE"]
 TMDB_API_KEY = ENV["TMDB_API_KEY"]
 OMDB_API_KEY = ENV["OMDB_API_KEY"]
 TMDB_IMAGE_BASE = ENV["TMDB_IMAGE_BASE"]
@@ -147,6 +224,10 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.common.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',
         'rest_framework.throttling.UserRateThrottle',
@@ -157,6 +238,34 @@ REST_FRAMEWORK = {
     },
 }
 
+# Cache pre-warming: query dicts use the same fields as the public endpoints.
+PREWARM_WEATHER_QUERIES = [
+    {"provider": "cwa", "locationName": "臺北市"},
+    {"provider": "cwa", "locationName": "新北市"},
+    {"provider": "cwa", "locationName": "臺中市"},
+    {"provider": "cwa", "locationName": "高雄市"},
+]
+PREWARM_MOVIES_QUERIES = []
+PREWARM_RATE_LIMITS = {"cwa": 0.5, "owm": 1.0, "tmdb": 2.0, "omdb": 1.0}
+
+# Client-side quota per upstream API key: tokens per second and bucket size.
+UPSTREAM_RATE_LIMITS = {
+    "tmdb": {"rate": 40.0, "burst": 40},
+    "omdb": {"rate": 1.0, "burst": 10},
+    "owm": {"rate": 1.0, "burst": 60},
+    "cwa": {"rate": 2.0, "burst": 10},
+}
+
+# Extra spellings folded into one cache key before querying upstream, on top
+# of NFKC / case / whitespace normalization, 台 -> 臺 and the built-in
+# suffix-less county names (see apps/weather/locations.py).
+WEATHER_CWA_ALIASES = {
+    # "Taipei": "臺北市",
+}
+WEATHER_OWM_ALIASES = {
+    # ("台北", "TW"): ("Taipei", "TW"),
+}
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Weather API',
     'DESCRIPTION': 'Weather aggregation API documentation.',
@@ -170,6 +279,7 @@ CACHES = {
         'LOCATION': ENV['REDIS_URL'],
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            'SERIALIZER': ENV['CACHE_SERIALIZER'],
             'IGNORE_EXCEPTIONS': True,
         },
     }